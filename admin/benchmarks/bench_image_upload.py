@@ -0,0 +1,101 @@
+"""
+Benchmark: subida de un lote de imágenes a MinIO secuencial (ruta anterior) vs pool de hilos.
+
+No necesita MinIO ni base de datos: usa un cliente local que imita `put_object`
+leyendo el stream por partes y agregando una latencia fija por petición
+(simula el viaje de red) más un costo proporcional al tamaño.
+
+Uso (desde admin/):
+    PYTHONPATH=src python benchmarks/bench_image_upload.py --images 10 --latency-ms 80 --size-kb 800
+"""
+import argparse
+import io
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from werkzeug.datastructures import FileStorage
+
+from core.services.sites_service import SiteService, UPLOAD_WORKERS
+
+
+class FakeMinio:
+    """Cliente de MinIO en memoria con latencia simulada."""
+
+    def __init__(self, latency, seconds_per_mb):
+        self.latency = latency
+        self.seconds_per_mb = seconds_per_mb
+        self.objects = {}
+        self._lock = threading.Lock()
+
+    def put_object(self, bucket_name, object_name, data, length, content_type=None, part_size=0):
+        time.sleep(self.latency)
+        received = 0
+        chunk = part_size or length
+        while received < length:
+            part = data.read(min(chunk, length - received))
+            if not part:
+                break
+            received += len(part)
+            time.sleep(self.seconds_per_mb * len(part) / (1024 * 1024))
+        with self._lock:
+            self.objects[(bucket_name, object_name)] = received
+        return object_name
+
+    def remove_object(self, bucket_name, object_name):
+        with self._lock:
+            self.objects.pop((bucket_name, object_name), None)
+
+
+def _batch(images, size_kb):
+    payload = b"\xff" * (size_kb * 1024)
+    return [
+        (FileStorage(stream=io.BytesIO(payload), filename=f"img{i}.jpg", content_type="image/jpeg"), f"bench/{i}.jpg")
+        for i in range(images)
+    ]
+
+
+def _sequential(client, batch):
+    for file, path in batch:
+        SiteService.new_images_transactional(file, path, client, "bench")
+
+
+def _parallel(client, batch):
+    with ThreadPoolExecutor(max_workers=min(UPLOAD_WORKERS, len(batch))) as executor:
+        futures = [
+            executor.submit(SiteService.new_images_transactional, file, path, client, "bench")
+            for file, path in batch
+        ]
+        for future in futures:
+            future.result()
+
+
+def _time(fn, client, args, runs):
+    timings = []
+    for _ in range(runs):
+        batch = _batch(args.images, args.size_kb)
+        start = time.perf_counter()
+        fn(client, batch)
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings), max(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--images", type=int, default=10)
+    parser.add_argument("--size-kb", type=int, default=800)
+    parser.add_argument("--latency-ms", type=float, default=80)
+    parser.add_argument("--seconds-per-mb", type=float, default=0.02)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    client = FakeMinio(args.latency_ms / 1000, args.seconds_per_mb)
+    print(f"{args.images} imágenes de {args.size_kb} KB, latencia {args.latency_ms} ms, {UPLOAD_WORKERS} hilos")
+    for label, fn in (("secuencial", _sequential), ("paralelo", _parallel)):
+        median, worst = _time(fn, client, args, args.runs)
+        print(f"{label:<12} mediana {median:8.1f} ms   peor {worst:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,289 @@
+"""
+Benchmark: latencia, throughput y cantidad de consultas de la API pública del portal.
+
+Levanta create_app contra una base PostGIS local (por defecto la de desarrollo, o
+--database-url / DATABASE_URL), completa el dataset con el generador de seeds
+(idempotente: si ya está cargado no inserta nada) y recorre los casos:
+
+- /api/sites/ con cada combinación de filtro (ninguno, q, province, city, state,
+  tags, radio, combinado) y orden (site_name, registration, rating, views y
+  relevance/distance cuando aplican), ascendente y descendente; más cursor y página profunda.
+- /api/sites/<id>, /api/sites/favorites, /api/sites/top-ranked y /api/reviews.
+
+Por caso se informa p50/p95/p99, requests por segundo y consultas SQL por request.
+Por defecto se vacía el cache antes de cada request (se mide el camino a la base);
+--warm-cache mide con el cache de respuestas activo.
+
+No hay alternativa con SQLite/SpatiaLite: el esquema usa tsvector, pg_trgm,
+geography y ON CONFLICT de PostgreSQL. Usar una base descartable, el dataset queda cargado.
+
+El resultado es JSON; con --baseline se compara contra una corrida anterior y el
+proceso termina con código 1 si algún caso empeoró.
+
+Uso (desde admin/):
+    PYTHONPATH=src python benchmarks/bench_portal_api.py --database-url postgresql://.../bench \\
+        --sites 100000 --reviews 1000000 --output bench.json
+    PYTHONPATH=src python benchmarks/bench_portal_api.py --database-url ... --baseline bench.json
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from urllib.parse import urlencode
+
+from sqlalchemy import event, func
+
+from core import seed_generator, seeds
+from core.database import db
+from core.models.Review import Review
+from core.models.Site import Site
+from core.models.User import User
+from core.models.UserFavorite import UserFavorite
+from core.models.Site_Tag import HistoricSiteTag
+from core.utils.bulk import insert_missing, upsert
+
+BENCH_USER = f"bench@{seed_generator.REVIEW_EMAIL_DOMAIN}"
+# Diferencia mínima de p95 (ms) para considerar un empeoramiento (ruido de medición)
+MIN_REGRESSION_MS = 1.0
+
+
+def _prepare_dataset(args):
+    """Catálogos, sitios/reseñas sintéticos y un usuario con favoritos. Devuelve ids de referencia."""
+    catalogs = seeds.seed_catalogs()
+    users, _ = upsert(User, [{
+        'email': BENCH_USER, 'first_name': 'Benchmark', 'active': True,
+        'sysAdmin': False, 'role_id': catalogs['roles']['Usuario'],
+    }], 'email')
+    db.session.commit()
+
+    seed_generator.generate(args.sites, args.reviews, seed=args.seed)
+
+    live_ids = [id for (id,) in db.session.query(Site.id).filter(
+        Site.active == True, Site.deleted == False
+    ).order_by(Site.id)]
+    rng = random.Random(args.seed)
+    user_id = users[BENCH_USER]
+    insert_missing(UserFavorite, [
+        {'user_id': user_id, 'site_id': site_id}
+        for site_id in rng.sample(live_ids, min(args.favorites, len(live_ids)))
+    ], ('user_id', 'site_id'))
+    db.session.commit()
+
+    # Un sitio con muchas reseñas aprobadas para /api/reviews?site_id=
+    popular_site = db.session.query(Review.site_id).filter(Review.status == 'Aprobada')\
+        .group_by(Review.site_id).order_by(func.count(Review.id).desc()).limit(1).scalar()
+    tag_ids = [id for (id,) in db.session.query(HistoricSiteTag.tag_id)
+               .group_by(HistoricSiteTag.tag_id).order_by(func.count().desc()).limit(2)]
+    return {
+        'user_id': user_id,
+        'state_id': min(catalogs['states'].values()),
+        'tag_ids': tag_ids,
+        'sample_site_ids': rng.sample(live_ids, min(50, len(live_ids))),
+        'popular_site_id': popular_site or live_ids[0],
+    }
+
+
+def _dataset_counts():
+    return {
+        'sites': db.session.query(func.count(Site.id)).scalar(),
+        'reviews': db.session.query(func.count(Review.id)).scalar(),
+        'site_tags': db.session.query(func.count(HistoricSiteTag.id)).scalar(),
+        'favorites': db.session.query(func.count(UserFavorite.id)).scalar(),
+    }
+
+
+def _cases(ref, only=None):
+    """Lista de (nombre, [urls]): cada request medido toma la siguiente url de la lista."""
+    tags = ",".join(str(tag) for tag in ref['tag_ids'])
+    filters = {
+        'none': {},
+        'q': {'q': 'iglesia colonial'},
+        'province': {'province': 'Córdoba'},
+        'city': {'city': 'Rosario'},
+        'state': {'state': ref['state_id']},
+        'tags': {'tags': tags},
+        'radius': {'lat': -34.6037, 'lng': -58.3816, 'radius': 50},
+        'combined': {'q': 'museo', 'province': 'Buenos Aires', 'tags': tags},
+    }
+    cases = []
+    for filter_name, params in filters.items():
+        sorts = ['site_name', 'registration', 'rating', 'views']
+        if 'q' in params:
+            sorts.append('relevance')
+        if 'lat' in params:
+            sorts.append('distance')
+        for sort in sorts:
+            for order in ('asc', 'desc'):
+                query = urlencode(dict(params, sort=sort, order=order))
+                cases.append((f"sites[{filter_name}] sort={sort} {order}", [f"/api/sites/?{query}"]))
+    cases += [
+        ("sites cursor", ["/api/sites/?cursor="]),
+        ("sites page=50", ["/api/sites/?page=50"]),
+        ("site detail", [f"/api/sites/{site_id}" for site_id in ref['sample_site_ids']]),
+        ("top-ranked", ["/api/sites/top-ranked"]),
+    ]
+    for sort in ('added_date', 'site_name', 'rating', 'registration'):
+        cases.append((f"favorites sort={sort}", [f"/api/sites/favorites?user_id={ref['user_id']}&sort={sort}"]))
+    cases += [
+        ("reviews", ["/api/reviews?page=1"]),
+        ("reviews site", [f"/api/reviews?site_id={ref['popular_site_id']}"]),
+        ("reviews cursor rating", ["/api/reviews?cursor=&sort=rating"]),
+    ]
+    if only:
+        cases = [case for case in cases if only in case[0]]
+    return cases
+
+
+def _percentile(values, percent):
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, round(percent / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def _measure(app, client, counter, urls, args):
+    for index in range(args.warmup):
+        client.get(urls[index % len(urls)])
+
+    timings, queries, statuses, size = [], [], set(), 0
+    started = time.perf_counter()
+    for index in range(args.requests):
+        if not args.warm_cache:
+            app.cache.clear()
+        counter[0] = 0
+        start = time.perf_counter()
+        response = client.get(urls[index % len(urls)])
+        timings.append((time.perf_counter() - start) * 1000)
+        queries.append(counter[0])
+        statuses.add(response.status_code)
+        size = len(response.get_data())
+    elapsed = time.perf_counter() - started
+
+    return {
+        'path': urls[0],
+        'status': sorted(statuses),
+        'p50_ms': round(_percentile(timings, 50), 2),
+        'p95_ms': round(_percentile(timings, 95), 2),
+        'p99_ms': round(_percentile(timings, 99), 2),
+        'mean_ms': round(sum(timings) / len(timings), 2),
+        'max_ms': round(max(timings), 2),
+        'throughput_rps': round(args.requests / elapsed, 1),
+        'queries_mean': round(sum(queries) / len(queries), 2),
+        'queries_max': max(queries),
+        'bytes': size,
+    }
+
+
+def _git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True).stdout.strip()
+    except OSError:
+        return None
+
+
+def _compare(results, baseline, threshold):
+    """Casos con p95 peor que el baseline más el umbral, o con más consultas."""
+    previous = {case['name']: case for case in baseline['results']}
+    regressions = []
+    for case in results:
+        before = previous.get(case['name'])
+        if not before:
+            continue
+        slower = (case['p95_ms'] > before['p95_ms'] * (1 + threshold)
+                  and case['p95_ms'] - before['p95_ms'] > MIN_REGRESSION_MS)
+        more_queries = case['queries_max'] > before['queries_max']
+        if slower or more_queries:
+            regressions.append({
+                'name': case['name'],
+                'p95_ms': [before['p95_ms'], case['p95_ms']],
+                'queries_max': [before['queries_max'], case['queries_max']],
+            })
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url", help="Base PostGIS a usar (por defecto DATABASE_URL o la de desarrollo).")
+    parser.add_argument("--sites", type=int, default=10000, help="Sitios sintéticos del dataset.")
+    parser.add_argument("--reviews", type=int, default=100000, help="Reseñas sintéticas del dataset.")
+    parser.add_argument("--favorites", type=int, default=200, help="Favoritos del usuario de benchmark.")
+    parser.add_argument("--seed", type=int, default=2025)
+    parser.add_argument("--requests", type=int, default=30, help="Requests medidos por caso.")
+    parser.add_argument("--warmup", type=int, default=3, help="Requests previos (no medidos) por caso.")
+    parser.add_argument("--warm-cache", action="store_true", help="No vaciar el cache entre requests.")
+    parser.add_argument("--only", help="Solo los casos cuyo nombre contenga este texto.")
+    parser.add_argument("--output", help="Archivo JSON de salida (por defecto stdout).")
+    parser.add_argument("--baseline", help="JSON de una corrida anterior para comparar.")
+    parser.add_argument("--threshold", type=float, default=0.25, help="Empeoramiento tolerado del p95 (0.25 = 25%%).")
+    args = parser.parse_args()
+
+    # La configuración lee DATABASE_URL al importarse: se importa la app después de fijarla
+    if args.database_url:
+        os.environ["DATABASE_URL"] = args.database_url
+    from src.web import create_app
+
+    app = create_app()
+    app.testing = True
+    client = app.test_client()
+
+    with app.app_context():
+        start = time.perf_counter()
+        ref = _prepare_dataset(args)
+        dataset = _dataset_counts()
+        print(f"Dataset listo en {time.perf_counter() - start:.1f} s: {dataset}", file=sys.stderr)
+
+        counter = [0]
+
+        @event.listens_for(db.engine, "before_cursor_execute")
+        def _count(conn, cursor, statement, parameters, context, executemany):
+            counter[0] += 1
+
+        database = db.engine.url.render_as_string(hide_password=True)
+        db.session.remove()
+
+    results = []
+    for name, urls in _cases(ref, args.only):
+        result = dict(name=name, **_measure(app, client, counter, urls, args))
+        results.append(result)
+        print(f"{name:<45}{result['p50_ms']:>9.1f}{result['p95_ms']:>9.1f} ms"
+              f"{result['throughput_rps']:>9.1f} req/s{result['queries_mean']:>7.1f} q", file=sys.stderr)
+
+    report = {
+        'meta': {
+            'timestamp': datetime.now(timezone.utc).isoformat(),
+            'git_commit': _git_commit(),
+            'python': platform.python_version(),
+            'database': database,
+            'dataset': dataset,
+            'seed': args.seed,
+            'requests': args.requests,
+            'warmup': args.warmup,
+            'cache': 'warm' if args.warm_cache else 'cold',
+        },
+        'results': results,
+    }
+
+    regressions = []
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = _compare(results, json.load(f), args.threshold)
+        report['regressions'] = regressions
+        for regression in regressions:
+            print(f"EMPEORÓ {regression['name']}: p95 {regression['p95_ms']}, "
+                  f"consultas {regression['queries_max']}", file=sys.stderr)
+
+    output = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output + "\n")
+    else:
+        print(output)
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
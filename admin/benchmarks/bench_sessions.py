@@ -0,0 +1,111 @@
+"""
+Benchmark: costo por request de leer la sesión del admin con cada backend.
+
+Cada backend se monta en una app Flask mínima con el mismo contenido de sesión
+que guarda el login (user, user_id, role_name, is_admin, role_id). Se hace el
+login una vez y se miden N requests que leen `session["user_id"]`, como hacen
+los controladores del admin.
+
+- cookie: sesión firmada en la cookie (sin E/S).
+- filesystem: el backend anterior; --stale-sessions simula el directorio lleno.
+- sqlalchemy: tabla de sesiones (por defecto SQLite en memoria; --database-url para Postgres).
+- redis: solo si se pasa --redis-url.
+
+Uso (desde admin/):
+    PYTHONPATH=src python benchmarks/bench_sessions.py --requests 2000
+    PYTHONPATH=src python benchmarks/bench_sessions.py --database-url postgresql://... --redis-url redis://localhost:6379/1
+"""
+import argparse
+import os
+import statistics
+import tempfile
+import time
+
+from flask import Flask, session
+from flask_session import Session
+from flask_sqlalchemy import SQLAlchemy
+
+LOGIN_DATA = {
+    "user": "admin@example.com",
+    "user_id": 1,
+    "role_name": "Administrador",
+    "is_admin": True,
+    "role_id": 1,
+}
+
+
+def _app(backend, args, tmpdir):
+    app = Flask(__name__)
+    app.config["SECRET_KEY"] = "bench"
+    if backend == "filesystem":
+        app.config.update(SESSION_TYPE="filesystem", SESSION_FILE_DIR=os.path.join(tmpdir, "sessions"))
+    elif backend == "sqlalchemy":
+        db = SQLAlchemy()
+        app.config.update(
+            SQLALCHEMY_DATABASE_URI=args.database_url or "sqlite://",
+            SESSION_TYPE="sqlalchemy",
+            SESSION_SQLALCHEMY=db,
+            SESSION_SQLALCHEMY_TABLE="bench_sessions",
+        )
+        db.init_app(app)
+    elif backend == "redis":
+        import redis
+
+        app.config.update(SESSION_TYPE="redis", SESSION_REDIS=redis.Redis.from_url(args.redis_url))
+    if backend != "cookie":
+        Session(app)
+
+    @app.route("/login")
+    def login():
+        session.update(LOGIN_DATA)
+        return ""
+
+    @app.route("/read")
+    def read():
+        return str(session.get("user_id"))
+
+    return app
+
+
+def _fill_filesystem(app, count):
+    """Crea sesiones viejas para medir el directorio con muchos archivos."""
+    for _ in range(count):
+        app.test_client().get("/login")
+
+
+def _measure(app, requests, runs):
+    client = app.test_client()
+    client.get("/login")
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        for _ in range(requests):
+            client.get("/read")
+        timings.append((time.perf_counter() - start) * 1_000_000 / requests)
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--stale-sessions", type=int, default=400)
+    parser.add_argument("--database-url")
+    parser.add_argument("--redis-url")
+    args = parser.parse_args()
+
+    backends = ["cookie", "filesystem", "sqlalchemy"]
+    if args.redis_url:
+        backends.append("redis")
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        print(f"{args.requests} requests x {args.runs} corridas (mediana)")
+        for backend in backends:
+            app = _app(backend, args, tmpdir)
+            if backend == "filesystem":
+                _fill_filesystem(app, args.stale_sessions)
+            print(f"{backend:<12} {_measure(app, args.requests, args.runs):8.1f} µs/request")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""
+Benchmark: costo por sitio de obtener latitud/longitud, incluyendo la consulta a la base.
+
+- antes: se leía la columna location (WKB) y las propiedades Site.latitude/longitude
+  la decodificaban con shapely (`to_shape`) una vez cada una, por cada sitio.
+- después: ST_Y/ST_X se calculan en SQL (column_property) y llegan como floats.
+
+Cada corrida ejecuta la consulta real sobre los primeros --sites sitios con ubicación
+y convierte las filas a {latitude, longitude}; se informa la mediana en µs por sitio.
+
+Necesita una base PostGIS con sitios (por defecto la de desarrollo, o --database-url /
+DATABASE_URL); para completar el dataset usar `flask seed-db --sites N`.
+
+Uso (desde admin/):
+    PYTHONPATH=src python benchmarks/bench_site_coordinates.py --sites 10000 --runs 5
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+from geoalchemy2.shape import to_shape
+
+from core.database import db
+from core.models.Site import Site
+
+
+def _before(limit):
+    rows = db.session.query(Site.location)\
+        .filter(Site.location.isnot(None))\
+        .order_by(Site.id)\
+        .limit(limit)\
+        .all()
+    return [
+        {"latitude": float(to_shape(location).y), "longitude": float(to_shape(location).x)}
+        for (location,) in rows
+    ]
+
+
+def _after(limit):
+    rows = db.session.query(Site.latitude, Site.longitude)\
+        .filter(Site.location.isnot(None))\
+        .order_by(Site.id)\
+        .limit(limit)\
+        .all()
+    return [
+        {"latitude": latitude, "longitude": longitude}
+        for latitude, longitude in rows
+    ]
+
+
+def _time(fn, limit, runs):
+    fn(limit)  # calienta el cache de la base
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        total = len(fn(limit))
+        timings.append((time.perf_counter() - start) * 1_000_000 / total)
+        db.session.remove()
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url", help="Base PostGIS a usar (por defecto DATABASE_URL o la de desarrollo).")
+    parser.add_argument("--sites", type=int, default=10000)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    # La configuración lee DATABASE_URL al importarse: se importa la app después de fijarla
+    if args.database_url:
+        os.environ["DATABASE_URL"] = args.database_url
+    from src.web import create_app
+
+    app = create_app()
+    with app.app_context():
+        available = db.session.query(Site.id).filter(Site.location.isnot(None)).limit(args.sites).count()
+        if not available:
+            print("No hay sitios con ubicación: correr `flask seed-db --sites N`", file=sys.stderr)
+            return 1
+
+        before = _time(_before, args.sites, args.runs)
+        after = _time(_after, args.sites, args.runs)
+
+    print(f"{available} sitios")
+    print(f"antes (WKB + to_shape x2) {before:8.2f} µs/sitio")
+    print(f"después (ST_Y/ST_X)       {after:8.2f} µs/sitio")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
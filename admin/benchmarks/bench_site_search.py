@@ -0,0 +1,78 @@
+"""
+Benchmark: búsqueda de sitios con ILIKE (ruta anterior) vs texto completo (tsvector + GIN).
+
+Inserta N sitios sintéticos dentro de una transacción que se revierte al final,
+así que se puede correr contra la base de desarrollo sin dejar datos.
+
+Uso (desde admin/):
+    PYTHONPATH=src python benchmarks/bench_site_search.py --sites 100000 --runs 20
+"""
+import argparse
+import statistics
+import time
+
+from sqlalchemy import text
+
+from src.web import create_app
+from core.database import db
+from core.models.Site import Site
+from core.utils.search import build_search_query
+
+QUERIES = ["catedral", "museo historico", "informacion", "\"la plata\"", "cabildo -colonial"]
+
+INSERT_SITES = text("""
+    INSERT INTO sites (site_name, short_desc, full_desc, city, province, operning_year,
+                       active, deleted, views, category_id, state_id, location)
+    SELECT
+        'Bench ' || g || ' ' || (ARRAY['Catedral', 'Museo', 'Cabildo', 'Estación', 'Teatro', 'Fuerte'])[1 + g % 6],
+        (ARRAY['Sitio histórico', 'Museo histórico', 'Edificio colonial', 'Monumento'])[1 + g % 4],
+        'Descripción número ' || g || ' con información sobre la historia del lugar y su arquitectura '
+            || (ARRAY['colonial', 'neoclásica', 'moderna', 'jesuítica'])[1 + g % 4],
+        (ARRAY['La Plata', 'Córdoba', 'Rosario', 'Mendoza', 'Salta', 'Ushuaia'])[1 + g % 6],
+        (ARRAY['Buenos Aires', 'Córdoba', 'Santa Fe', 'Mendoza', 'Salta', 'Tierra del Fuego'])[1 + g % 6],
+        1800 + g % 200,
+        true, false, 0, :category_id, :state_id,
+        ST_SetSRID(ST_MakePoint(-70 + random() * 15, -55 + random() * 33), 4326)
+    FROM generate_series(1, :amount) AS g
+""")
+
+
+def _time_query(build, runs):
+    """Mide lo mismo que cuesta una página del listado: 12 filas + el COUNT del total."""
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        query = build()
+        query.limit(12).all()
+        query.count()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings), max(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sites", type=int, default=100000)
+    parser.add_argument("--runs", type=int, default=20)
+    args = parser.parse_args()
+
+    app = create_app()
+    with app.app_context():
+        try:
+            category_id = db.session.execute(text("SELECT min(id) FROM categories")).scalar()
+            state_id = db.session.execute(text("SELECT min(id) FROM states")).scalar()
+            start = time.perf_counter()
+            db.session.execute(INSERT_SITES, {"amount": args.sites, "category_id": category_id, "state_id": state_id})
+            db.session.execute(text("ANALYZE sites"))
+            print(f"{args.sites} sitios insertados en {time.perf_counter() - start:.1f} s\n")
+
+            print(f"{'consulta':<22}{'ILIKE med/max (ms)':>22}{'FTS med/max (ms)':>22}")
+            for q in QUERIES:
+                ilike = _time_query(lambda: build_search_query(Site, {"search_text": q.strip('"')}), args.runs)
+                fts = _time_query(lambda: build_search_query(Site, {"full_text": q}), args.runs)
+                print(f"{q:<22}{ilike[0]:>12.1f} / {ilike[1]:<8.1f}{fts[0]:>12.1f} / {fts[1]:<8.1f}")
+        finally:
+            db.session.rollback()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,3 +1,17 @@
 -- Este script se ejecutará automáticamente al iniciar el contenedor por primera vez.
 -- Instala la extensión PostGIS
-CREATE EXTENSION IF NOT EXISTS postgis;
\ No newline at end of file
+CREATE EXTENSION IF NOT EXISTS postgis;
+-- Búsqueda de texto completo en español sin distinguir acentos (ver core/models/Site.py)
+CREATE EXTENSION IF NOT EXISTS unaccent;
+DO $$
+BEGIN
+    IF NOT EXISTS (SELECT 1 FROM pg_ts_config WHERE cfgname = 'spanish_unaccent') THEN
+        CREATE TEXT SEARCH CONFIGURATION public.spanish_unaccent (COPY = pg_catalog.spanish);
+        ALTER TEXT SEARCH CONFIGURATION public.spanish_unaccent
+            ALTER MAPPING FOR hword, hword_part, word WITH unaccent, spanish_stem;
+    END IF;
+END
+$$;
+
+-- Índices de trigramas para búsquedas parciales (ciudad, provincia, emails)
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
@@ -0,0 +1,37 @@
+"""Asignación única de permisos por rol
+
+Los seeds insertan role_permissions con ON CONFLICT DO NOTHING, que necesita una
+restricción única sobre (role_id, permission_id). Antes de crearla se eliminan
+las asignaciones repetidas que pudiera haber.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18 12:10:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0002'
+down_revision = '0001'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.execute("""
+        DELETE FROM role_permissions a
+        USING role_permissions b
+        WHERE a.role_id = b.role_id
+          AND a.permission_id = b.permission_id
+          AND a.id > b.id
+    """)
+    with op.batch_alter_table('role_permissions', schema=None) as batch_op:
+        batch_op.create_index('uq_role_permissions_role_permission', ['role_id', 'permission_id'], unique=True)
+
+
+def downgrade():
+    with op.batch_alter_table('role_permissions', schema=None) as batch_op:
+        batch_op.drop_index('uq_role_permissions_role_permission')
@@ -1,14 +1,28 @@
+import logging
+import os
+
+from flask_migrate import Migrate, upgrade
 from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
 
 db = SQLAlchemy()
+migrate = Migrate()
+
+logger = logging.getLogger(__name__)
+
+# Migraciones versionadas (Alembic): admin/migrations
+MIGRATIONS_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "migrations"))
+
+
+class SchemaOutdatedError(RuntimeError):
+    """La base no está en la última migración (correr `flask db upgrade`)."""
 
 
 def init_db(app):
     db.init_app(app)
+    migrate.init_app(app, db, directory=MIGRATIONS_DIR)
     configure_db(app)
-
-    with app.app_context():
-        db.create_all()
     return app
 
 
@@ -19,9 +33,52 @@ def configure_db(app):
     return app
 
 
+def schema_revisions(app):
+    """
+    Devuelve (revisiones aplicadas en la base, revisiones head de las migraciones).
+    """
+    from alembic.migration import MigrationContext
+    from alembic.script import ScriptDirectory
+
+    with app.app_context():
+        script = ScriptDirectory.from_config(migrate.get_config(MIGRATIONS_DIR))
+        with db.engine.connect() as conn:
+            current = MigrationContext.configure(conn).get_current_heads()
+    return set(current), set(script.get_heads())
+
+
+def check_schema(app, strict=False):
+    """
+    Verifica que la base esté en la última migración, sin ejecutar DDL.
+
+    Args:
+        strict (bool): si True (producción) una base desactualizada o inaccesible
+            impide arrancar; si no, solo se registra una advertencia
+    """
+    try:
+        current, heads = schema_revisions(app)
+    except OperationalError as e:
+        if strict:
+            raise
+        logger.warning(f"No se pudo verificar la versión del esquema: {e}")
+        return False
+    if current != heads:
+        message = (
+            f"Esquema desactualizado (base: {sorted(current) or 'sin migrar'}, "
+            f"migraciones: {sorted(heads)}). Ejecutar `flask db upgrade`."
+        )
+        if strict:
+            raise SchemaOutdatedError(message)
+        logger.warning(message)
+        return False
+    return True
+
+
 def reset_db(app):
-    "Elimina la db actual y crea todas las tablas"
+    "Elimina la db actual y la recrea con las migraciones"
     with app.app_context():
         db.drop_all()
-        db.create_all()
-        print("Database has been reset.")
\ No newline at end of file
+        db.session.execute(text("DROP TABLE IF EXISTS alembic_version"))
+        db.session.commit()
+        upgrade(directory=MIGRATIONS_DIR)
+        print("Database has been reset.")
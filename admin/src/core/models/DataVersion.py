@@ -0,0 +1,16 @@
+from core.database import db
+from sqlalchemy import Column, String, BigInteger, DateTime
+from sqlalchemy import func
+
+
+class DataVersion(db.Model):
+    """
+    Versión de un conjunto de datos ('sites', 'tags', 'reviews', 'views').
+    Se incrementa en la misma transacción que modifica los datos; las respuestas
+    cacheadas (ETag) se derivan de estas versiones, así todos los procesos ven el cambio.
+    """
+    __tablename__ = 'data_versions'
+
+    scope = Column(String(30), primary_key=True)
+    version = Column(BigInteger, nullable=False, default=0)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
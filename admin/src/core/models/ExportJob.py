@@ -0,0 +1,63 @@
+from core.database import db
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, JSON, Index
+from sqlalchemy import func
+
+
+class ExportJob(db.Model):
+    """
+    Exportación de sitios ejecutada en segundo plano.
+    El archivo generado se guarda en MinIO (object_name) y se descarga con una URL firmada.
+    """
+    __tablename__ = 'export_jobs'
+
+    STATUS_PENDING = 'pending'
+    STATUS_RUNNING = 'running'
+    STATUS_DONE = 'done'
+    STATUS_FAILED = 'failed'
+
+    id = Column(String(36), primary_key=True)
+    user_id = Column(Integer, ForeignKey('users.id', ondelete='SET NULL'), nullable=True)
+    format = Column(String(10), nullable=False)
+    status = Column(String(10), nullable=False, default=STATUS_PENDING)
+
+    # Parámetros del listado exportado (mismos que export_csv)
+    filters = Column(JSON, nullable=False, default=dict)
+    order_by = Column(String(30), nullable=False, default='site_name')
+    sorted_by = Column(String(4), nullable=False, default='asc')
+
+    # Progreso
+    rows_total = Column(Integer, nullable=True)
+    rows_done = Column(Integer, nullable=False, default=0)
+
+    # Resultado
+    object_name = Column(String(255), nullable=True)
+    file_size = Column(Integer, nullable=True)
+    error = Column(String(500), nullable=True)
+
+    # --- Timestamps ---
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    started_at = Column(DateTime(timezone=True), nullable=True)
+    finished_at = Column(DateTime(timezone=True), nullable=True)
+
+    __table_args__ = (
+        Index('ix_export_jobs_user_created', 'user_id', 'created_at'),
+    )
+
+    @property
+    def is_finished(self) -> bool:
+        return self.status in (self.STATUS_DONE, self.STATUS_FAILED)
+
+    def to_dict(self):
+        """Devuelve una representación de diccionario del objeto ExportJob (SERIALIZACIÓN JSON)."""
+        return {
+            'id': self.id,
+            'format': self.format,
+            'status': self.status,
+            'rows_total': self.rows_total,
+            'rows_done': self.rows_done,
+            'file_size': self.file_size,
+            'error': self.error,
+            'created_at': self.created_at.isoformat() if self.created_at else None,
+            'started_at': self.started_at.isoformat() if self.started_at else None,
+            'finished_at': self.finished_at.isoformat() if self.finished_at else None,
+        }
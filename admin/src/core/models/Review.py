@@ -1,5 +1,5 @@
 from core.database import db
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Index
 from sqlalchemy import func, Boolean as bool
 from sqlalchemy.orm import relationship
 
@@ -17,6 +17,15 @@ class Review(db.Model):
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
 
+    __table_args__ = (
+        # Trigramas (pg_trgm) para el filtro parcial por email del moderador
+        Index('ix_reviews_user_email_trgm', 'user_email', postgresql_using='gin', postgresql_ops={'user_email': 'gin_trgm_ops'}),
+        # Reseñas de un sitio por estado, ordenadas por fecha (detalle del sitio, agregados)
+        Index('ix_reviews_site_status_created', 'site_id', 'status', 'created_at'),
+        # Listado de moderación filtrado por estado
+        Index('ix_reviews_status_created', 'status', 'created_at'),
+    )
+
     # RELACIÓN 1: Una reseña pertenece a un sitio histórico.
     # CLAVE FORÁNEA: Columna que referencia la tabla 'sites'.
     site = relationship("Site", backref="reviews", lazy=True)
@@ -1,5 +1,5 @@
 from core.database import db
-from sqlalchemy import Column, Integer, ForeignKey
+from sqlalchemy import Column, Integer, ForeignKey, Index
 
 
 class Role_permission(db.Model):
@@ -10,5 +10,10 @@ class Role_permission(db.Model):
     # permission_id should reference permissions.id
     permission_id = Column(Integer, ForeignKey('permissions.id'), nullable=False)
 
+    __table_args__ = (
+        # Un permiso se asigna una sola vez por rol (los seeds insertan con ON CONFLICT)
+        Index('uq_role_permissions_role_permission', 'role_id', 'permission_id', unique=True),
+    )
+
     def __repr__(self):
         return f'<Role_permission {self.role_id} - {self.permission_id}>'
\ No newline at end of file
@@ -1,9 +1,9 @@
 from core.database import db
-from sqlalchemy import Column, Integer, String, DateTime,ForeignKey
+from sqlalchemy import Column, Integer, String, DateTime,ForeignKey, Computed, Index, Float
 from sqlalchemy import func, Boolean as bool
-from sqlalchemy.orm import relationship
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.orm import relationship, deferred, column_property
 from geoalchemy2 import Geometry 
-from geoalchemy2.shape import to_shape
 
 class Site(db.Model):
     __tablename__ = 'sites'
@@ -29,6 +29,27 @@ class Site(db.Model):
         nullable=True # Puede ser False si la ubicación es obligatoria
     )
     
+    # Vector de búsqueda de texto completo (columna generada por PostgreSQL).
+    # Pesos: A = nombre, B = descripción breve y ubicación, C = descripción completa.
+    # Usa la configuración 'spanish_unaccent' (español + unaccent, creada en la migración inicial).
+    search_vector = deferred(Column(
+        TSVECTOR,
+        Computed(
+            "setweight(to_tsvector('public.spanish_unaccent', coalesce(site_name, '')), 'A') || "
+            "setweight(to_tsvector('public.spanish_unaccent', coalesce(short_desc, '')), 'B') || "
+            "setweight(to_tsvector('public.spanish_unaccent', coalesce(city, '') || ' ' || coalesce(province, '')), 'B') || "
+            "setweight(to_tsvector('public.spanish_unaccent', coalesce(full_desc, '')), 'C')",
+            persisted=True
+        )
+    ))
+
+    __table_args__ = (
+        Index('ix_sites_search_vector', 'search_vector', postgresql_using='gin'),
+        # Trigramas (pg_trgm): ILIKE '%texto%' y búsquedas con errores de tipeo usan índice
+        Index('ix_sites_city_trgm', 'city', postgresql_using='gin', postgresql_ops={'city': 'gin_trgm_ops'}),
+        Index('ix_sites_province_trgm', 'province', postgresql_using='gin', postgresql_ops={'province': 'gin_trgm_ops'}),
+    )
+
     # RELACIÓN 1: Un sitio historico tiene muchas auditorías.
     audits = relationship(
         "Audit", 
@@ -53,37 +74,10 @@ class Site(db.Model):
         cascade="all, delete-orphan"
     )
 
-    from geoalchemy2.shape import to_shape
-
-    @property
-    def latitude(self):
-        if not self.location:
-            return None
-        try:
-            point = to_shape(self.location)
-            return float(point.y)
-        except Exception as e:
-            try:
-                #print(f"[Site.latitude] Error convirtiendo location={type(self.location)} {self.location}: {e}")
-                pass
-            except Exception:
-                pass
-            return None
-
-    @property
-    def longitude(self):
-        if not self.location:
-            return None
-        try:
-            point = to_shape(self.location)
-            return float(point.x)
-        except Exception as e:
-            try:
-                #print(f"[Site.longitude] Error convirtiendo location={type(self.location)} {self.location}: {e}")
-                pass
-            except Exception:
-                pass
-            return None
+    # Coordenadas calculadas en SQL (ST_Y/ST_X) y cargadas junto con el sitio como floats,
+    # sin decodificar el WKB con shapely por cada serialización. NULL si no hay ubicación.
+    latitude = column_property(func.ST_Y(location, type_=Float))
+    longitude = column_property(func.ST_X(location, type_=Float))
 
     @property
     def cover_image(self):
@@ -96,58 +90,23 @@ class Site(db.Model):
     def to_dict(self):
         """
         Devuelve una representación de diccionario del objeto Site (SERIALIZACIÓN JSON).
+        Para listados usar SiteService.sites_to_dict, que serializa el lote completo
+        con una cantidad fija de consultas.
         """
         from core.services.sites_service import SiteService
-        from core.services.review_service import ReviewService
-        
-        # Obtener la URL pre-firmada de la imagen de portada
-        cover_url = None
-        if self.cover_image:
-            cover_url = self.cover_image.public_url
-        
-        if not cover_url:
-            cover_url = SiteService.build_image_url('/public/default_image.png')
 
-        # Fecha de registro
-        registration_str = self.registration.isoformat() if self.registration else None
-        
-        # Categoria y State
-        category_name = self.category.name if self.category else None
-        state_name = self.state.name if self.state else None # También incluimos el estado
-        
-        # Obtener tags del sitio (máximo 5 para el listado)
-        tags_list = [{'id': assoc.tag.id, 'name': assoc.tag.name} for assoc in self.tag_associations.limit(5).all()]
+        return SiteService.sites_to_dict([self], cover_variant='full')[0]
+
 
-        # Calcular cantidad y promedio de reseñas aprobadas del sitio
-        approved_reviews = ReviewService.get_approved_reviews_by_site(self.id)
-        
-        # Calcular estadísticas
-        reviews_count = len(approved_reviews)
-        
-        if reviews_count > 0:
-            total_rating = sum(review.rating for review in approved_reviews)
-            reviews_average = round(total_rating / reviews_count, 1)
-        else:
-            reviews_average = 0.0
+# Índice GIST sobre geography(location): búsquedas por radio (ST_DWithin en metros)
+# y orden por cercanía (KNN `<->`). Las queries deben usar la misma expresión
+# (ver core.utils.search.location_geography).
+Index('ix_sites_location_geography', func.geography(Site.location), postgresql_using='gist')
 
-        return {
-            'id': self.id,
-            'name': self.site_name,
-            'active': self.active,
-            'cover_image_url': cover_url, # URL
-            'short_desc': self.short_desc,
-            'full_desc': self.full_desc,
-            'city': self.city,
-            'province': self.province,
-            'opening_year': self.operning_year, 
-            'registration': registration_str,
-            'latitude': self.latitude,
-            'longitude': self.longitude,
-            'category_name': category_name,
-            'state_name': state_name, 
-            'views': self.views,
-            'tags': tags_list,
-            'images': [image.to_dict() for image in self.images.all()],
-            'reviews_count': reviews_count,
-            'reviews_average': reviews_average
-        }
\ No newline at end of file
+# Índices parciales sobre los sitios publicados (active AND NOT deleted): el filtro del
+# portal y de la home. Cada uno cubre un orden soportado con el id como desempate
+# (misma expresión que SiteService._sort_expression).
+LIVE_SITES = (Site.active == True) & (Site.deleted == False)
+Index('ix_sites_live_site_name', Site.site_name, Site.id, postgresql_where=LIVE_SITES)
+Index('ix_sites_live_registration', Site.registration, Site.id, postgresql_where=LIVE_SITES)
+Index('ix_sites_live_views', func.coalesce(Site.views, 0), Site.id, postgresql_where=LIVE_SITES)
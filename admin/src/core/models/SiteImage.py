@@ -1,5 +1,5 @@
 from core.database import db
-from sqlalchemy import Column, Integer, String, DateTime,ForeignKey
+from sqlalchemy import Column, Integer, String, DateTime,ForeignKey, Index
 from sqlalchemy import func, Boolean
 from sqlalchemy.orm import relationship
 
@@ -23,16 +23,44 @@ class SiteImage(db.Model):
     description = Column(String(255), nullable=True)
     order_index = Column(Integer, nullable=False)
     is_cover = Column(Boolean, default=False, nullable=False)
+
+    # --- Derivados (claves en MinIO; None si todavía no se generaron) ---
+    thumb_path = Column(String(255), nullable=True)
+    card_path = Column(String(255), nullable=True)
+    full_path = Column(String(255), nullable=True)
     
     # --- Timestamps ---
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), server_default=func.now())
 
+    __table_args__ = (
+        # Imágenes de un lote de sitios en orden (serialización de listados, galería)
+        Index('ix_site_images_site_order', 'site_id', 'order_index'),
+    )
+
+    VARIANTS = ('thumb', 'card', 'full')
+
+    def variant_paths(self) -> list:
+        """Claves de todos los derivados generados (para borrarlos junto al original)."""
+        return [path for path in (self.thumb_path, self.card_path, self.full_path) if path]
+
+    def variant_url(self, variant: str) -> str:
+        """URL pública del derivado pedido (cae al original si no fue generado)."""
+        from flask import current_app
+        path = getattr(self, f"{variant}_path", None)
+        if not path:
+            return self.public_url
+        protocol = "https" if (current_app.config["MINIO_SECURE"] == True) else "http"
+        return f"{protocol}://{current_app.config['MINIO_SERVER']}/{current_app.config['MINIO_BUCKET']}/{path}"
+
     def to_dict(self):
         """Devuelve una representación de diccionario del objeto SiteImage (SERIALIZACIÓN JSON)."""
 
         return {
             'public_url': self.public_url,
+            'thumb_url': self.variant_url('thumb'),
+            'card_url': self.variant_url('card'),
+            'full_url': self.variant_url('full'),
             'file_path': self.file_path,
             'title_alt': self.title_alt,
             'description': self.description,
@@ -0,0 +1,50 @@
+from core.database import db
+from sqlalchemy import Column, Integer, Float, DateTime, ForeignKey, Index
+from sqlalchemy import func
+from sqlalchemy.orm import relationship
+
+
+class SiteRating(db.Model):
+    """
+    Agregado materializado de las reseñas APROBADAS de un sitio.
+    Se mantiene en la misma transacción que modifica la reseña (ver ReviewService)
+    y se puede recalcular completo con `flask rebuild-ratings`.
+    """
+    __tablename__ = 'site_ratings'
+
+    # Una fila por sitio: la PK es el propio site_id
+    site_id = Column(Integer, ForeignKey('sites.id', ondelete='CASCADE'), primary_key=True)
+    reviews_count = Column(Integer, nullable=False, default=0, server_default='0')
+    rating_sum = Column(Integer, nullable=False, default=0, server_default='0')
+    rating_average = Column(Float, nullable=False, default=0, server_default='0')
+
+    # Histograma de estrellas (1 a 5)
+    stars_1 = Column(Integer, nullable=False, default=0, server_default='0')
+    stars_2 = Column(Integer, nullable=False, default=0, server_default='0')
+    stars_3 = Column(Integer, nullable=False, default=0, server_default='0')
+    stars_4 = Column(Integer, nullable=False, default=0, server_default='0')
+    stars_5 = Column(Integer, nullable=False, default=0, server_default='0')
+
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+    # RELACIÓN 1: Cada agregado pertenece a un único sitio (1 a 1).
+    site = relationship("Site", backref=db.backref("rating", uselist=False, passive_deletes=True), lazy=True)
+
+    __table_args__ = (
+        # Ordenamiento por rating y top-ranked sin recorrer la tabla de reseñas
+        Index('ix_site_ratings_average_count', rating_average.desc(), reviews_count.desc()),
+    )
+
+    @property
+    def histogram(self) -> dict:
+        """Devuelve el histograma como {1: n, ..., 5: n}."""
+        return {star: getattr(self, f"stars_{star}") or 0 for star in range(1, 6)}
+
+    def to_dict(self):
+        """Convierte el agregado a diccionario"""
+        return {
+            "site_id": self.site_id,
+            "reviews_count": self.reviews_count,
+            "reviews_average": round(self.rating_average or 0.0, 1),
+            "histogram": self.histogram
+        }
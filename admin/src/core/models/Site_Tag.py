@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Boolean
+from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Boolean, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from core.database import db
@@ -10,5 +10,12 @@ class HistoricSiteTag(db.Model):
     site_id = Column(Integer, ForeignKey('sites.id'), nullable=False)
     tag_id = Column(Integer, ForeignKey('tags.id'), nullable=False)
 
+    __table_args__ = (
+        # Una asociación por par sitio-etiqueta; también resuelve las etiquetas de un sitio
+        Index('uq_historic_site_tag_site_tag', 'site_id', 'tag_id', unique=True),
+        # Filtro de sitios por etiqueta
+        Index('ix_historic_site_tag_tag_site', 'tag_id', 'site_id'),
+    )
+
     site = relationship("Site", back_populates="tag_associations")
     tag = relationship("Tag", back_populates="site_associations")
\ No newline at end of file
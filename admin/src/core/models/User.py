@@ -1,5 +1,5 @@
 from core.database import db
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Index
 from sqlalchemy import func, Boolean
 from sqlalchemy.orm import relationship
 
@@ -18,6 +18,8 @@ class User(db.Model):
     sysAdmin = Column(Boolean, default=False)
     deleted = Column(Boolean, default=False)
     avatar = Column(String, nullable=True)
+    # Miniatura del avatar (derivado generado al subirlo); None para avatares externos
+    avatar_thumb = Column(String, nullable=True)
     
     # RELACIÓN 1: Un Usuario tiene un Rol.
     role_id = Column(Integer, ForeignKey('roles.id'), nullable=True)
@@ -28,5 +30,10 @@ class User(db.Model):
     # RELACIÓN 3: Un Usuario realiza muchas Flags Feature.
     flags = relationship("Flag", backref="user", lazy=True, cascade="all, delete-orphan")
 
+    __table_args__ = (
+        # Trigramas (pg_trgm) para la búsqueda parcial por email
+        Index('ix_users_email_trgm', 'email', postgresql_using='gin', postgresql_ops={'email': 'gin_trgm_ops'}),
+    )
+
     def __repr__(self):
         return f'<User {self.email}>'
@@ -1,5 +1,5 @@
 from core.database import db
-from sqlalchemy import Column, Integer, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, DateTime, ForeignKey, Index
 from sqlalchemy import func
 from sqlalchemy.orm import relationship
 
@@ -11,5 +11,11 @@ class UserFavorite(db.Model):
     site_id = Column(Integer, ForeignKey('sites.id', ondelete='CASCADE'), nullable=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
+    __table_args__ = (
+        # Un favorito por usuario y sitio (el toggle de la API lo asume); también
+        # resuelve los favoritos de un usuario
+        Index('uq_user_favorites_user_site', 'user_id', 'site_id', unique=True),
+    )
+
     user = relationship('User', backref=db.backref('favorites', lazy='dynamic'), lazy=True)
     site = relationship('Site', backref=db.backref('favorites', lazy='dynamic'), lazy=True)
\ No newline at end of file
@@ -0,0 +1,227 @@
+"""
+Generador de datos sintéticos en volumen, para medir búsqueda, paginación y agregados
+con tamaños de producción: `flask seed-db --sites 100000 --reviews 2000000`.
+
+- Las filas se arman en Python con un random.Random sembrado por lote (misma semilla,
+  mismos datos) y se cargan con COPY; la geometría se construye en SQL (ST_MakePoint).
+- Idempotente: los sitios se insertan con ON CONFLICT (site_name) DO NOTHING y las
+  reseñas generadas se cuentan por su dominio de email, así solo se agregan las que faltan.
+  Correr de nuevo con números mayores extiende el dataset.
+- Un commit por lote: una corrida interrumpida se retoma donde quedó.
+
+Necesita los catálogos de core.seeds (categorías, estados y tags).
+"""
+import random
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import text
+
+from core.database import db
+from core.models.Category import Category
+from core.models.Review import Review
+from core.models.Site import Site
+from core.models.State import State
+from core.models.Tag import Tag
+from core.services.rating_service import RatingService
+from core.utils.bulk import copy_rows
+from core.utils import data_version
+
+DEFAULT_SEED = 2025
+DEFAULT_BATCH_SIZE = 20000
+
+# Fecha de referencia fija: las fechas generadas no dependen del día en que se corre
+REFERENCE_DATE = datetime(2025, 1, 1, tzinfo=timezone.utc)
+MAX_AGE_DAYS = 3 * 365
+
+# Las reseñas generadas se reconocen por este dominio
+REVIEW_EMAIL_DOMAIN = 'seed.example'
+READERS = 50000
+
+# (ciudad, provincia, latitud, longitud)
+CITIES = [
+    ('Buenos Aires', 'CABA', -34.6037, -58.3816),
+    ('La Plata', 'Buenos Aires', -34.9214, -57.9545),
+    ('Mar del Plata', 'Buenos Aires', -38.0055, -57.5426),
+    ('Córdoba', 'Córdoba', -31.4201, -64.1888),
+    ('Rosario', 'Santa Fe', -32.9442, -60.6505),
+    ('Santa Fe', 'Santa Fe', -31.6333, -60.7000),
+    ('Mendoza', 'Mendoza', -32.8895, -68.8458),
+    ('San Juan', 'San Juan', -31.5375, -68.5364),
+    ('Salta', 'Salta', -24.7821, -65.4232),
+    ('San Miguel de Tucumán', 'Tucumán', -26.8083, -65.2176),
+    ('San Salvador de Jujuy', 'Jujuy', -24.1858, -65.2995),
+    ('Corrientes', 'Corrientes', -27.4692, -58.8306),
+    ('Posadas', 'Misiones', -27.3671, -55.8961),
+    ('Paraná', 'Entre Ríos', -31.7333, -60.5297),
+    ('Neuquén', 'Neuquén', -38.9516, -68.0591),
+    ('San Carlos de Bariloche', 'Río Negro', -41.1335, -71.3103),
+    ('Ushuaia', 'Tierra del Fuego', -54.8019, -68.3030),
+]
+KINDS = ['Casa', 'Iglesia', 'Estación', 'Fuerte', 'Museo', 'Teatro', 'Molino', 'Capilla',
+         'Puente', 'Escuela', 'Faro', 'Estancia', 'Cabildo', 'Mercado', 'Palacio']
+NAMES = ['San Martín', 'Belgrano', 'Sarmiento', 'Güemes', 'Rivadavia', 'Moreno', 'Mitre',
+         'Alberdi', 'del Carmen', 'San José', 'Santa Rosa', 'del Puerto', 'de la Merced']
+STYLES = ['colonial', 'neoclásico', 'barroco', 'jesuítico', 'moderno', 'art déco', 'italianizante']
+REVIEW_TEXTS = [
+    'Muy bien conservado, vale la pena la visita.',
+    'Interesante, aunque faltan carteles con información.',
+    'Excelente guía y un recorrido muy completo.',
+    'El edificio es impresionante, lástima los horarios reducidos.',
+    'Lindo para ir en familia, los chicos aprendieron mucho.',
+    'Necesita mantenimiento urgente.',
+    'Una joya de la arquitectura local.',
+]
+# Distribuciones de calificación y estado de las reseñas
+RATING_WEIGHTS = [5, 8, 17, 35, 35]
+STATUS_WEIGHTS = {'Aprobada': 80, 'Pendiente': 15, 'Rechazada': 5}
+
+SITE_STAGE_COLUMNS = (
+    'site_name', 'short_desc', 'full_desc', 'city', 'province', 'lat', 'lng',
+    'operning_year', 'category_id', 'state_id', 'active', 'views', 'registration', 'tag_ids',
+)
+REVIEW_COLUMNS = ('site_id', 'user_email', 'rating', 'content', 'status', 'rejection_reason',
+                  'created_at', 'updated_at')
+
+
+def generate(sites: int = 0, reviews: int = 0, seed: int = DEFAULT_SEED, batch_size: int = DEFAULT_BATCH_SIZE):
+    """
+    Completa el dataset hasta `sites` sitios generados y `reviews` reseñas generadas.
+
+    Returns:
+        tuple: (sitios insertados, reseñas insertadas)
+    """
+    inserted_sites = generate_sites(sites, seed, batch_size) if sites else 0
+    inserted_reviews = generate_reviews(reviews, seed, batch_size) if reviews else 0
+
+    if inserted_sites or inserted_reviews:
+        db.session.execute(text("ANALYZE sites, historic_site_tag, reviews"))
+        # Agregados de calificaciones en un único INSERT ... SELECT
+        RatingService.rebuild_all()
+    return inserted_sites, inserted_reviews
+
+
+def generate_sites(total: int, seed: int = DEFAULT_SEED, batch_size: int = DEFAULT_BATCH_SIZE) -> int:
+    category_ids = [id for (id,) in db.session.query(Category.id).order_by(Category.id)]
+    state_ids = [id for (id,) in db.session.query(State.id).order_by(State.id)]
+    tag_ids = [id for (id,) in db.session.query(Tag.id).order_by(Tag.id)]
+    if not category_ids or not state_ids:
+        raise RuntimeError("Faltan categorías o estados: correr primero los seeds base")
+
+    inserted = 0
+    for start in range(0, total, batch_size):
+        stop = min(start + batch_size, total)
+        rows = site_rows(start, stop, seed, category_ids, state_ids, tag_ids)
+
+        db.session.execute(text("""
+            CREATE TEMP TABLE seed_sites_stage (
+                site_name varchar(50), short_desc varchar(50), full_desc varchar(255),
+                city varchar(50), province varchar(50), lat double precision, lng double precision,
+                operning_year integer, category_id integer, state_id integer, active boolean,
+                views integer, registration timestamptz, tag_ids integer[]
+            ) ON COMMIT DROP
+        """))
+        copy_rows('seed_sites_stage', SITE_STAGE_COLUMNS, rows)
+        result = db.session.execute(text("""
+            INSERT INTO sites (site_name, short_desc, full_desc, city, province, operning_year,
+                               category_id, state_id, active, deleted, views, registration, location)
+            SELECT site_name, short_desc, full_desc, city, province, operning_year,
+                   category_id, state_id, active, false, views, registration,
+                   ST_SetSRID(ST_MakePoint(lng, lat), 4326)
+            FROM seed_sites_stage
+            ON CONFLICT (site_name) DO NOTHING
+        """))
+        db.session.execute(text("""
+            INSERT INTO historic_site_tag (site_id, tag_id)
+            SELECT s.id, t.tag_id
+            FROM seed_sites_stage st
+            JOIN sites s ON s.site_name = st.site_name
+            CROSS JOIN LATERAL unnest(st.tag_ids) AS t(tag_id)
+            ON CONFLICT (site_id, tag_id) DO NOTHING
+        """))
+        inserted += result.rowcount
+        _commit({'sites'})
+        print(f"Sitios: {stop}/{total} ({inserted} nuevos)")
+    return inserted
+
+
+def generate_reviews(total: int, seed: int = DEFAULT_SEED, batch_size: int = DEFAULT_BATCH_SIZE) -> int:
+    existing = db.session.query(Review.id).filter(
+        Review.user_email.like(f"%@{REVIEW_EMAIL_DOMAIN}")
+    ).count()
+    if existing >= total:
+        return 0
+
+    site_ids = [id for (id,) in db.session.query(Site.id).filter(
+        Site.active == True, Site.deleted == False
+    ).order_by(Site.id)]
+    if not site_ids:
+        raise RuntimeError("No hay sitios para asignar reseñas")
+
+    inserted = 0
+    # Los lotes quedan alineados a batch_size para que cada índice genere siempre la misma fila
+    for start in range(existing - existing % batch_size, total, batch_size):
+        stop = min(start + batch_size, total)
+        rows = review_rows(start, stop, seed, site_ids)[max(existing - start, 0):]
+        inserted += copy_rows('reviews', REVIEW_COLUMNS, rows)
+        _commit({'reviews'})
+        print(f"Reseñas: {stop}/{total} ({inserted} nuevas)")
+    return inserted
+
+
+def site_rows(start: int, stop: int, seed: int, category_ids: list, state_ids: list, tag_ids: list) -> list:
+    """Filas de sitios para los índices [start, stop), en el orden de SITE_STAGE_COLUMNS."""
+    rng = random.Random(f"{seed}:sites:{start}")
+    rows = []
+    for index in range(start, stop):
+        kind, name, style = rng.choice(KINDS), rng.choice(NAMES), rng.choice(STYLES)
+        city, province, lat, lng = rng.choice(CITIES)
+        year = rng.randint(1600, 1990)
+        tags = rng.sample(tag_ids, min(len(tag_ids), rng.randint(1, 4)))
+        rows.append((
+            f"{kind} {name} #{index:07d}",
+            f"{kind} de estilo {style}",
+            f"{kind} {name}, construcción de estilo {style} del año {year} ubicada en {city}, {province}.",
+            city,
+            province,
+            round(lat + rng.gauss(0, 0.15), 6),
+            round(lng + rng.gauss(0, 0.15), 6),
+            year,
+            rng.choice(category_ids),
+            rng.choice(state_ids),
+            rng.random() < 0.95,
+            min(int(rng.paretovariate(1.2) * 10), 1_000_000),
+            REFERENCE_DATE - timedelta(seconds=rng.randint(0, MAX_AGE_DAYS * 86400)),
+            "{" + ",".join(str(tag) for tag in tags) + "}",
+        ))
+    return rows
+
+
+def review_rows(start: int, stop: int, seed: int, site_ids: list) -> list:
+    """Filas de reseñas para los índices [start, stop), en el orden de REVIEW_COLUMNS."""
+    rng = random.Random(f"{seed}:reviews:{start}")
+    statuses, status_weights = list(STATUS_WEIGHTS), list(STATUS_WEIGHTS.values())
+    rows = []
+    for index in range(start, stop):
+        status = rng.choices(statuses, status_weights)[0]
+        created_at = REFERENCE_DATE - timedelta(seconds=rng.randint(0, MAX_AGE_DAYS * 86400))
+        rows.append((
+            # Los sitios populares reciben más reseñas (distribución sesgada a ids bajos)
+            site_ids[min(int(rng.paretovariate(1.1)) - 1, len(site_ids) - 1)] if rng.random() < 0.3
+            else rng.choice(site_ids),
+            f"lector{index % READERS:05d}@{REVIEW_EMAIL_DOMAIN}",
+            rng.choices(range(1, 6), RATING_WEIGHTS)[0],
+            rng.choice(REVIEW_TEXTS),
+            status,
+            'Contenido inapropiado' if status == 'Rechazada' else None,
+            created_at,
+            created_at,
+        ))
+    return rows
+
+
+def _commit(scopes):
+    # COPY y el SQL textual no pasan por los eventos de la sesión: se incrementan
+    # las versiones de datos a mano para invalidar ETags y cache
+    db.session.execute(data_version.bump_statement(scopes))
+    db.session.commit()
+    data_version.forget(scopes)
@@ -1,5 +1,16 @@
+"""
+Seeds de la aplicación.
+
+- seed_data: datos de demostración (roles, permisos, catálogos, 30 sitios con imágenes,
+  usuarios, flags y reseñas). Es determinista e idempotente: cada entidad se inserta con
+  upsert sobre su clave única, así que volver a correrlo no duplica ni pisa datos editados.
+- Volúmenes grandes para benchmarks: core.seed_generator (`flask seed-db --sites N --reviews N`).
+"""
+import random
+
 from core.database import db
 from geoalchemy2.elements import WKTElement
+from sqlalchemy.dialects.postgresql import insert
 
 # modelos
 from core.models.Role import Role
@@ -16,355 +27,305 @@ from core.models.User import User
 from core.models.Review import Review
 from core.services.user_service import UserService
 from core.services.sites_service import SiteService
+from core.services.rating_service import RatingService
+from core.utils.bulk import insert_missing, upsert
 
-import bcrypt
-
+# Semilla de las elecciones "aleatorias" (etiquetas y auditorías): mismos datos en cada corrida
+SEED = 2025
 
-def seed_data():
-    print(" Cargando seeds en db")
-    # 1) Roles
-    r_admin = Role(name='Administrador')
-    r_user = Role(name='Usuario')
-    r_editor = Role(name='Editor')
-    r_moderator = Role(name='Moderador')
-    db.session.add_all([r_admin, r_user, r_editor, r_moderator])
-    db.session.flush()
+ROLES = ['Administrador', 'Usuario', 'Editor', 'Moderador']
 
-    # 2) Permissions
+# Permiso -> roles que lo tienen
+PERMISSIONS = {
     # Permisos sobre Usuarios
-    u_index = Permission(name="user_index")
-    u_new = Permission(name="user_new")
-    u_update = Permission(name="user_update")
-    u_destroy = Permission(name="user_destroy")
-    u_show = Permission(name="user_show")
-    u_deactivate = Permission(name="user_deactivate")
-
+    'user_index': ['Administrador'],
+    'user_new': ['Administrador'],
+    'user_update': ['Administrador'],
+    'user_destroy': ['Administrador'],
+    'user_show': ['Administrador'],
+    'user_deactivate': ['Administrador'],
     # Permisos para sitios históricos
-    s_index = Permission(name="site_index")
-    s_new = Permission(name="site_new")
-    s_update = Permission(name="site_update")
-    s_destroy = Permission(name="site_destroy")
-    s_show = Permission(name="site_show")
-    s_export = Permission(name="site_export")
-    s_history = Permission(name="site_history")
-    s_restore = Permission(name="site_restore")
-
+    'site_index': ['Editor', 'Usuario'],
+    'site_new': ['Administrador'],
+    'site_update': ['Administrador', 'Editor'],
+    'site_destroy': ['Administrador'],
+    'site_show': ['Editor'],
+    'site_export': [],
+    'site_history': ['Administrador'],
+    'site_restore': [],
     # Permisos para tags
-    t_index = Permission(name="tag_index")
-    t_new = Permission(name="tag_new")
-    t_update = Permission(name="tag_update")
-    t_destroy = Permission(name="tag_destroy")
-    t_show = Permission(name="tag_show")
-
-    # Permisos para flags
-    # f_index = Permission(name='flag_index')
-    # f_update = Permission(name='flag_update')
-    # Lo dejo comentado porque el SysAdmin no es un Rol como tal, no le puedo asignar permisos
-
+    'tag_index': ['Administrador', 'Editor'],
+    'tag_new': ['Administrador', 'Editor'],
+    'tag_update': ['Administrador', 'Editor'],
+    'tag_destroy': ['Administrador', 'Editor'],
+    'tag_show': ['Administrador', 'Editor'],
+    # Permisos para flags: el SysAdmin no es un Rol como tal, no se le asignan permisos
     # Permisos para reviews
-    r_index = Permission(name='review_index')
-    r_approve = Permission(name='review_approve')
-    r_reject = Permission(name='review_reject')
-    r_destroy = Permission(name='review_destroy')
-
+    'review_index': ['Administrador', 'Editor', 'Moderador'],
+    'review_approve': ['Administrador', 'Editor', 'Moderador'],
+    'review_reject': ['Administrador', 'Editor', 'Moderador'],
+    'review_destroy': ['Administrador', 'Editor', 'Moderador'],
     # Permisos para la exportación
-    e_export = Permission(name='exporter_export')
-
-    db.session.add_all([
-        u_index, u_new, u_update, u_destroy, u_show, u_deactivate,
-        s_index, s_new, s_update, s_destroy, s_show, s_export, s_history, s_restore,
-        t_index, t_new, t_update, t_destroy, t_show, r_index, r_approve, r_reject, r_destroy,
-      #  f_index, f_update,
-        e_export,
-    ])
-    db.session.flush()
-
-    # 3) Role-Permissions
-    # Role-Permissions para Administradores
-    rp_admin_user_permissions = [
-        Role_permission(role_id=r_admin.id, permission_id=u_index.id),
-        Role_permission(role_id=r_admin.id, permission_id=u_new.id),
-        Role_permission(role_id=r_admin.id, permission_id=u_update.id),
-        Role_permission(role_id=r_admin.id, permission_id=u_destroy.id),
-        Role_permission(role_id=r_admin.id, permission_id=u_show.id),
-        Role_permission(role_id=r_admin.id, permission_id=u_deactivate.id),
-        Role_permission(role_id=r_admin.id, permission_id=s_destroy.id),        
-        Role_permission(role_id=r_admin.id, permission_id=s_new.id),
-        Role_permission(role_id=r_admin.id, permission_id=s_update.id),                
-        Role_permission(role_id=r_admin.id, permission_id=s_history.id),                
-        Role_permission(role_id=r_admin.id, permission_id=t_index.id),           
-        Role_permission(role_id=r_admin.id, permission_id=t_new.id),
-        Role_permission(role_id=r_admin.id, permission_id=t_update.id),
-        Role_permission(role_id=r_admin.id, permission_id=t_destroy.id),  
-        Role_permission(role_id=r_admin.id, permission_id=t_show.id),    
-        Role_permission(role_id=r_admin.id, permission_id=e_export.id),  
-
-        # ------Reseñas------
-        Role_permission(role_id=r_admin.id, permission_id=r_index.id),
-        Role_permission(role_id=r_admin.id, permission_id=r_approve.id),
-        Role_permission(role_id=r_admin.id, permission_id=r_reject.id),
-        Role_permission(role_id=r_admin.id, permission_id=r_destroy.id),                                    
-    ]
+    'exporter_export': ['Administrador'],
+}
+
+CATEGORIES = {'ARQ': 'Arquitectura', 'DINO': 'Sitio Arqueológico', 'INFRA': 'Infraestructura'}
+STATES = ['Bueno', 'Regular', 'Malo']
+
+TAGS = [
+    ('Historia', 'historia'),
+    ('Arte', 'arte'),
+    # Historia y Períodos
+    ('Colonial', 'colonial'),
+    ('Revolucionario', 'revolucionario'),
+    ('Independencia', 'independencia'),
+    ('Republicano', 'republicano'),
+    ('siglo-XIX', 'siglo-xix'),
+    ('siglo-XX', 'siglo-xx'),
+    # Arquitectura y Estilo
+    ('Arquitectura', 'arquitectura'),
+    ('Neoclásico', 'neoclasico'),
+    ('Barroco', 'barroco'),
+    ('Jesuítico', 'jesuitico'),
+    ('Moderno', 'moderno'),
+    ('Monumental', 'monumental'),
+    # Tipo de Sitio y Función
+    ('Museo', 'museo'),
+    ('Templo', 'templo'),
+    ('Patrimonio-UNESCO', 'patrimonio-unesco'),
+    ('Ruinas', 'ruinas'),
+    ('Fortificación', 'fortificacion'),
+    ('Residencia-oficial', 'residencia-oficial'),
+    # Geografía y Región
+    ('CABA', 'caba'),
+    ('Patagonia', 'patagonia'),
+    ('Noroeste', 'noroeste'),
+    ('Mesopotamia', 'mesopotamia'),
+    ('Cuyo', 'cuyo'),
+    ('Pampa', 'pampa'),
+    # Temas Específicos
+    ('Arte-rupestre', 'arte-rupestre'),
+    ('Inmigración', 'inmigracion'),
+    ('Faro-urbano', 'faro-urbano'),
+    ('Militar', 'militar'),
+    ('Ferroviario', 'ferroviario'),
+    ('Educativo', 'educativo'),
+]
 
-    # Role-Permissions para Editores
-    rp_editor_permissions = [
-        Role_permission(role_id=r_editor.id, permission_id=s_index.id),
-        Role_permission(role_id=r_editor.id, permission_id=s_update.id),
-        Role_permission(role_id=r_editor.id, permission_id=s_show.id),
-        Role_permission(role_id=r_editor.id, permission_id=t_index.id),           
-        Role_permission(role_id=r_editor.id, permission_id=t_new.id),
-        Role_permission(role_id=r_editor.id, permission_id=t_update.id),
-        Role_permission(role_id=r_editor.id, permission_id=t_destroy.id),  
-        Role_permission(role_id=r_editor.id, permission_id=t_show.id), 
+USERS = [
+    {'email': 'admin@example.com', 'first_name': 'Admin', 'last_name': 'Uno', 'password': 'adminpass', 'active': True, 'sysAdmin': True, 'role': 'Administrador'},
+    {'email': 'user@example.com', 'first_name': 'Usuario', 'last_name': 'Dos', 'password': 'userpass', 'active': True, 'sysAdmin': False, 'role': 'Usuario'},
+    {'email': 'editor@example.com', 'first_name': 'Invitado', 'last_name': 'Tres', 'password': 'userpass', 'active': False, 'sysAdmin': False, 'role': 'Editor'},
+    {'email': 'moderador@example.com', 'first_name': 'Moderador', 'last_name': 'Cuatro', 'password': 'moderadorpass', 'active': True, 'sysAdmin': False, 'role': 'Moderador'},
 
-         # ------Reseñas------
-        Role_permission(role_id=r_editor.id, permission_id=r_index.id),
-        Role_permission(role_id=r_editor.id, permission_id=r_approve.id),
-        Role_permission(role_id=r_editor.id, permission_id=r_reject.id),
-        Role_permission(role_id=r_editor.id, permission_id=r_destroy.id),
-    ]
+    # Usuarios de prueba adicionales
+    # Administradores adicionales (2)
+    {'email': 'maria.gonzalez@admin.com', 'first_name': 'María', 'last_name': 'González', 'password': 'password123', 'active': True, 'sysAdmin': False, 'role': 'Administrador'},
+    {'email': 'carlos.rodriguez@admin.com', 'first_name': 'Carlos', 'last_name': 'Rodríguez', 'password': 'password123', 'active': True, 'sysAdmin': False, 'role': 'Administrador'},
+    
+    # Editores (5)
+    {'email': 'ana.martinez@editor.com', 'first_name': 'Ana', 'last_name': 'Martínez', 'password': 'password123', 'active': True, 'sysAdmin': False, 'role': 'Editor'},
+    {'email': 'luis.fernandez@editor.com', 'first_name': 'Luis', 'last_name': 'Fernández', 'password': 'password123', 'active': True, 'sysAdmin': False, 'role': 'Editor'},
+    {'email': 'sofia.lopez@editor.com', 'first_name': 'Sofía', 'last_name': 'López', 'password': 'password123', 'active': True, 'sysAdmin': False, 'role': 'Editor'},
+    {'email': 'diego.morales@editor.com', 'first_name': 'Diego', 'last_name': 'Morales', 'password': 'password123', 'active': False, 'sysAdmin': False, 'role': 'Editor'},
+    {'email': 'elena.vargas@editor.com', 'first_name': 'Elena', 'last_name': 'Vargas', 'password': 'password123', 'active': True, 'sysAdmin': False, 'role': 'Editor'},
+
+    # Usuarios regulares (23)
+    {'email': 'juan.perez@user.com', 'first_name': 'Juan', 'last_name': 'Pérez', 'password': 'userpass', 'active': True, 'sysAdmin': False, 'role': 'Usuario'},
+    {'email': 'laura.sanchez@user.com', 'first_name': 'Laura', 'last_name': 'Sánchez', 'password': 'userpass', 'active': True, 'sysAdmin': False, 'role': 'Usuario'},
+    {'email': 'miguel.torres@user.com', 'first_name': 'Miguel', 'last_name': 'Torres', 'password': 'userpass', 'active': True, 'sysAdmin': False, 'role': 'Usuario'},
+    {'email': 'carmen.ruiz@user.com', 'first_name': 'Carmen', 'last_name': 'Ruiz', 'password': 'userpass', 'active': False, 'sysAdmin': False, 'role': 'Usuario'},
+    {'email': 'ricardo.jimenez@user.com', 'first_name': 'Ricardo', 'last_name': 'Jiménez', 'password': 'userpass', 'active': True, 'sysAdmin': False, 'role': 'Usuario'},
+    {'email': 'patricia.moreno@user.com', 'first_name': 'Patricia', 'last_name': 'Moreno', 'password': 'userpass', 'active': True, 'sysAdmin': False, 'role': 'Usuario'},
+    {'email': 'fernando.castro@user.com', 'first_name': 'Fernando', 'last_name': 'Castro', 'password': 'userpass', 'active': True, 'sysAdmin': False, 'role': 'Usuario'},
+    {'email': 'gabriela.ortiz@user.com', 'first_name': 'Gabriela', 'last_name': 'Ortiz', 'password': 'userpass', 'active': False, 'sysAdmin': False, 'role': 'Usuario'},
+    {'email': 'antonio.ramos@user.com', 'first_name': 'Antonio', 'last_name': 'Ramos', 'password': 'userpass', 'active': True, 'sysAdmin': False, 'role': 'Usuario'},
+    {'email': 'valentina.herrera@user.com', 'first_name': 'Valentina', 'last_name': 'Herrera', 'password': 'userpass', 'active': True, 'sysAdmin': False, 'role': 'Usuario'},
+    {'email': 'andres.silva@user.com', 'first_name': 'Andrés', 'last_name': 'Silva', 'password': 'userpass', 'active': True, 'sysAdmin': False, 'role': 'Usuario'},
+    {'email': 'natalia.mendez@user.com', 'first_name': 'Natalia', 'last_name': 'Méndez', 'password': 'userpass', 'active': False, 'sysAdmin': False, 'role': 'Usuario'},
+    {'email': 'pablo.guerrero@user.com', 'first_name': 'Pablo', 'last_name': 'Guerrero', 'password': 'userpass', 'active': True, 'sysAdmin': False, 'role': 'Usuario'},
+    {'email': 'camila.flores@user.com', 'first_name': 'Camila', 'last_name': 'Flores', 'password': 'userpass', 'active': True, 'sysAdmin': False, 'role': 'Usuario'},
+    {'email': 'sergio.medina@user.com', 'first_name': 'Sergio', 'last_name': 'Medina', 'password': 'userpass', 'active': True, 'sysAdmin': False, 'role': 'Usuario'},
+    {'email': 'isabella.cruz@user.com', 'first_name': 'Isabella', 'last_name': 'Cruz', 'password': 'userpass', 'active': False, 'sysAdmin': False, 'role': 'Usuario'},
+    {'email': 'daniel.reyes@user.com', 'first_name': 'Daniel', 'last_name': 'Reyes', 'password': 'userpass', 'active': True, 'sysAdmin': False, 'role': 'Usuario'},
+    {'email': 'adriana.vega@user.com', 'first_name': 'Adriana', 'last_name': 'Vega', 'password': 'userpass', 'active': True, 'sysAdmin': False, 'role': 'Usuario'},
+    {'email': 'roberto.aguilar@user.com', 'first_name': 'Roberto', 'last_name': 'Aguilar', 'password': 'userpass', 'active': True, 'sysAdmin': False, 'role': 'Usuario'},
+    {'email': 'monica.delgado@user.com', 'first_name': 'Mónica', 'last_name': 'Delgado', 'password': 'userpass', 'active': False, 'sysAdmin': False, 'role': 'Usuario'},
+    {'email': 'joaquin.pena@user.com', 'first_name': 'Joaquín', 'last_name': 'Peña', 'password': 'userpass', 'active': True, 'sysAdmin': False, 'role': 'Usuario'},
+    {'email': 'beatriz.romero@user.com', 'first_name': 'Beatriz', 'last_name': 'Romero', 'password': 'userpass', 'active': True, 'sysAdmin': False, 'role': 'Usuario'}
+]
 
-    # Role-Permissions para Moderadores
-    rp_moderator_permissions = [
-    # ------Reseñas------
-    Role_permission(role_id=r_moderator.id, permission_id=r_index.id),
-    Role_permission(role_id=r_moderator.id, permission_id=r_approve.id),
-    Role_permission(role_id=r_moderator.id, permission_id=r_reject.id),
-    Role_permission(role_id=r_moderator.id, permission_id=r_destroy.id),
+FLAGS = [
+    {'name': 'admin_maintenance_mode', 'description': 'Panel de administración en mantenimiento', 'is_enabled': False, 'message': 'Grieta en la fachada'},
+    {'name': 'portal_maintenance_mode', 'description': 'Portal en mantenimiento', 'is_enabled': False, 'message': 'Restauración'},
+    {'name': 'reviews_enabled', 'description': 'Habilitar reseñas de usuarios', 'is_enabled': True, 'message': 'etapa 2'},
 ]
 
-    # Role-Permissions para Usuarios Públicos
-    rp_user_permissions = [
-        Role_permission(role_id=r_user.id, permission_id=s_index.id),
-    ]
+# Reseñas de prueba: (índice del sitio en _sitios, email, rating, contenido, estado)
+REVIEWS = [
+    (0, 'ricardo.jimenez@user.com', 5, 'Increíble experiencia histórica. El lugar está muy bien conservado y las explicaciones son muy claras.', 'Pendiente'),
+    (1, 'juan.perez@user.com', 4, 'Muy interesante sitio histórico. La arquitectura es impresionante y aprendí mucho sobre nuestra historia.', 'Aprobada'),
+    (2, 'beatriz.romero@user.com', 3, 'Buen lugar pero necesita mejor señalización. La información está bien pero podría ser más interactiva.', 'Aprobada'),
+    (3, 'beatriz.romero@user.com', 2, 'Buen lugar. La información está bien pero podría ser más interactiva.', 'Pendiente'),
+]
 
-    db.session.add_all(rp_admin_user_permissions + rp_editor_permissions + rp_moderator_permissions + rp_user_permissions)
-    db.session.flush()
 
-    # 4) Categories
-    c_arq = Category(name='Arquitectura')
-    c_dino = Category(name='Sitio Arqueológico')
-    c_infra = Category(name='Infraestructura')
-    db.session.add_all([c_arq, c_dino, c_infra])
-    db.session.flush()
+def seed_data():
+    print(" Cargando seeds en db")
+    rng = random.Random(SEED)
 
-    # 5) States
-    s_bueno = State(name='Bueno')
-    s_regular = State(name='Regular')
-    s_malo = State(name='Malo')
-    db.session.add_all([s_bueno, s_malo, s_regular])
-    db.session.flush()
+    # 1) a 5) y 7): roles, permisos, categorías, estados y tags
+    catalogs = seed_catalogs()
+    roles, categories, states, tags = catalogs['roles'], catalogs['categories'], catalogs['states'], catalogs['tags']
 
     # 6) Sites (dependen de category_id y state_id)
-    CATEGORIES = {'ARQ': c_arq.id, 'DINO': c_dino.id, 'INFRA': c_infra.id}
-    STATES = {'Bueno': s_bueno.id, 'Regular': s_regular.id, 'Malo': s_malo.id}
-    sites=_sitios(CATEGORIES,STATES)
-    db.session.flush()
+    sites, new_sites = _sitios(
+        {code: categories[name] for code, name in CATEGORIES.items()},
+        states,
+    )
 
-    # 7) Tags
-    tags=_tags()
-    db.session.flush()
-
-    # 8) Site-Tag associations
-    _create_site_tags_random_associations(sites,tags)
-    db.session.flush()
+    # 8) Site-Tag associations (solo para los sitios recién creados)
+    _create_site_tags_random_associations([sites[name] for name in new_sites], [tags[name] for name, _ in TAGS], rng)
 
     # 9) Users (necesitan role_id)
-    u1 = User(email='admin@example.com', first_name='Admin', last_name='Uno', password=bcrypt.hashpw('adminpass'.encode('utf-8'), bcrypt.gensalt()), active=True, sysAdmin=True, role_id=r_admin.id)
-    u2 = User(email='user@example.com', first_name='Usuario', last_name='Dos', password=bcrypt.hashpw('userpass'.encode('utf-8'), bcrypt.gensalt()), active=True, sysAdmin=False, role_id=r_user.id)
-    u3 = User(email='editor@example.com', first_name='Invitado', last_name='Tres', password=bcrypt.hashpw('userpass'.encode('utf-8'), bcrypt.gensalt()), active=False, sysAdmin=False, role_id=r_editor.id)
-    u4 = User(email='moderador@example.com', first_name='Moderador', last_name='Cuatro', password=bcrypt.hashpw('moderadorpass'.encode('utf-8'), bcrypt.gensalt()), active=True, sysAdmin=False, role_id=r_moderator.id)
-    
-    # Agregar los usuarios básicos
-    db.session.add_all([u1, u2, u3, u4])
-    
-    # Datos de usuarios de prueba adicionales
-    test_users_data = [
-        # Administradores adicionales (2)
-        {'email': 'maria.gonzalez@admin.com', 'first_name': 'María', 'last_name': 'González', 'password': 'password123', 'active': True, 'sysAdmin': False, 'role': r_admin.id},
-        {'email': 'carlos.rodriguez@admin.com', 'first_name': 'Carlos', 'last_name': 'Rodríguez', 'password': 'password123', 'active': True, 'sysAdmin': False, 'role': r_admin.id},
-        
-        # Editores (5)
-        {'email': 'ana.martinez@editor.com', 'first_name': 'Ana', 'last_name': 'Martínez', 'password': 'password123', 'active': True, 'sysAdmin': False, 'role': r_editor.id},
-        {'email': 'luis.fernandez@editor.com', 'first_name': 'Luis', 'last_name': 'Fernández', 'password': 'password123', 'active': True, 'sysAdmin': False, 'role': r_editor.id},
-        {'email': 'sofia.lopez@editor.com', 'first_name': 'Sofía', 'last_name': 'López', 'password': 'password123', 'active': True, 'sysAdmin': False, 'role': r_editor.id},
-        {'email': 'diego.morales@editor.com', 'first_name': 'Diego', 'last_name': 'Morales', 'password': 'password123', 'active': False, 'sysAdmin': False, 'role': r_editor.id},
-        {'email': 'elena.vargas@editor.com', 'first_name': 'Elena', 'last_name': 'Vargas', 'password': 'password123', 'active': True, 'sysAdmin': False, 'role': r_editor.id},
+    users = _users(roles)
 
-        # Usuarios regulares (23)
-        {'email': 'juan.perez@user.com', 'first_name': 'Juan', 'last_name': 'Pérez', 'password': 'userpass', 'active': True, 'sysAdmin': False, 'role': r_user.id},
-        {'email': 'laura.sanchez@user.com', 'first_name': 'Laura', 'last_name': 'Sánchez', 'password': 'userpass', 'active': True, 'sysAdmin': False, 'role': r_user.id},
-        {'email': 'miguel.torres@user.com', 'first_name': 'Miguel', 'last_name': 'Torres', 'password': 'userpass', 'active': True, 'sysAdmin': False, 'role': r_user.id},
-        {'email': 'carmen.ruiz@user.com', 'first_name': 'Carmen', 'last_name': 'Ruiz', 'password': 'userpass', 'active': False, 'sysAdmin': False, 'role': r_user.id},
-        {'email': 'ricardo.jimenez@user.com', 'first_name': 'Ricardo', 'last_name': 'Jiménez', 'password': 'userpass', 'active': True, 'sysAdmin': False, 'role': r_user.id},
-        {'email': 'patricia.moreno@user.com', 'first_name': 'Patricia', 'last_name': 'Moreno', 'password': 'userpass', 'active': True, 'sysAdmin': False, 'role': r_user.id},
-        {'email': 'fernando.castro@user.com', 'first_name': 'Fernando', 'last_name': 'Castro', 'password': 'userpass', 'active': True, 'sysAdmin': False, 'role': r_user.id},
-        {'email': 'gabriela.ortiz@user.com', 'first_name': 'Gabriela', 'last_name': 'Ortiz', 'password': 'userpass', 'active': False, 'sysAdmin': False, 'role': r_user.id},
-        {'email': 'antonio.ramos@user.com', 'first_name': 'Antonio', 'last_name': 'Ramos', 'password': 'userpass', 'active': True, 'sysAdmin': False, 'role': r_user.id},
-        {'email': 'valentina.herrera@user.com', 'first_name': 'Valentina', 'last_name': 'Herrera', 'password': 'userpass', 'active': True, 'sysAdmin': False, 'role': r_user.id},
-        {'email': 'andres.silva@user.com', 'first_name': 'Andrés', 'last_name': 'Silva', 'password': 'userpass', 'active': True, 'sysAdmin': False, 'role': r_user.id},
-        {'email': 'natalia.mendez@user.com', 'first_name': 'Natalia', 'last_name': 'Méndez', 'password': 'userpass', 'active': False, 'sysAdmin': False, 'role': r_user.id},
-        {'email': 'pablo.guerrero@user.com', 'first_name': 'Pablo', 'last_name': 'Guerrero', 'password': 'userpass', 'active': True, 'sysAdmin': False, 'role': r_user.id},
-        {'email': 'camila.flores@user.com', 'first_name': 'Camila', 'last_name': 'Flores', 'password': 'userpass', 'active': True, 'sysAdmin': False, 'role': r_user.id},
-        {'email': 'sergio.medina@user.com', 'first_name': 'Sergio', 'last_name': 'Medina', 'password': 'userpass', 'active': True, 'sysAdmin': False, 'role': r_user.id},
-        {'email': 'isabella.cruz@user.com', 'first_name': 'Isabella', 'last_name': 'Cruz', 'password': 'userpass', 'active': False, 'sysAdmin': False, 'role': r_user.id},
-        {'email': 'daniel.reyes@user.com', 'first_name': 'Daniel', 'last_name': 'Reyes', 'password': 'userpass', 'active': True, 'sysAdmin': False, 'role': r_user.id},
-        {'email': 'adriana.vega@user.com', 'first_name': 'Adriana', 'last_name': 'Vega', 'password': 'userpass', 'active': True, 'sysAdmin': False, 'role': r_user.id},
-        {'email': 'roberto.aguilar@user.com', 'first_name': 'Roberto', 'last_name': 'Aguilar', 'password': 'userpass', 'active': True, 'sysAdmin': False, 'role': r_user.id},
-        {'email': 'monica.delgado@user.com', 'first_name': 'Mónica', 'last_name': 'Delgado', 'password': 'userpass', 'active': False, 'sysAdmin': False, 'role': r_user.id},
-        {'email': 'joaquin.pena@user.com', 'first_name': 'Joaquín', 'last_name': 'Peña', 'password': 'userpass', 'active': True, 'sysAdmin': False, 'role': r_user.id},
-        {'email': 'beatriz.romero@user.com', 'first_name': 'Beatriz', 'last_name': 'Romero', 'password': 'userpass', 'active': True, 'sysAdmin': False, 'role': r_user.id}
-    ]
+    # 10) Audits (requieren user_id y site_id)
+    _create_site_audits(new_sites, sites, [users[user['email']] for user in USERS[:3]], rng)
 
-    # Verificar que no existan usuarios con los mismos emails antes de crearlos
-    users_created = []
-    for user_data in test_users_data:
-        existing_user = User.query.filter_by(email=user_data['email']).first()
-        if not existing_user:  # Solo crear si no existe
-            user = User(
-                email=user_data['email'],
-                first_name=user_data['first_name'],
-                last_name=user_data['last_name'],
-                password=UserService.hash_password(user_data['password']),
-                active=user_data['active'],
-                sysAdmin=user_data['sysAdmin'],
-                role_id=user_data['role']
-            )
-            users_created.append(user)
+    # 11) Flags (vinculadas a usuarios; las existentes no se pisan)
+    admin_id = users['admin@example.com']
+    upsert(Flag, [dict(flag, user_id=admin_id) for flag in FLAGS], 'name')
 
-    # Agregar solo los usuarios que no existían
-    if users_created:
-        db.session.add_all(users_created)
-        print(f"Agregados {len(users_created)} usuarios de prueba nuevos")
-    else:
-        print("Todos los usuarios de prueba ya existen")
-    
-    db.session.flush()
+    # 12) Reviews de prueba
+    _reviews(sites)
 
-    # 10) Audits (requieren user_id y site_id)
-    _create_site_audits(sites)
-    db.session.flush()
+    db.session.commit()
 
-    # 11) Flags (vinculadas a usuarios)
-    f1 = Flag(name='admin_maintenance_mode', description='Panel de administración en mantenimiento', is_enabled=False, message='Grieta en la fachada', user_id=u1.id)
-    f2 = Flag(name='portal_maintenance_mode', description='Portal en mantenimiento', is_enabled=False, message='Restauración', user_id=u1.id)
-    f3 = Flag(name='reviews_enabled', description='Habilitar reseñas de usuarios', is_enabled=True, message='etapa 2', user_id=u1.id)
-    db.session.add_all([f1, f2, f3])
-    db.session.flush()
+    # Las reseñas se insertan directo (sin ReviewService), así que se recalcula el agregado
+    RatingService.rebuild_all()
+    print('Datos seed cargados exitosamente')
 
 
-    # Obtenemos los 4 primeros sitios directamente de la BD 
-    first_four_sites = db.session.query(Site).limit(4).all()
+def seed_catalogs():
+    """
+    Roles, permisos y catálogos (categorías, estados, tags), sin sitios ni imágenes.
+    También lo usan el generador de datos sintéticos y los benchmarks.
 
-    site_for_r1 = first_four_sites[0].id if len(first_four_sites) > 0 else 1
-    site_for_r2 = first_four_sites[1].id if len(first_four_sites) > 1 else 2
-    site_for_r3 = first_four_sites[2].id if len(first_four_sites) > 2 else 3
-    site_for_r4 = first_four_sites[3].id if len(first_four_sites) > 3 else 4
+    Returns:
+        dict: {'roles', 'permissions', 'categories', 'states', 'tags'} -> {nombre: id}
+    """
+    # 1) Roles y 2) Permissions
+    roles, _ = upsert(Role, [{'name': name} for name in ROLES], 'name')
+    permissions, _ = upsert(Permission, [{'name': name} for name in PERMISSIONS], 'name')
 
-    # 12) Reviews de prueba (4 reseñas)
-    r1 = Review(site_id=site_for_r1, user_email='ricardo.jimenez@user.com', rating=5, content='Increíble experiencia histórica. El lugar está muy bien conservado y las explicaciones son muy claras.', status='Pendiente')
-    r2 = Review(site_id=site_for_r2, user_email='juan.perez@user.com', rating=4, content='Muy interesante sitio histórico. La arquitectura es impresionante y aprendí mucho sobre nuestra historia.', status='Aprobada')
-    r3 = Review(site_id=site_for_r3, user_email='beatriz.romero@user.com', rating=3, content='Buen lugar pero necesita mejor señalización. La información está bien pero podría ser más interactiva.', status='Aprobada')
-    r4 = Review(site_id=site_for_r4, user_email='beatriz.romero@user.com', rating=2, content='Buen lugar. La información está bien pero podría ser más interactiva.', status='Pendiente')
+    # 3) Role-Permissions
+    insert_missing(Role_permission, [
+        {'role_id': roles[role], 'permission_id': permissions[permission]}
+        for permission, role_names in PERMISSIONS.items()
+        for role in role_names
+    ], ('role_id', 'permission_id'))
 
-    db.session.add_all([r1, r2, r3, r4])
+    # 4) Categories y 5) States
+    categories, _ = upsert(Category, [{'name': name} for name in CATEGORIES.values()], 'name')
+    states, _ = upsert(State, [{'name': name} for name in STATES], 'name')
 
-    db.session.flush ()
-    
-    db.session.commit()
-    print('Datos seed cargados exitosamente')
+    # Tags
+    tags, _ = upsert(Tag, [{'name': name, 'slug': slug} for name, slug in TAGS], 'name')
 
-def _tags():
-    """Genera multiples tags para verificar la paginación"""
-    tags = [
-        Tag(name='Historia', slug='historia'),
-        Tag(name='Arte', slug='arte'),
-        # Historia y Períodos
-        Tag(name='Colonial', slug='colonial'),
-        Tag(name='Revolucionario', slug='revolucionario'),
-        Tag(name='Independencia', slug='independencia'),
-        Tag(name='Republicano', slug='republicano'),
-        Tag(name='siglo-XIX', slug='siglo-xix'),
-        Tag(name='siglo-XX', slug='siglo-xx'),
-        
-        # Arquitectura y Estilo
-        Tag(name='Arquitectura', slug='arquitectura'),
-        Tag(name='Neoclásico', slug='neoclasico'),
-        Tag(name='Barroco', slug='barroco'),
-        Tag(name='Jesuítico', slug='jesuitico'),
-        Tag(name='Moderno', slug='moderno'),
-        Tag(name='Monumental', slug='monumental'),
-        
-        # Tipo de Sitio y Función
-        Tag(name='Museo', slug='museo'),
-        Tag(name='Templo', slug='templo'),
-        Tag(name='Patrimonio-UNESCO', slug='patrimonio-unesco'),
-        Tag(name='Ruinas', slug='ruinas'),
-        Tag(name='Fortificación', slug='fortificacion'),
-        Tag(name='Residencia-oficial', slug='residencia-oficial'),
-        
-        # Geografía y Región
-        Tag(name='CABA', slug='caba'),
-        Tag(name='Patagonia', slug='patagonia'),
-        Tag(name='Noroeste', slug='noroeste'),
-        Tag(name='Mesopotamia', slug='mesopotamia'),
-        Tag(name='Cuyo', slug='cuyo'),
-        Tag(name='Pampa', slug='pampa'),
+    return {'roles': roles, 'permissions': permissions, 'categories': categories, 'states': states, 'tags': tags}
 
-        # Temas Específicos
-        Tag(name='Arte-rupestre', slug='arte-rupestre'),
-        Tag(name='Inmigración', slug='inmigracion'),
-        Tag(name='Faro-urbano', slug='faro-urbano'),
-        Tag(name='Militar', slug='militar'),
-        Tag(name='Ferroviario', slug='ferroviario'),
-        Tag(name='Educativo', slug='educativo')
+
+def _users(roles):
+    """Crea los usuarios que no existen (sin volver a hashear contraseñas de los existentes)."""
+    emails = [user['email'] for user in USERS]
+    existing = {email for (email,) in db.session.query(User.email).filter(User.email.in_(emails))}
+    new_rows = [
+        {
+            'email': user['email'],
+            'first_name': user['first_name'],
+            'last_name': user['last_name'],
+            'password': UserService.hash_password(user['password']),
+            'active': user['active'],
+            'sysAdmin': user['sysAdmin'],
+            'role_id': roles[user['role']],
+        }
+        for user in USERS if user['email'] not in existing
+    ]
+    if new_rows:
+        upsert(User, new_rows, 'email')
+        print(f"Agregados {len(new_rows)} usuarios de prueba nuevos")
+    else:
+        print("Todos los usuarios de prueba ya existen")
+    return dict(db.session.query(User.email, User.id).filter(User.email.in_(emails)).all())
+
+
+def _reviews(sites):
+    """Agrega las reseñas de prueba que todavía no existen (mismo sitio, email y contenido)."""
+    names = list(sites)
+    rows = [
+        {'site_id': sites[names[index]], 'user_email': email, 'rating': rating, 'content': content, 'status': status}
+        for index, email, rating, content, status in REVIEWS
     ]
-    db.session.add_all(tags)
-    return tags
+    existing = set(
+        db.session.query(Review.site_id, Review.user_email, Review.content)
+        .filter(Review.site_id.in_([row['site_id'] for row in rows]))
+        .all()
+    )
+    missing = [row for row in rows if (row['site_id'], row['user_email'], row['content']) not in existing]
+    if missing:
+        db.session.execute(insert(Review.__table__), missing)
 
-def _create_site_tags_random_associations(sites, tags):
+
+def _create_site_tags_random_associations(site_ids, tag_ids, rng):
     """
-    Genera asociaciones en la tabla Site_tag asignando entre 2 y 4 tags aleatorias 
-    (y únicas) a cada sitio.
-    
-    :param sites: Lista de objetos Site (ya con IDs de DB).
-    :param tags: Lista de objetos Tag (ya con IDs de DB).
-    :return: Lista de objetos Site_tag creados.
+    Genera asociaciones en la tabla Site_tag asignando entre 2 y 4 tags aleatorias
+    (y únicas) a cada sitio. Con la misma semilla siempre se eligen las mismas.
+
+    :param site_ids: ids de los sitios.
+    :param tag_ids: ids de las tags.
+    :param rng: random.Random con semilla.
     """
-    import random
     print("-> Generando asociaciones Site_Tag de forma aleatoria...")
-    
+
     associations = []
-    
-    # 1. Iterar sobre cada sitio
-    for site in sites:
-        
-        # Determinar cuántas tags asignar (entre 2 y 4)
-        num_tags_to_assign = random.randint(2, 4)
-        
-        # Seleccionar las tags aleatoriamente sin repetición
-        # Usamos random.sample para asegurar que las tags sean únicas para este sitio
-        selected_tags = random.sample(tags, num_tags_to_assign)
-        
-        # 2. Crear los objetos HistoricSiteTag para las tags seleccionadas
-        for tag in selected_tags:
-            associations.append(HistoricSiteTag(
-                site_id=site.id,
-                tag_id=tag.id
-            ))
+    for site_id in site_ids:
+        # Entre 2 y 4 tags distintas para cada sitio
+        for tag_id in rng.sample(tag_ids, rng.randint(2, 4)):
+            associations.append({'site_id': site_id, 'tag_id': tag_id})
+
+    insert_missing(HistoricSiteTag, associations, ('site_id', 'tag_id'))
 
-    # 3. Persistir todas las asociaciones
-    db.session.add_all(associations)
 
 def _sitios(CATEGORIES, STATES):
+    """
+    Crea los sitios que no existen y sube las imágenes solo de los recién creados.
+
+    Returns:
+        tuple: ({site_name: id} en el orden de definición, lista de nombres creados ahora)
+    """
+    sites_data = _sites_data(CATEGORIES, STATES)
+    ids, inserted = upsert(Site, [site_data['site_info'] for site_data in sites_data], 'site_name')
+    sites = {site_data['site_info']['site_name']: ids[site_data['site_info']['site_name']] for site_data in sites_data}
+    new_sites = [name for name in sites if name in inserted]
+
+    # Imagen por defecto (se sobrescribe el mismo objeto en cada corrida)
+    SiteService.new_images_transactional('static/img/sites/default.png', "/public/default_image.png")
+
+    for site_data in sites_data:
+        name = site_data['site_info']['site_name']
+        if name in inserted and site_data.get('images'):
+            SiteService.process_new_images_transactional(sites[name], site_data['images'])
+
+    return sites, new_sites
+
+
+def _sites_data(CATEGORIES, STATES):
     """Genera múltiples sitios para poder paginarlos y filtrarlos con diferentes estados"""
     STATE_BUENO = STATES['Bueno']
     STATE_REGULAR = STATES['Regular']
     STATE_MALO = STATES['Malo']
 
-    # Imagen por defecto
-    SiteService.new_images_transactional('static/img/sites/default.png', "/public/default_image.png")
-
     # Definición de los sitios (31)
     sites_data = [
         # 1. CABA
@@ -1009,47 +970,27 @@ def _sitios(CATEGORIES, STATES):
         }
     ]
 
-    # Creación de sitios e imágenes
-    created_sites = []
-    
-    for site_data in sites_data:
-        # Creación del sitio
-        site = Site(**site_data['site_info'])
-        db.session.add(site)
-        db.session.flush()
-        
-        # Imágenes del sitio
-        if site_data.get('images'):
-            SiteService.process_new_images_transactional(site.id, site_data['images'])
-        
-        created_sites.append(site)
-    
-    return created_sites
+    return sites_data
 
-def _create_site_audits(sites):
+
+def _create_site_audits(site_names, sites, user_ids, rng):
     """
-    Crea un registro de auditoría 'CREATED' para cada sitio.
-    Asume que la tabla 'Site' ya fue poblada y los IDs son válidos.
+    Crea un registro de auditoría 'CREATED' para cada sitio recién creado.
     """
-    import random
     print("-> Creando Auditoría de Creación de Sitios...")
-    
-    audit_logs = []
-    
+
     # Tipo
     CREATED_ACTION_ID = 'CREATED'
-    
-    # Recorremos la lista de sitios creados para generar la auditoría
-    for index, site in enumerate(sites):
-        # Asignar user_id aleatorio entre 1 y 3
-        user_id = random.randint(1, 3) 
 
-        audit_logs.append(Audit(
-            user_id=user_id,
-            site_id=site.id, 
-            action_type=CREATED_ACTION_ID, 
-            description=f"Se creó un nuevo sitio: {site.site_name}",
+    audit_logs = [
+        {
+            'user_id': rng.choice(user_ids),
+            'site_id': sites[name],
+            'action_type': CREATED_ACTION_ID,
+            'description': f"Se creó un nuevo sitio: {name}",
             # Los detalles están vacíos para una creación simple
-        ))
-
-    db.session.add_all(audit_logs)
\ No newline at end of file
+        }
+        for name in site_names
+    ]
+    if audit_logs:
+        db.session.execute(insert(Audit.__table__), audit_logs)
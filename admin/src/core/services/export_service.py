@@ -0,0 +1,109 @@
+from core.database import db
+from core.models.ExportJob import ExportJob
+from sqlalchemy import func, update
+from datetime import timedelta
+from typing import Optional
+import uuid
+
+# Vigencia de las URLs firmadas de descarga
+DOWNLOAD_URL_EXPIRES = timedelta(hours=1)
+# Carpeta del bucket donde se guardan los archivos exportados
+EXPORTS_PREFIX = "exports"
+# Un trabajo que no terminó en este tiempo se da por perdido (ver fail_stale_jobs)
+DEFAULT_STALE_AFTER = timedelta(hours=2)
+STALE_ERROR = "La exportación se interrumpió (el proceso que la generaba se detuvo)"
+
+
+class ExportService:
+    """
+    Servicio para las exportaciones de sitios en segundo plano (ExportJob).
+    Crear el trabajo solo inserta una fila: el archivo lo genera el pool de
+    exportación (web.export_worker) fuera del request.
+    """
+
+    def create_job(user_id: Optional[int], fmt: str, filters: dict, order_by: str, sorted_by: str) -> ExportJob:
+        """Registra un trabajo pendiente (con commit, para que el worker lo vea)."""
+        job = ExportJob(
+            id=str(uuid.uuid4()),
+            user_id=user_id,
+            format=fmt,
+            status=ExportJob.STATUS_PENDING,
+            filters=filters or {},
+            order_by=order_by or 'site_name',
+            sorted_by=sorted_by or 'asc',
+            rows_done=0,
+        )
+        db.session.add(job)
+        db.session.commit()
+        return job
+
+    def get_job(job_id: str, user_id: Optional[int] = None) -> Optional[ExportJob]:
+        """Devuelve el trabajo (solo si pertenece al usuario, cuando se indica)."""
+        job = db.session.get(ExportJob, job_id)
+        if job is None or (user_id is not None and job.user_id != user_id):
+            return None
+        return job
+
+    def update_job(job_id: str, **values):
+        """
+        Actualiza estado/progreso en una transacción propia, independiente de la
+        sesión que está leyendo las filas (un commit ahí cerraría el cursor del servidor).
+        """
+        with db.engine.begin() as conn:
+            conn.execute(update(ExportJob.__table__).where(ExportJob.__table__.c.id == job_id).values(**values))
+
+    def mark_running(job_id: str, rows_total: int):
+        ExportService.update_job(
+            job_id, status=ExportJob.STATUS_RUNNING, rows_total=rows_total, rows_done=0, started_at=func.now()
+        )
+
+    def mark_done(job_id: str, object_name: str, file_size: int, rows_done: int):
+        ExportService.update_job(
+            job_id, status=ExportJob.STATUS_DONE, object_name=object_name, file_size=file_size,
+            rows_done=rows_done, finished_at=func.now()
+        )
+
+    def mark_failed(job_id: str, error: str):
+        ExportService.update_job(
+            job_id, status=ExportJob.STATUS_FAILED, error=error[:500], finished_at=func.now()
+        )
+
+    def fail_stale_jobs(stale_after: timedelta = DEFAULT_STALE_AFTER) -> int:
+        """
+        Marca como fallidos los trabajos pendientes o en curso que llevan más de
+        `stale_after` desde que arrancaron (o desde que se crearon, si nunca arrancaron).
+
+        La cola del pool de exportación vive en memoria del proceso: si el proceso
+        se reinicia, sus trabajos quedarían pendientes o en curso para siempre.
+
+        Returns:
+            int: cantidad de trabajos marcados como fallidos
+        """
+        table = ExportJob.__table__
+        since = func.coalesce(table.c.started_at, table.c.created_at)
+        with db.engine.begin() as conn:
+            result = conn.execute(
+                update(table)
+                .where(
+                    table.c.status.in_([ExportJob.STATUS_PENDING, ExportJob.STATUS_RUNNING]),
+                    since < func.now() - stale_after,
+                )
+                .values(status=ExportJob.STATUS_FAILED, error=STALE_ERROR, finished_at=func.now())
+            )
+        return result.rowcount
+
+    def object_name_for(job: ExportJob, extension: str) -> str:
+        return f"{EXPORTS_PREFIX}/{job.id}.{extension}"
+
+    def download_url(job: ExportJob, filename: str) -> Optional[str]:
+        """URL firmada para descargar el archivo (None si el trabajo no terminó bien)."""
+        from flask import current_app
+
+        if job.status != ExportJob.STATUS_DONE or not job.object_name:
+            return None
+        return current_app.storage.presigned_get_object(
+            bucket_name=current_app.config["MINIO_BUCKET"],
+            object_name=job.object_name,
+            expires=DOWNLOAD_URL_EXPIRES,
+            response_headers={"response-content-disposition": f"attachment; filename={filename}"},
+        )
@@ -1,8 +1,106 @@
 from core.database import db
+from sqlalchemy import func
 from sqlalchemy.exc import IntegrityError
-from typing import List, Optional
+from typing import Dict, List, Optional
 from core.models.Flag import Flag
+from dataclasses import dataclass
 from datetime import datetime, timezone
+import threading
+import time
+
+# Segundos que el snapshot de flags se usa sin consultar la base
+FLAG_CACHE_TTL = 10
+
+
+@dataclass(frozen=True)
+class FlagSnapshot:
+    """Copia de solo lectura de una Flag (segura para compartir entre requests/hilos)."""
+    id: int
+    name: str
+    description: str
+    is_enabled: bool
+    message: Optional[str]
+    last_edit: Optional[datetime]
+
+    @property
+    def is_maintenance(self) -> bool:
+        return bool(self.name) and 'maintenance_mode' in self.name.lower()
+
+    @property
+    def has_message(self) -> bool:
+        return bool(self.message and self.message.strip())
+
+
+class _FlagCache:
+    """
+    Snapshot en memoria de todas las flags.
+    - Dentro del TTL no se consulta la base (hit).
+    - Al vencer el TTL se compara la versión (cantidad de flags y último last_edit):
+      si no cambió se renueva el TTL sin recargar; si cambió se recarga todo.
+    - Las escrituras de FlagService invalidan el snapshot del proceso al instante.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._flags: Dict[str, FlagSnapshot] = {}
+        self._fingerprint = None
+        self._expires_at = 0.0
+        self.version = 0
+        self.hits = 0
+        self.misses = 0
+        self.reloads = 0
+        self.version_checks = 0
+
+    def invalidate(self):
+        with self._lock:
+            self._expires_at = 0.0
+            self._fingerprint = None
+            self.version += 1
+
+    def get(self, name: str) -> Optional[FlagSnapshot]:
+        with self._lock:
+            if time.monotonic() < self._expires_at:
+                self.hits += 1
+                return self._flags.get(name)
+            self.misses += 1
+
+        fingerprint = tuple(db.session.query(func.count(Flag.id), func.max(Flag.last_edit)).one())
+        with self._lock:
+            self.version_checks += 1
+            if fingerprint != self._fingerprint:
+                self._flags = {
+                    flag.name: FlagSnapshot(
+                        id=flag.id,
+                        name=flag.name,
+                        description=flag.description,
+                        is_enabled=bool(flag.is_enabled),
+                        message=flag.message,
+                        last_edit=flag.last_edit
+                    )
+                    for flag in Flag.query.all()
+                }
+                self._fingerprint = fingerprint
+                self.reloads += 1
+            self._expires_at = time.monotonic() + FLAG_CACHE_TTL
+            return self._flags.get(name)
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0,
+                'version_checks': self.version_checks,
+                'reloads': self.reloads,
+                'version': self.version,
+                'ttl_seconds': FLAG_CACHE_TTL,
+                'cached_flags': len(self._flags)
+            }
+
+
+_flag_cache = _FlagCache()
+
 
 class FlagService:
     """
@@ -25,9 +123,24 @@ class FlagService:
         """Busca una flag por su nombre único."""
         return Flag.query.filter(Flag.name == name).first()
     
+    def get_cached_flag(name: str) -> Optional[FlagSnapshot]:
+        """
+        Devuelve una copia de la flag desde el cache en memoria.
+        Pensado para hooks y chequeos por request: no consulta la base dentro del TTL.
+        """
+        return _flag_cache.get(name)
+
+    def invalidate_cache():
+        """Descarta el snapshot de flags del proceso (se recarga en la próxima lectura)."""
+        _flag_cache.invalidate()
+
+    def cache_stats() -> dict:
+        """Métricas del cache de flags (hits, misses, tasa de acierto, recargas)."""
+        return _flag_cache.stats()
+
     def is_flag_enabled(name: str) -> bool:
         """Comprueba si una flag está habilitada (is_enabled=True)."""
-        flag = FlagService.get_flag_by_name(name)
+        flag = FlagService.get_cached_flag(name)
         # Retorna True si existe y su valor es True, sino False
         return flag is not None and flag.is_enabled
 
@@ -46,6 +159,7 @@ class FlagService:
         feature_flag.last_edit = datetime.now(timezone.utc)
         
         db.session.commit()
+        FlagService.invalidate_cache()
         return feature_flag
 
     def set_maintenance_message(flag_id: int, message: str) -> Optional[Flag]:
@@ -74,6 +188,7 @@ class FlagService:
         try:
             db.session.add(new_flag)
             db.session.commit()
+            FlagService.invalidate_cache()
             return new_flag
         except IntegrityError:
             db.session.rollback()
@@ -103,10 +218,12 @@ class FlagService:
         # El user_id siempre se actualiza para saber quién hizo el último cambio
         flag.user_id = user_id
         
-        # SQLAlchemy manejará la actualización de last_edit gracias a onupdate=func.now()
+        # last_edit también es la versión que usan los caches de otros procesos
+        flag.last_edit = datetime.now(timezone.utc)
         
         try:
             db.session.commit()
+            FlagService.invalidate_cache()
             return flag
         except Exception as e:
             db.session.rollback()
@@ -123,6 +240,7 @@ class FlagService:
             db.session.delete(flag)
             try:
                 db.session.commit()
+                FlagService.invalidate_cache()
                 return True
             except Exception as e:
                 db.session.rollback()
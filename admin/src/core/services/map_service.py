@@ -0,0 +1,113 @@
+from core.database import db
+from core.models.Site import Site
+from sqlalchemy import case, func, text
+
+# Radio (en px de pantalla) dentro del cual los sitios se agrupan en un cluster
+CLUSTER_RADIUS_PX = 60
+# Tamaño de tile en px (convención de los mapas web)
+TILE_SIZE_PX = 256
+# A partir de este zoom se devuelven los puntos sin agrupar
+MAX_CLUSTER_ZOOM = 17
+MAX_ZOOM = 22
+# Ancho del mundo en metros (EPSG:3857)
+WORLD_WIDTH_M = 40075016.68557849
+# Resolución interna de las vector tiles
+MVT_EXTENT = 4096
+
+TILE_SQL = text("""
+WITH bounds AS (
+    SELECT ST_TileEnvelope(:z, :x, :y) AS geom
+),
+points AS (
+    SELECT s.id, s.site_name, ST_Transform(s.location, 3857) AS geom
+    FROM sites s, bounds
+    WHERE s.active = true
+      AND s.deleted = false
+      AND s.location && ST_Transform(bounds.geom, 4326)
+),
+clusters AS (
+    SELECT count(*) AS count,
+           ST_Centroid(ST_Collect(geom)) AS geom,
+           CASE WHEN count(*) = 1 THEN min(id) END AS id,
+           CASE WHEN count(*) = 1 THEN min(site_name) END AS name
+    FROM points
+    GROUP BY ST_SnapToGrid(geom, :cell)
+)
+SELECT ST_AsMVT(tile, 'sites', :extent, 'geom')
+FROM (
+    SELECT clusters.id, clusters.name, clusters.count,
+           ST_AsMVTGeom(clusters.geom, bounds.geom, :extent, 64, true) AS geom
+    FROM clusters, bounds
+) AS tile
+""")
+
+
+class MapService:
+    """
+    Puntos para dibujar el mapa del portal agrupados del lado del servidor.
+    Un viewport cuesta una sola respuesta chica (conteo + coordenadas por cluster)
+    en lugar de paginar el listado completo de sitios.
+    """
+
+    def cell_size_meters(zoom: int) -> float:
+        """
+        Lado de la grilla de agrupamiento en metros de EPSG:3857 (Web Mercator) para un
+        nivel de zoom: CLUSTER_RADIUS_PX píxeles de pantalla. La usan clusters() y tile().
+        """
+        return WORLD_WIDTH_M / 2 ** zoom * CLUSTER_RADIUS_PX / TILE_SIZE_PX
+
+    def clusters(min_lng: float, min_lat: float, max_lng: float, max_lat: float, zoom: int) -> list:
+        """
+        Agrupa los sitios activos dentro del bbox con ST_SnapToGrid sobre EPSG:3857,
+        la misma grilla que tile(): a igual zoom ambos endpoints forman los mismos clusters.
+
+        Returns:
+            list: [{'lat', 'lng', 'count', 'id', 'name'}]; id y name solo para puntos aislados
+        """
+        zoom = max(0, min(int(zoom), MAX_ZOOM))
+        envelope = func.ST_MakeEnvelope(min_lng, min_lat, max_lng, max_lat, 4326)
+        mercator = func.ST_Transform(Site.location, 3857)
+        count = func.count(Site.id)
+        centroid = func.ST_Transform(func.ST_Centroid(func.ST_Collect(mercator)), 4326)
+
+        query = db.session.query(
+            count.label('count'),
+            func.ST_Y(centroid).label('lat'),
+            func.ST_X(centroid).label('lng'),
+            case((count == 1, func.min(Site.id))).label('id'),
+            case((count == 1, func.min(Site.site_name))).label('name'),
+        ).filter(
+            Site.active.is_(True),
+            Site.deleted.is_(False),
+            Site.location.intersects(envelope),
+        )
+        if zoom < MAX_CLUSTER_ZOOM:
+            query = query.group_by(func.ST_SnapToGrid(mercator, MapService.cell_size_meters(zoom)))
+        else:
+            query = query.group_by(Site.id)
+
+        return [
+            {
+                'lat': row.lat,
+                'lng': row.lng,
+                'count': row.count,
+                'id': row.id,
+                'name': row.name,
+            }
+            for row in query.all()
+        ]
+
+    def tile(z: int, x: int, y: int) -> bytes:
+        """
+        Vector tile (Mapbox Vector Tile, capa 'sites') con los sitios del tile z/x/y
+        agrupados con la misma grilla en EPSG:3857 que clusters(). Una celda que cruza
+        el borde del tile se reparte entre los tiles vecinos. Requiere PostGIS 3 (ST_TileEnvelope).
+        """
+        cell = MapService.cell_size_meters(z)
+        if z >= MAX_CLUSTER_ZOOM:
+            # Grilla menor a un punto de la tile: en la práctica no agrupa
+            cell = WORLD_WIDTH_M / 2 ** z / MVT_EXTENT
+        data = db.session.execute(
+            TILE_SQL, {'z': z, 'x': x, 'y': y, 'cell': cell, 'extent': MVT_EXTENT}
+        ).scalar()
+        return bytes(data) if data else b''
@@ -0,0 +1,111 @@
+from core.database import db
+from core.models.Review import Review
+from core.models.SiteRating import SiteRating
+from sqlalchemy import func, case, cast, Float
+from sqlalchemy.dialects.postgresql import insert
+from typing import Optional
+
+APPROVED_STATUS = 'Aprobada'
+
+
+class RatingService:
+    """
+    Servicio para mantener el agregado de calificaciones por sitio (SiteRating).
+    Las operaciones NO hacen commit: se ejecutan dentro de la transacción de quien
+    modifica la reseña, así el agregado y la reseña se confirman (o revierten) juntos.
+    """
+
+    def get_rating(site_id: int) -> Optional[SiteRating]:
+        """Devuelve el agregado de un sitio (None si no tiene reseñas aprobadas)."""
+        return db.session.get(SiteRating, site_id)
+
+    def apply_delta(site_id: int, rating: int, delta: int):
+        """
+        Suma (delta=1) o resta (delta=-1) una reseña aprobada al agregado del sitio
+        con un único UPSERT atómico, sin leer el resto de las reseñas.
+        """
+        if not delta or rating not in range(1, 6):
+            return
+
+        star_column = f"stars_{rating}"
+        table = SiteRating.__table__
+        new_count = table.c.reviews_count + delta
+        new_sum = table.c.rating_sum + delta * rating
+
+        stmt = insert(table).values(
+            site_id=site_id,
+            reviews_count=max(delta, 0),
+            rating_sum=max(delta, 0) * rating,
+            rating_average=float(rating) if delta > 0 else 0.0,
+            **{star_column: max(delta, 0)}
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[table.c.site_id],
+            set_={
+                'reviews_count': new_count,
+                'rating_sum': new_sum,
+                'rating_average': case(
+                    (new_count > 0, cast(new_sum, Float) / new_count),
+                    else_=0.0
+                ),
+                star_column: table.c[star_column] + delta,
+                'updated_at': func.now()
+            }
+        )
+        db.session.execute(stmt)
+
+    def track_review_change(review: Review, old_status: Optional[str], old_rating: Optional[int] = None):
+        """
+        Actualiza el agregado según el cambio de una reseña.
+        Solo las reseñas aprobadas cuentan: se resta el estado anterior y se suma el nuevo.
+
+        Args:
+            review: reseña ya modificada (o a eliminar, con status actual)
+            old_status: estado previo (None si la reseña es nueva)
+            old_rating: calificación previa (por defecto la actual)
+        """
+        old_rating = review.rating if old_rating is None else old_rating
+        was_approved = old_status == APPROVED_STATUS
+        is_approved = review.status == APPROVED_STATUS
+
+        if was_approved == is_approved and old_rating == review.rating:
+            return
+        if was_approved:
+            RatingService.apply_delta(review.site_id, old_rating, -1)
+        if is_approved:
+            RatingService.apply_delta(review.site_id, review.rating, 1)
+
+    def track_review_deleted(review: Review):
+        """Resta la reseña del agregado si estaba aprobada."""
+        if review.status == APPROVED_STATUS:
+            RatingService.apply_delta(review.site_id, review.rating, -1)
+
+    def rebuild_all() -> int:
+        """
+        Recalcula todos los agregados desde la tabla de reseñas (INSERT ... SELECT).
+        Útil después de cargas masivas o si se sospecha de inconsistencias.
+
+        Returns:
+            int: cantidad de sitios con agregado
+        """
+        approved = db.session.query(
+            Review.site_id,
+            func.count(Review.id),
+            func.sum(Review.rating),
+            cast(func.avg(Review.rating), Float),
+            *[func.count(Review.id).filter(Review.rating == star) for star in range(1, 6)]
+        ).filter(
+            Review.status == APPROVED_STATUS
+        ).group_by(Review.site_id)
+
+        table = SiteRating.__table__
+        db.session.execute(table.delete())
+        db.session.execute(
+            table.insert().from_select(
+                ['site_id', 'reviews_count', 'rating_sum', 'rating_average',
+                 'stars_1', 'stars_2', 'stars_3', 'stars_4', 'stars_5'],
+                approved.statement
+            )
+        )
+        db.session.commit()
+        return db.session.query(func.count(SiteRating.site_id)).scalar()
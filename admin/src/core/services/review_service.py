@@ -3,6 +3,7 @@ from core.models.Review import Review
 from core.models.ReviewAudit import ReviewAudit
 from core.models.User import User
 from core.models.Site import Site
+from core.services.rating_service import RatingService
 from sqlalchemy.orm import joinedload
 from typing import List, Optional
 from datetime import datetime, timedelta, timezone
@@ -72,7 +73,8 @@ class ReviewService:
         # Usuario (email - Búsqueda parcial)
         user_email = filters.get('user_email')
         if user_email:
-            query = query.filter(func.lower(Review.user_email).like(f'%{user_email.lower()}%'))
+            # ILIKE directo sobre la columna (sin lower()) para usar el índice de trigramas
+            query = query.filter(Review.user_email.ilike(f'%{user_email}%'))
         # 3. Aplicar Ordenamiento
         order_column = None
         if order_by == 'created_at':
@@ -86,12 +88,9 @@ class ReviewService:
             direction = asc if sorted_by == 'asc' else desc
             query = query.order_by(direction(order_column))
             
-        # Paginación
-        pagination = query.paginate(
-            page=page,
-            per_page=per_page,
-            error_out=False
-        )
+        # Paginación (el total se reutiliza entre páginas con los mismos filtros)
+        from core.utils.pagination import paginate_query
+        pagination = paginate_query(query, page, per_page, order_by, sorted_by, count_mode='cached')
         
         # 4. Preparar filtros para el template (deben ser strings)
         display_filters = {}
@@ -103,15 +102,15 @@ class ReviewService:
                     display_filters[k] = str(v)
         
         return {
-            'reviews': pagination.items,
-            'total': pagination.total,
-            'pages': pagination.pages,
-            'current_page': page,
-            'has_prev': pagination.has_prev,
-            'has_next': pagination.has_next,
-            'prev_num': pagination.prev_num,
-            'next_num': pagination.next_num,
-            'page_range': list(range(max(1, page-2), min(pagination.pages+1, page+3))),
+            'reviews': pagination['items'],
+            'total': pagination['total'],
+            'pages': pagination['pages'],
+            'current_page': pagination['current_page'],
+            'has_prev': pagination['has_prev'],
+            'has_next': pagination['has_next'],
+            'prev_num': pagination['prev_num'],
+            'next_num': pagination['next_num'],
+            'page_range': list(range(max(1, page-2), min(pagination['pages']+1, page+3))),
             # Parámetros de ordenamiento
             'order_by': order_by, 
             'sorted_by': sorted_by, 
@@ -138,9 +137,13 @@ class ReviewService:
                 return False
 
             # Cambiar estado de la reseña
+            old_status = review.status
             review.status = 'Aprobada'
             review.updated_at = datetime.now(timezone.utc)
 
+            # Actualizar el agregado de calificaciones en la misma transacción
+            RatingService.track_review_change(review, old_status)
+
             # Crear auditoría
             audit = ReviewAudit(
                 review_id=review_id,
@@ -181,10 +184,14 @@ class ReviewService:
                 return False
 
             # Cambiar estado de la reseña
+            old_status = review.status
             review.status = 'Rechazada'
             review.updated_at = datetime.now(timezone.utc)
             review.rejection_reason = rejection_reason
 
+            # Si estaba aprobada, deja de contar en el agregado
+            RatingService.track_review_change(review, old_status)
+
             # Crear auditoría
             audit = ReviewAudit(
                 review_id=review_id,
@@ -223,6 +230,9 @@ class ReviewService:
             # Eliminar primero las auditorías asociadas
             from core.models.ReviewAudit import ReviewAudit
             db.session.query(ReviewAudit).filter_by(review_id=review_id).delete()
+
+            # Descontar la reseña del agregado (si estaba aprobada)
+            RatingService.track_review_deleted(review)
             
             # Eliminar la reseña
             db.session.delete(review)
@@ -286,6 +296,8 @@ class ReviewService:
             )
             
             db.session.add(review)
+            # Nace 'Pendiente', por lo que el agregado solo cambia si se crea aprobada
+            RatingService.track_review_change(review, None)
             db.session.commit()
             
             print(f"Reseña creada exitosamente: ID={review.id}, Site={site_id}, User={user.email}")
@@ -361,6 +373,36 @@ class ReviewService:
         # Paginar
         return paginate_query(query, page, per_page, order, sort_by)
 
+    @staticmethod
+    def reviews_to_dict(reviews: List[Review]) -> List[dict]:
+        """
+        Serializa un lote de reseñas con la misma forma que Review.to_dict,
+        serializando los sitios asociados en bloque (sin consultas por reseña).
+        """
+        from core.services.sites_service import SiteService
+
+        # Por ID para no disparar la carga lazy de review.site en cada reseña
+        site_ids = list(dict.fromkeys(review.site_id for review in reviews))
+        site_dicts = {
+            site_dict['id']: site_dict
+            for site_dict in SiteService.sites_to_dict(site_ids, cover_variant='thumb')
+        }
+
+        return [
+            {
+                "id": review.id,
+                "site_id": review.site_id,
+                "user_email": review.user_email,
+                "rating": review.rating,
+                "content": review.content,
+                "status": review.status,
+                "rejection_reason": review.rejection_reason,
+                "created_at": review.created_at.isoformat() if review.created_at else None,
+                "site": site_dicts.get(review.site_id)
+            }
+            for review in reviews
+        ]
+
     @staticmethod
     def get_approved_reviews_by_site(
         site_id: int
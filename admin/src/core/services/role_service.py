@@ -2,6 +2,71 @@ from core.models.Role_permission import Role_permission
 from core.models.Role import Role
 from core.models.Permission import Permission
 from core.database import db
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from typing import Dict, FrozenSet
+import threading
+
+
+class _RolePermissionCache:
+    """
+    Cache por proceso de rol -> frozenset(nombres de permisos).
+    Se carga completo con una sola consulta y se descarta cuando se confirma
+    (commit) un cambio sobre roles, permisos o role_permissions.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._permissions: Dict[str, FrozenSet[str]] = None
+
+    def invalidate(self):
+        with self._lock:
+            self._permissions = None
+
+    def get(self, role_name: str) -> FrozenSet[str]:
+        permissions = self._permissions
+        if permissions is None:
+            permissions = self._load()
+        return permissions.get(role_name, frozenset())
+
+    def _load(self) -> Dict[str, FrozenSet[str]]:
+        rows = db.session.query(Role.name, Permission.name)\
+            .outerjoin(Role_permission, Role_permission.role_id == Role.id)\
+            .outerjoin(Permission, Permission.id == Role_permission.permission_id)\
+            .all()
+        grouped = {}
+        for role_name, permission_name in rows:
+            names = grouped.setdefault(role_name, set())
+            if permission_name:
+                names.add(permission_name)
+        permissions = {role_name: frozenset(names) for role_name, names in grouped.items()}
+        with self._lock:
+            self._permissions = permissions
+        return permissions
+
+
+_role_cache = _RolePermissionCache()
+_WATCHED_MODELS = (Role, Permission, Role_permission)
+
+
+@event.listens_for(Session, "after_flush")
+def _mark_role_changes(session, flush_context):
+    """Marca la sesión si el flush tocó roles/permisos (se invalida recién en el commit)."""
+    changed = list(session.new) + list(session.dirty) + list(session.deleted)
+    if any(isinstance(obj, _WATCHED_MODELS) for obj in changed):
+        session.info["role_permissions_changed"] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_role_cache(session):
+    if session.info.pop("role_permissions_changed", False):
+        _role_cache.invalidate()
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_role_changes(session):
+    session.info.pop("role_permissions_changed", None)
+
 
 class RoleService:
 
@@ -14,4 +79,14 @@ class RoleService:
         )
     
     def getRole(roleName: str):
-        return Role.query.filter(Role.name == roleName).first();
\ No newline at end of file
+        return Role.query.filter(Role.name == roleName).first();
+
+    def getPermissionNames(roleName: str) -> FrozenSet[str]:
+        """Nombres de los permisos del rol, desde el cache (sin consultas en estado estable)."""
+        if not roleName:
+            return frozenset()
+        return _role_cache.get(roleName)
+
+    def invalidatePermissionsCache():
+        """Descarta el cache de permisos (ej: después de un UPDATE/DELETE masivo)."""
+        _role_cache.invalidate()
@@ -1,18 +1,53 @@
-from core.utils.pagination import paginate_query
+from core.utils.pagination import paginate_query, keyset_paginate
 from core.models.Site import Site
 from core.models.SiteImage import SiteImage
 from core.models.Audit import Audit
 from core.models.Review import Review
+from core.models.SiteRating import SiteRating
 from core.models.UserFavorite import UserFavorite
+from core.models.Category import Category
+from core.models.State import State
+from core.models.Tag import Tag
+from core.models.Site_Tag import HistoricSiteTag
 from core.database import db
-from core.utils.search import build_search_query,apply_ordering
+from core.utils.search import build_search_query,apply_ordering,text_search_rank,distance_expression
+from core.utils.presigned_urls import presigned_urls
+from core.utils import image_variants
+from sqlalchemy import func, select, literal_column
+from sqlalchemy.dialects.postgresql import aggregate_order_by
 import logging
 import os
 import mimetypes
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from sqlalchemy import event
+from sqlalchemy.orm import Session
 from werkzeug.datastructures import FileStorage
 
 logger = logging.getLogger(__name__)
 
+# Subidas de imágenes concurrentes por lote
+UPLOAD_WORKERS = 4
+# Tamaño de parte para subidas multipart (los archivos más grandes se suben por partes)
+UPLOAD_PART_SIZE = 10 * 1024 * 1024
+# Filas leídas por lote del cursor del servidor al exportar
+EXPORT_CHUNK_SIZE = 1000
+
+
+@event.listens_for(Session, "after_commit")
+def _forget_uploaded_objects(session):
+    session.info.pop("uploaded_objects", None)
+
+
+@event.listens_for(Session, "after_rollback")
+def _cleanup_uploaded_objects(session):
+    """Si la transacción que iba a registrar las imágenes se revierte, se borran de MinIO."""
+    pending = session.info.pop("uploaded_objects", None)
+    for client, bucket_name, object_name in pending or []:
+        try:
+            client.remove_object(bucket_name, object_name)
+        except Exception as e:
+            logger.error(f"No se pudo eliminar el objeto huérfano {object_name}: {e}")
+
 class SiteService:
     def get_sites_filtered(
         filters=None,
@@ -24,6 +59,10 @@ class SiteService:
         lat: float = None,  
         lng: float = None,  
         radius: float = None,  
+        cursor: str = None,
+        with_total: bool = False,
+        count_mode: str = "exact",
+        as_query: bool = False,
     ):
         """
         Devuelve sitios históricos filtrados, ordenados y opcionalmente paginados.
@@ -31,7 +70,8 @@ class SiteService:
 
         Args:
             filters (dict): filtros a aplicar (ej: {"city_id": 1, "visible": True})
-            order_by (str): columna para ordenar
+            order_by (str): columna para ordenar ('relevance' requiere el filtro 'full_text';
+                'distance' ordena de más cerca a más lejos y requiere lat/lng)
             sorted_by (str): 'asc' o 'desc'
             paginate (bool): si True devuelve dict con paginación, si False lista completa
             page (int): número de página (si paginate=True)
@@ -39,9 +79,14 @@ class SiteService:
             lat (float): latitud para ordenamiento por distancia (opcional)
             lng(float): longitud para ordenamiento por distancia (opcional)
             radius(float): radio en km para filtrar por distancia (opcional)
+            cursor (str): si no es None se pagina por cursor (keyset) en lugar de por página;
+                '' pide la primera página y luego se envía el next_cursor recibido
+            with_total (bool): en modo cursor, si además se cuenta el total
+            count_mode (str): estrategia para el total: 'exact', 'cached' o 'estimated'
+            as_query (bool): si True devuelve la query ordenada sin ejecutar (ignora paginate)
 
         Returns:
-            dict de paginación o lista de objetos HistoricSite
+            dict de paginación, lista de objetos HistoricSite o Query (as_query=True)
         """
         filters = filters or {}
         # Siempre filtrar los sitios no eliminados
@@ -53,6 +98,11 @@ class SiteService:
         # --- Filtrado por tags (muchos a muchos) ---
         tags = filters.pop('tags', None)
 
+        # Texto de búsqueda de texto completo (se usa también para ordenar por relevancia)
+        full_text = filters.get('full_text')
+        if order_by == 'relevance' and not full_text:
+            order_by = 'site_name'
+
         # Construir query base
         query = build_search_query(Site, filters,lat=lat,lng=lng,radius=radius)
 
@@ -76,56 +126,130 @@ class SiteService:
             elif isinstance(tags, str) and tags.isdigit():
                 tag_ids = [int(tags)]
             """
-            Si tag_ids tiene valores, se hace un JOIN con la tabla de asociación y
-            se filtran los sitios que tengan esos tags. Luego, se agrupa por sitio y se usa
-            HAVING para asegurarse que el conteo de tags coincida con la cantidad de tags
-            solicitados (es decir, que el sitio tenga todos los tags).
+            Si tag_ids tiene valores, una subconsulta sobre la tabla de asociación agrupa
+            por sitio y usa HAVING para quedarse con los sitios cuyo conteo de tags coincide
+            con la cantidad de tags solicitados (es decir, que tengan todos los tags).
+            La query principal no se agrupa, así se puede ordenar y paginar por columnas
+            de otras tablas (ej: rating) y el COUNT de la paginación es más barato.
             """
             if tag_ids:
-                from core.models.Site_Tag import HistoricSiteTag
-                from sqlalchemy import func
-                query = query.join(Site.tag_associations)
-                query = query.filter(HistoricSiteTag.tag_id.in_(tag_ids))
-                query = query.group_by(Site.id)
-                query = query.having(func.count(HistoricSiteTag.tag_id) == len(tag_ids))
-
-        # Ordenamiento por Rating
-        if order_by == 'rating' or order_by == 'rating_avg':
-            from sqlalchemy import func
-            # Subconsulta para el promedio de rating
-            avg_rating_subquery = db.session.query(
-                Review.site_id,
-                func.avg(Review.rating).label('avg_rating')
-            ).filter(
-                Review.status == 'Aprobada'
-            ).group_by(
-                Review.site_id
-            ).subquery()
-            
-            # LEFT JOIN para incluir sitios sin reviews
-            query = query.outerjoin(
-                avg_rating_subquery,
-                Site.id == avg_rating_subquery.c.site_id
+                sites_with_tags = db.session.query(HistoricSiteTag.site_id)\
+                    .filter(HistoricSiteTag.tag_id.in_(tag_ids))\
+                    .group_by(HistoricSiteTag.site_id)\
+                    .having(func.count(func.distinct(HistoricSiteTag.tag_id)) == len(set(tag_ids)))
+                query = query.filter(Site.id.in_(sites_with_tags))
+
+        # Orden por cercanía: requiere un punto de referencia
+        if order_by == 'distance' and (lat is None or lng is None):
+            order_by = 'site_name'
+
+        # Paginación por cursor (keyset): orden fijo por (clave, id)
+        if cursor is not None:
+            query, sort_column = SiteService._sort_expression(query, order_by, full_text, lat=lat, lng=lng)
+            return keyset_paginate(
+                query, sort_column, Site.id, cursor=cursor, per_page=per_page,
+                sort_name=order_by, sorted_by=sorted_by, with_total=with_total,
+                count_mode=count_mode
             )
-            
-            # COALESCE para tratar NULL como 0
-            order_column = func.coalesce(avg_rating_subquery.c.avg_rating, 0)
+
+        # Ordenamiento por Rating (agregado materializado, sin agrupar reseñas), relevancia, cercanía (KNN)
+        # o vistas (misma expresión que el índice parcial ix_sites_live_views)
+        if order_by in ('rating', 'rating_avg', 'relevance', 'distance', 'views'):
+            query, order_column = SiteService._sort_expression(query, order_by, full_text, lat=lat, lng=lng)
             
             if sorted_by.lower() == 'desc':
-                query = query.order_by(order_column.desc())
+                query = query.order_by(order_column.desc(), Site.id)
             else:
-                query = query.order_by(order_column.asc())
+                query = query.order_by(order_column.asc(), Site.id)
         else:
             # Ordenamiento normal para otras columnas
             query = apply_ordering(query, Site, order_by, sorted_by)
 
+        if as_query:
+            return query
         if paginate:
             return paginate_query(
-                query, page=page, per_page=per_page, order_by=order_by, sorted_by=sorted_by
+                query, page=page, per_page=per_page, order_by=order_by, sorted_by=sorted_by,
+                count_mode=count_mode
             )
         else:
             return query.all()
 
+    def distances_for(site_ids, lat: float, lng: float) -> dict:
+        """
+        Distancia en metros desde (lat, lng) para un lote de sitios, en una sola consulta.
+
+        Returns:
+            dict: {site_id: distancia en metros (None si el sitio no tiene ubicación)}
+        """
+        if not site_ids:
+            return {}
+        rows = db.session.query(Site.id, distance_expression(Site, lat, lng))\
+            .filter(Site.id.in_(site_ids))\
+            .all()
+        return {site_id: round(distance, 1) if distance is not None else None for site_id, distance in rows}
+
+    def get_sites_export_rows(filters=None, order_by: str = "site_name", sorted_by: str = "asc",
+                              chunk_size: int = EXPORT_CHUNK_SIZE):
+        """
+        Devuelve las filas a exportar (mismos filtros y orden que el listado) como una
+        query de tuplas planas que se lee por lotes con un cursor del lado del servidor.
+
+        Tags, estado y coordenadas se resuelven en SQL (string_agg, ST_Y/ST_X), así no
+        se cargan objetos Site ni relaciones por fila y la memoria no crece con el total.
+
+        Returns:
+            Query: iterable de filas (id, site_name, short_desc, city, province,
+            state_name, registration, latitude, longitude, tags)
+        """
+        query = SiteService.get_sites_filtered(
+            filters=filters, order_by=order_by, sorted_by=sorted_by, as_query=True
+        )
+        state_name = select(State.name)\
+            .where(State.id == Site.state_id)\
+            .scalar_subquery()
+        tags = select(
+                func.string_agg(Tag.name, aggregate_order_by(literal_column("', '"), HistoricSiteTag.id))
+            )\
+            .select_from(HistoricSiteTag)\
+            .join(Tag, Tag.id == HistoricSiteTag.tag_id)\
+            .where(HistoricSiteTag.site_id == Site.id)\
+            .scalar_subquery()
+
+        return query.with_entities(
+            Site.id,
+            Site.site_name,
+            Site.short_desc,
+            Site.city,
+            Site.province,
+            state_name.label('state_name'),
+            Site.registration,
+            Site.latitude.label('latitude'),
+            Site.longitude.label('longitude'),
+            tags.label('tags'),
+        ).execution_options(yield_per=chunk_size)
+
+    def _sort_expression(query, order_by: str, search_text: str = None, lat: float = None, lng: float = None):
+        """
+        Devuelve (query, expresión de orden) para los ordenamientos soportados.
+        Las expresiones nunca son NULL, requisito de la paginación por cursor.
+        """
+        if order_by == 'relevance' and search_text:
+            return query, text_search_rank(Site, search_text)
+        if order_by == 'distance' and lat is not None and lng is not None:
+            # Los sitios sin ubicación no tienen distancia: quedan fuera del listado
+            query = query.filter(Site.location.isnot(None))
+            return query, distance_expression(Site, lat, lng)
+        if order_by in ('rating', 'rating_avg'):
+            # LEFT JOIN al agregado materializado para incluir sitios sin reviews
+            query = query.outerjoin(SiteRating, SiteRating.site_id == Site.id)
+            return query, func.coalesce(SiteRating.rating_average, 0)
+        if order_by == 'views':
+            return query, func.coalesce(Site.views, 0)
+        if order_by in ('registration', 'created_at'):
+            return query, Site.registration
+        return query, Site.site_name
+
     def _register_audit_log(site_id: int, user_id: int, action_type: str, description: str, details: str = None):
             """Función interna para crear un registro de auditoría."""
             try:
@@ -147,7 +271,114 @@ class SiteService:
     def get_site_by_id(id: int):
         """Devuelve una Site en base al id"""
         return db.session.get(Site, id)
-    
+
+    def sites_to_dict(sites, cover_variant: str = 'card') -> list:
+        """
+        Serializa un lote de sitios con la misma forma que Site.to_dict, pero
+        resolviendo imágenes, tags, categoría, estado y reseñas con una cantidad
+        fija de consultas (una por relación) en lugar de varias por sitio.
+
+        Args:
+            sites (list): Lista de objetos Site o de IDs de sitios.
+            cover_variant (str): derivado usado para la portada ('thumb', 'card' o 'full').
+                Los listados usan 'card'; el detalle del sitio, 'full'.
+
+        Returns:
+            list: Lista de diccionarios en el mismo orden recibido.
+        """
+        if not sites:
+            return []
+
+        # Si vienen IDs, cargar los sitios en una sola consulta respetando el orden
+        if not isinstance(sites[0], Site):
+            ids = [int(site_id) for site_id in sites]
+            found = {site.id: site for site in Site.query.filter(Site.id.in_(ids)).all()}
+            sites = [found[site_id] for site_id in ids if site_id in found]
+            if not sites:
+                return []
+
+        site_ids = [site.id for site in sites]
+
+        # 1. Imágenes (de acá sale también la portada)
+        images_by_site = {site_id: [] for site_id in site_ids}
+        covers = {}
+        images = db.session.query(SiteImage)\
+            .filter(SiteImage.site_id.in_(site_ids))\
+            .order_by(SiteImage.site_id, SiteImage.id)\
+            .all()
+        for image in images:
+            images_by_site[image.site_id].append(image.to_dict())
+            if image.is_cover and image.site_id not in covers:
+                covers[image.site_id] = image.variant_url(cover_variant)
+
+        # 2. Tags (máximo 5 por sitio, limitado en SQL con una ventana)
+        ranked_tags = db.session.query(
+            HistoricSiteTag.site_id.label('site_id'),
+            Tag.id.label('tag_id'),
+            Tag.name.label('tag_name'),
+            func.row_number().over(
+                partition_by=HistoricSiteTag.site_id,
+                order_by=HistoricSiteTag.id
+            ).label('tag_rank')
+        ).join(Tag, Tag.id == HistoricSiteTag.tag_id)\
+         .filter(HistoricSiteTag.site_id.in_(site_ids))\
+         .subquery()
+        tags_by_site = {site_id: [] for site_id in site_ids}
+        tag_rows = db.session.query(ranked_tags)\
+            .filter(ranked_tags.c.tag_rank <= 5)\
+            .order_by(ranked_tags.c.site_id, ranked_tags.c.tag_rank)\
+            .all()
+        for row in tag_rows:
+            tags_by_site[row.site_id].append({'id': row.tag_id, 'name': row.tag_name})
+
+        # 3. Categorías y estados
+        category_ids = {site.category_id for site in sites if site.category_id}
+        state_ids = {site.state_id for site in sites if site.state_id}
+        categories = dict(
+            db.session.query(Category.id, Category.name).filter(Category.id.in_(category_ids)).all()
+        ) if category_ids else {}
+        states = dict(
+            db.session.query(State.id, State.name).filter(State.id.in_(state_ids)).all()
+        ) if state_ids else {}
+
+        # 4. Cantidad, promedio e histograma de reseñas aprobadas (agregado materializado)
+        ratings = {
+            rating.site_id: rating
+            for rating in db.session.query(SiteRating).filter(SiteRating.site_id.in_(site_ids)).all()
+        }
+
+        # La URL por defecto se firma una sola vez para todo el lote
+        default_cover_url = None
+        if any(site_id not in covers for site_id in site_ids):
+            default_cover_url = SiteService.build_image_url('/public/default_image.png')
+
+        result = []
+        for site in sites:
+            rating = ratings.get(site.id)
+            result.append({
+                'id': site.id,
+                'name': site.site_name,
+                'active': site.active,
+                'cover_image_url': covers.get(site.id) or default_cover_url,
+                'short_desc': site.short_desc,
+                'full_desc': site.full_desc,
+                'city': site.city,
+                'province': site.province,
+                'opening_year': site.operning_year,
+                'registration': site.registration.isoformat() if site.registration else None,
+                'latitude': site.latitude,
+                'longitude': site.longitude,
+                'category_name': categories.get(site.category_id),
+                'state_name': states.get(site.state_id),
+                'views': site.views,
+                'tags': tags_by_site[site.id],
+                'images': images_by_site[site.id],
+                'reviews_count': rating.reviews_count if rating else 0,
+                'reviews_average': round(rating.rating_average, 1) if rating and rating.reviews_count else 0.0,
+                'reviews_histogram': rating.histogram if rating else {star: 0 for star in range(1, 6)}
+            })
+        return result
+
 
     def get_audit_filtered(
         historical_site_id: int,  
@@ -352,12 +583,17 @@ class SiteService:
         )
         
         return file_storage
-    def new_images_transactional(file,minio_path):
+    def new_images_transactional(file, minio_path, client=None, bucket_name=None):
         """
-        Wrapper para manejar la transacción al procesar nuevas imágenes.
+        Sube un archivo a MinIO.
+        Puede llamarse desde hilos del pool de subida pasando client y bucket_name
+        (fuera del contexto de la app). Los archivos grandes se suben en partes
+        leyendo del stream, sin cargarlos completos en memoria.
         """
-        from flask import current_app
-        client = current_app.storage
+        if client is None or bucket_name is None:
+            from flask import current_app
+            client = client or current_app.storage
+            bucket_name = bucket_name or current_app.config["MINIO_BUCKET"]
 
         if isinstance(file,str):
             file=SiteService.create_filestorage_from_path(file)
@@ -370,16 +606,22 @@ class SiteService:
         # Guardar en una subcarpeta con el site_id en MinIO
         
         #no hace falta guardar res, esta para deputar errores
-        res= client.put_object(bucket_name = current_app.config["MINIO_BUCKET"],
+        res= client.put_object(bucket_name = bucket_name,
                             object_name=minio_path,
                             data=file,
                             length=file_size,
-                            content_type=file.content_type)
+                            content_type=file.content_type,
+                            part_size=UPLOAD_PART_SIZE)
         return minio_path
         
     def process_new_images_transactional(site_id, image_data):
         """
         Procesa un lote de nuevas imágenes: las valida, sube a MinIO y crea registros en BD.
+
+        Las subidas se hacen en paralelo (pool de UPLOAD_WORKERS hilos) y recién después
+        se agregan todos los SiteImage con un único flush. Si falla alguna subida o el
+        paso de base de datos (incluido un rollback posterior de la transacción), los
+        objetos ya subidos se eliminan de MinIO.
         
         Args:
             site_id (int): ID del sitio al que pertenecen las imágenes.
@@ -394,46 +636,145 @@ class SiteService:
         if not image_data:
             return 0
 
-        images_processed = 0
+        client = current_app.storage
+        bucket_name = current_app.config["MINIO_BUCKET"]
 
         # Pre-cálculos una sola vez
         next_order = SiteService.get_next_image_order(site_id)
         is_first_image_for_site = (SiteService.get_cover_image(site_id) is None)
-        for idx, img_info in enumerate(image_data):
-            if images_processed >= 10:
-                break  # Limitar a 10 imágenes por lote
+
+        # 1. Preparar el lote (limitado a 10 imágenes)
+        uploads = []
+        for idx, img_info in enumerate(image_data[:10]):
             file = img_info["file"]
             if isinstance(file,str):
                 file=SiteService.create_filestorage_from_path(file)
-            titulo_alt = img_info["title_alt"]
-            descripcion = img_info["description"]
             extension = file.filename.rsplit('.', 1)[1].lower()
-            file_uuid = str(uuid.uuid4())
-            minio_path = f"{site_id}/{file_uuid}.{extension}"
-            try:
-                SiteService.new_images_transactional(file, minio_path)
-            except Exception as e:
-                logger.error(f"Error al subir imagen para sitio ID={site_id}: {e}", exc_info=True)
-                raise e
-            
-            public_url = SiteService.public_url(current_app.config,minio_path)
-                
-            # La primera imagen subida será la portada por defecto
-            is_cover = (idx == 0 and is_first_image_for_site)
-
-            new_image = SiteImage(
+            minio_path = f"{site_id}/{uuid.uuid4()}.{extension}"
+            uploads.append((idx, img_info, file, minio_path))
+
+        # 2. Subir en paralelo (original + derivados thumb/card/full)
+        variants_by_path = {}
+        errors = []
+        with ThreadPoolExecutor(max_workers=min(UPLOAD_WORKERS, len(uploads))) as executor:
+            futures = {
+                executor.submit(SiteService._upload_image_with_variants, file, minio_path, client, bucket_name): minio_path
+                for _, _, file, minio_path in uploads
+            }
+            for future in as_completed(futures):
+                try:
+                    variants_by_path[futures[future]] = future.result()
+                except Exception as e:
+                    errors.append(e)
+
+        uploaded = [
+            path
+            for minio_path, variants in variants_by_path.items()
+            for path in (minio_path, *variants.values())
+        ]
+        if errors:
+            logger.error(f"Error al subir imágenes para sitio ID={site_id}: {errors[0]}", exc_info=errors[0])
+            SiteService._remove_uploaded_objects(client, bucket_name, uploaded)
+            raise errors[0]
+
+        # Si la transacción termina en rollback, los objetos subidos se eliminan
+        SiteService._track_uploaded_objects(client, bucket_name, uploaded)
+
+        # 3. Crear todos los registros con un único flush
+        new_images = [
+            SiteImage(
                 site_id=site_id,
-                public_url=public_url,
+                public_url=SiteService.public_url(current_app.config, minio_path),
                 file_path=minio_path,
-                title_alt=titulo_alt,
-                description=descripcion,
+                title_alt=img_info["title_alt"],
+                description=img_info["description"],
                 order_index=(idx + next_order), # El orden inicial es secuencial
-                is_cover=is_cover
+                # La primera imagen subida será la portada por defecto
+                is_cover=(idx == 0 and is_first_image_for_site),
+                thumb_path=variants_by_path[minio_path].get('thumb'),
+                card_path=variants_by_path[minio_path].get('card'),
+                full_path=variants_by_path[minio_path].get('full')
             )
-            db.session.add(new_image)
-            db.session.flush()
-            images_processed += 1
-        return images_processed
+            for idx, img_info, _, minio_path in uploads
+        ]
+        db.session.add_all(new_images)
+        db.session.flush()
+        return len(new_images)
+
+    def _upload_image_with_variants(file, minio_path, client, bucket_name):
+        """
+        Sube el original y sus derivados (ver core.utils.image_variants).
+        Si fallan los derivados, se elimina también el original ya subido.
+
+        Returns:
+            dict: {variante: ruta en MinIO} (vacío si no se pudieron generar)
+        """
+        SiteService.new_images_transactional(file, minio_path, client, bucket_name)
+        try:
+            return image_variants.upload_variants(client, bucket_name, minio_path, file)
+        except Exception:
+            SiteService._remove_uploaded_objects(client, bucket_name, [minio_path])
+            raise
+
+    def backfill_image_variants(batch_size: int = 50) -> int:
+        """
+        Genera los derivados de las imágenes subidas antes de que existieran
+        (thumb_path vacío). Descarga cada original de MinIO, sube sus derivados y
+        confirma cada lote por separado, así una interrupción no pierde lo hecho.
+
+        Returns:
+            int: cantidad de imágenes actualizadas
+        """
+        from flask import current_app
+        import io
+
+        client = current_app.storage
+        bucket_name = current_app.config["MINIO_BUCKET"]
+        updated = 0
+        last_id = 0
+        while True:
+            batch = db.session.query(SiteImage)\
+                .filter(SiteImage.thumb_path.is_(None), SiteImage.id > last_id)\
+                .order_by(SiteImage.id)\
+                .limit(batch_size)\
+                .all()
+            if not batch:
+                break
+            for image in batch:
+                last_id = image.id
+                response = None
+                try:
+                    response = client.get_object(bucket_name, image.file_path)
+                    original = io.BytesIO(response.read())
+                    variants = image_variants.upload_variants(client, bucket_name, image.file_path, original)
+                except Exception as e:
+                    logger.error(f"No se pudieron generar derivados de la imagen ID={image.id}: {e}")
+                    continue
+                finally:
+                    if response is not None:
+                        response.close()
+                        response.release_conn()
+                if not variants:
+                    continue
+                image.thumb_path = variants.get('thumb')
+                image.card_path = variants.get('card')
+                image.full_path = variants.get('full')
+                updated += 1
+            db.session.commit()
+        return updated
+
+    def _remove_uploaded_objects(client, bucket_name, object_names):
+        """Elimina objetos de MinIO; los errores se registran sin interrumpir el resto."""
+        for object_name in object_names:
+            try:
+                client.remove_object(bucket_name, object_name)
+            except Exception as e:
+                logger.error(f"No se pudo eliminar el objeto huérfano {object_name}: {e}")
+
+    def _track_uploaded_objects(client, bucket_name, object_names):
+        """Registra en la sesión los objetos subidos, para limpiarlos si hay rollback."""
+        pending = db.session.info.setdefault("uploaded_objects", [])
+        pending.extend((client, bucket_name, object_name) for object_name in object_names)
     
     def public_url(config,imagen):
         """Genera la URL de la imagen publica."""
@@ -456,11 +797,14 @@ class SiteService:
             raise ValueError("No se puede eliminar la imagen de portada. Por favor, marque otra imagen como portada primero.")
             
         image_title = image_to_delete.title_alt
-        image_filepath = image_to_delete.file_path
+        image_paths = [image_to_delete.file_path, *image_to_delete.variant_paths()]
 
         try:
-            # 1. Eliminar de MinIO
-            current_app.storage.delete_file(image_filepath) # Asumo que tienes una forma de acceder al storage
+            # 1. Eliminar de MinIO (original y derivados)
+            bucket_name = current_app.config["MINIO_BUCKET"]
+            SiteService._remove_uploaded_objects(current_app.storage, bucket_name, image_paths)
+            for path in image_paths:
+                presigned_urls.invalidate(bucket_name, path)
 
             # 2. Eliminar de la Base de Datos
             db.session.delete(image_to_delete)
@@ -493,8 +837,9 @@ class SiteService:
         Returns:
             SiteImage | None: La imagen solicitada o None si no se encuentra.
         """
-        client = current_app.storage
-        return client.presigned_get_object(
+        # La firma se reutiliza hasta poco antes de vencer (cache LRU compartido)
+        return presigned_urls.get_url(
+            current_app.storage,
             bucket_name=current_app.config["MINIO_BUCKET"],
             object_name=image_path,
         )
@@ -5,6 +5,7 @@ import bcrypt
 import os
 from core.models.User import User
 from core.models.Role import Role
+from core.utils import image_variants
 from werkzeug.datastructures import FileStorage
 
 class UserService:
@@ -236,6 +237,13 @@ class UserService:
                             data=file,
                             length=file_size,
                             content_type=file.content_type)
+
+        # Miniatura para mostrar en el portal (el original queda en `avatar`)
+        variants = image_variants.upload_variants(
+            client, current_app.config["MINIO_BUCKET"], minio_path, file, image_variants.AVATAR_VARIANTS
+        )
+        if "thumb" in variants:
+            user.avatar_thumb = UserService.build_image_url(variants["thumb"])
         return minio_path
     
     def build_image_url(image_path: str):
@@ -0,0 +1,97 @@
+"""
+Escrituras masivas para seeds y cargas de datos.
+
+- upsert: INSERT ... ON CONFLICT sobre una clave única, en una sola sentencia
+  por lote; devuelve los ids de todas las filas (nuevas y existentes).
+- insert_missing: INSERT ... ON CONFLICT DO NOTHING para tablas de asociación.
+- copy_rows: COPY FROM STDIN (psycopg2) para volúmenes grandes.
+"""
+import csv
+import io
+
+from sqlalchemy import literal_column
+from sqlalchemy.dialects.postgresql import insert
+
+from core.database import db
+
+# Filas por sentencia INSERT (límite práctico de parámetros por sentencia)
+UPSERT_BATCH_SIZE = 1000
+
+
+def upsert(model, rows: list, key: str, update: tuple = ()):
+    """
+    Inserta las filas que no existen (según la columna única `key`) y, si se indican
+    columnas en `update`, actualiza esas columnas en las que ya existían.
+
+    Args:
+        model: modelo de SQLAlchemy
+        rows (list): diccionarios columna -> valor
+        key (str): columna con restricción única
+        update (tuple): columnas a sobrescribir en las filas existentes
+
+    Returns:
+        tuple: ({valor de key: id} de todas las filas, set de keys insertadas ahora)
+    """
+    table = model.__table__
+    ids, inserted = {}, set()
+    for start in range(0, len(rows), UPSERT_BATCH_SIZE):
+        stmt = insert(table).values(rows[start:start + UPSERT_BATCH_SIZE])
+        # Sin columnas para actualizar, se "actualiza" la clave con su mismo valor:
+        # así RETURNING también devuelve las filas que ya existían
+        set_ = {column: stmt.excluded[column] for column in (update or (key,))}
+        stmt = stmt.on_conflict_do_update(index_elements=[table.c[key]], set_=set_).returning(
+            table.c[key], table.c.id, literal_column("xmax = 0").label("inserted")
+        )
+        for row in db.session.execute(stmt):
+            ids[row[0]] = row[1]
+            if row.inserted:
+                inserted.add(row[0])
+    return ids, inserted
+
+
+def insert_missing(model, rows: list, keys: tuple) -> int:
+    """
+    Inserta solo las filas cuya combinación de `keys` (índice único) todavía no existe.
+
+    Returns:
+        int: filas insertadas
+    """
+    table = model.__table__
+    count = 0
+    for start in range(0, len(rows), UPSERT_BATCH_SIZE):
+        stmt = insert(table).values(rows[start:start + UPSERT_BATCH_SIZE]).on_conflict_do_nothing(
+            index_elements=[table.c[key] for key in keys]
+        )
+        count += db.session.execute(stmt).rowcount
+    return count
+
+
+def copy_rows(table_name: str, columns: tuple, rows) -> int:
+    """
+    Carga filas con COPY FROM STDIN en la conexión de la sesión actual (misma transacción).
+
+    Args:
+        table_name (str): tabla destino (puede ser una tabla temporal)
+        columns (tuple): columnas en el orden de cada fila
+        rows: iterable de tuplas; None se carga como NULL
+
+    Returns:
+        int: filas copiadas
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    count = 0
+    for row in rows:
+        writer.writerow(["\\N" if value is None else value for value in row])
+        count += 1
+    buffer.seek(0)
+
+    cursor = db.session.connection().connection.cursor()
+    try:
+        cursor.copy_expert(
+            f"COPY {table_name} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv, NULL '\\N')",
+            buffer,
+        )
+    finally:
+        cursor.close()
+    return count
@@ -0,0 +1,463 @@
+"""
+Cache del lado del servidor con backends intercambiables.
+
+- memory: LRU en el proceso (por defecto, sin dependencias).
+- file: directorio compartido por todos los workers del host (estilo diskcache).
+- redis: cualquier servidor que hable el protocolo de Redis (requiere el paquete `redis`).
+
+Las claves se prefijan con un namespace, cada entrada tiene TTL y puede llevar
+tags: invalidar un tag incrementa su versión y descarta todas sus entradas.
+Las versiones de los tags son contadores que los backends nunca desalojan por LRU
+(si un contador volviera a 0, las entradas guardadas con versión 0 revivirían).
+get_or_set evita estampidas: solo un proceso/hilo recalcula una clave vencida.
+"""
+import hashlib
+import heapq
+import logging
+import os
+import pickle
+import re
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+
+try:
+    import redis
+except ImportError:  # Solo necesario con CACHE_BACKEND=redis
+    redis = None
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TTL = 300
+# Tiempo máximo que un recálculo retiene el lock de single-flight
+LOCK_TIMEOUT = 30
+# Espera entre consultas mientras otro proceso recalcula la clave
+LOCK_POLL_INTERVAL = 0.05
+# Backend file: máximo de entradas en el directorio y cada cuántas escrituras se barre
+FILE_MAX_ENTRIES = 10000
+FILE_SWEEP_EVERY = 256
+# Backend file: vencimiento (mtime) que se asigna a las entradas sin TTL
+FILE_NO_TTL_SECONDS = 365 * 24 * 3600
+
+
+class MemoryBackend:
+    """LRU en memoria del proceso, con vencimiento por entrada. Los contadores van aparte (sin LRU)."""
+
+    def __init__(self, max_entries=2048):
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self._counters = {}
+
+    def _alive(self, key, now):
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry[1] is not None and entry[1] <= now:
+            del self._entries[key]
+            return None
+        return entry
+
+    def get(self, key):
+        with self._lock:
+            entry = self._alive(key, time.monotonic())
+            if entry is None:
+                return None
+            self._entries.move_to_end(key)
+            return entry[0]
+
+    def get_many(self, keys):
+        return [self.get(key) for key in keys]
+
+    def set(self, key, value, ttl=None):
+        expires = time.monotonic() + ttl if ttl else None
+        with self._lock:
+            self._entries[key] = (value, expires)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def add(self, key, value, ttl=None):
+        """Guarda solo si la clave no existe (base del lock de single-flight)."""
+        with self._lock:
+            if self._alive(key, time.monotonic()) is not None:
+                return False
+        self.set(key, value, ttl)
+        return True
+
+    def delete(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def incr(self, key):
+        with self._lock:
+            value = self._counters[key] = self._counters.get(key, 0) + 1
+            return value
+
+    def get_counters(self, keys):
+        with self._lock:
+            return [self._counters.get(key, 0) for key in keys]
+
+    def clear(self, prefix=""):
+        with self._lock:
+            for store in (self._entries, self._counters):
+                for key in [key for key in store if key.startswith(prefix)]:
+                    del store[key]
+
+
+class FileBackend:
+    """
+    Un archivo por clave en un directorio compartido entre procesos.
+    Las escrituras son atómicas (archivo temporal + rename) y los contadores
+    se incrementan con un lock de archivo. El nombre del archivo empieza con el
+    hash del namespace, así clear() borra solo las claves del namespace pedido.
+
+    Las claves vencidas que no se vuelven a leer (ej: cuerpos HTTP de un ETag viejo)
+    no se borrarían nunca: cada `sweep_every` escrituras se barre el directorio,
+    borrando las vencidas y, si quedan más de `max_entries`, las próximas a vencer.
+    El mtime de cada entrada es su vencimiento, así el barrido solo hace stat.
+    Los contadores (versiones de tags) van en archivos `.counter` que no se barren.
+    """
+
+    _ENTRY_NAME = re.compile(r"^[0-9a-f]{12}-[0-9a-f]{40}$")
+
+    def __init__(self, directory, max_entries=FILE_MAX_ENTRIES, sweep_every=FILE_SWEEP_EVERY):
+        self.directory = directory
+        self.max_entries = max_entries
+        self.sweep_every = sweep_every
+        self._writes = 0
+        self._writes_lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    @staticmethod
+    def _digest(value):
+        return hashlib.sha1(value.encode("utf-8")).hexdigest()
+
+    def _path(self, key):
+        namespace = key.partition(":")[0]
+        return os.path.join(self.directory, f"{self._digest(namespace)[:12]}-{self._digest(key)}")
+
+    def _read(self, path):
+        try:
+            with open(path, "rb") as f:
+                expires, value = pickle.load(f)
+        except (FileNotFoundError, EOFError, pickle.UnpicklingError):
+            return None
+        if expires is not None and expires <= time.time():
+            self._remove(path)
+            return None
+        return (value,)
+
+    def _write(self, path, value, ttl):
+        now = time.time()
+        expires = now + ttl if ttl else None
+        fd, tmp = tempfile.mkstemp(dir=self.directory)
+        with os.fdopen(fd, "wb") as f:
+            pickle.dump((expires, value), f, protocol=pickle.HIGHEST_PROTOCOL)
+        mtime = expires or now + FILE_NO_TTL_SECONDS
+        os.utime(tmp, (mtime, mtime))
+        os.replace(tmp, path)
+        self._count_write()
+
+    def _count_write(self):
+        with self._writes_lock:
+            self._writes += 1
+            due = self._writes % self.sweep_every == 0
+        if due:
+            self.sweep()
+
+    def sweep(self):
+        """Borra las entradas vencidas y, si sobran, las próximas a vencer. Devuelve cuántas borró."""
+        now = time.time()
+        alive, removed = [], 0
+        with os.scandir(self.directory) as entries:
+            for entry in entries:
+                if not self._ENTRY_NAME.match(entry.name):
+                    continue
+                try:
+                    expires = entry.stat().st_mtime
+                except FileNotFoundError:
+                    continue
+                if expires <= now:
+                    self._remove(entry.path)
+                    removed += 1
+                else:
+                    alive.append((expires, entry.path))
+        for _, path in heapq.nsmallest(max(len(alive) - self.max_entries, 0), alive):
+            self._remove(path)
+            removed += 1
+        return removed
+
+    def _remove(self, path):
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+    def get(self, key):
+        entry = self._read(self._path(key))
+        return entry[0] if entry else None
+
+    def get_many(self, keys):
+        return [self.get(key) for key in keys]
+
+    def set(self, key, value, ttl=None):
+        self._write(self._path(key), value, ttl)
+
+    def add(self, key, value, ttl=None):
+        path = self._path(key)
+        if self._read(path) is not None:
+            return False
+        lock_path = path + ".add"
+        try:
+            fd = os.open(lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+        except FileExistsError:
+            # Lock de creación abandonado (proceso caído): se libera pasado el timeout
+            try:
+                if time.time() - os.path.getmtime(lock_path) > LOCK_TIMEOUT:
+                    self._remove(lock_path)
+            except FileNotFoundError:
+                pass
+            return False
+        try:
+            if self._read(path) is not None:
+                return False
+            self._write(path, value, ttl)
+            return True
+        finally:
+            os.close(fd)
+            self._remove(lock_path)
+
+    def delete(self, key):
+        self._remove(self._path(key))
+
+    def incr(self, key):
+        import fcntl
+
+        path = self._path(key) + ".counter"
+        with open(path + ".lock", "a") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                entry = self._read(path)
+                value = (entry[0] if entry else 0) + 1
+                self._write(path, value, None)
+                return value
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+    def get_counters(self, keys):
+        values = []
+        for key in keys:
+            entry = self._read(self._path(key) + ".counter")
+            values.append(int(entry[0]) if entry else 0)
+        return values
+
+    def clear(self, prefix=""):
+        start = f"{self._digest(prefix.partition(':')[0])[:12]}-" if prefix else ""
+        for name in os.listdir(self.directory):
+            if name.startswith(start):
+                self._remove(os.path.join(self.directory, name))
+
+
+class RedisBackend:
+    """Servidor con protocolo Redis (Redis, Valkey, KeyDB, ...)."""
+
+    def __init__(self, url=None, client=None):
+        if client is None:
+            if redis is None:
+                raise RuntimeError("CACHE_BACKEND=redis requiere el paquete 'redis' (pip install redis)")
+            client = redis.Redis.from_url(url)
+        self._client = client
+
+    def get(self, key):
+        data = self._client.get(key)
+        return pickle.loads(data) if data is not None else None
+
+    def get_many(self, keys):
+        return [pickle.loads(data) if data is not None else None for data in self._client.mget(keys)]
+
+    def set(self, key, value, ttl=None):
+        self._client.set(key, pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL), ex=ttl or None)
+
+    def add(self, key, value, ttl=None):
+        return bool(self._client.set(key, pickle.dumps(value), nx=True, ex=ttl or None))
+
+    def delete(self, key):
+        self._client.delete(key)
+
+    def incr(self, key):
+        # INCR guarda enteros en texto (b"1"): se leen con get_counters, no con pickle
+        return self._client.incr(key)
+
+    def get_counters(self, keys):
+        return [int(data) if data is not None else 0 for data in self._client.mget(keys)]
+
+    def clear(self, prefix=""):
+        # Solo las claves del namespace: la base de Redis puede ser compartida
+        keys = list(self._client.scan_iter(match=f"{prefix}*", count=1000))
+        for start in range(0, len(keys), 1000):
+            self._client.delete(*keys[start:start + 1000])
+
+
+class Cache:
+    """
+    Fachada de cache usada por la aplicación (`current_app.cache`).
+    Se configura con CACHE_BACKEND (memory, file, redis), CACHE_NAMESPACE,
+    CACHE_DEFAULT_TTL, CACHE_DIR (file) y CACHE_URL (redis).
+    """
+
+    def __init__(self, app=None):
+        self.backend = MemoryBackend()
+        self.namespace = "ps"
+        self.default_ttl = DEFAULT_TTL
+        self._local_locks = {}
+        self._local_locks_guard = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        backend = app.config.get("CACHE_BACKEND", "memory")
+        if backend == "redis":
+            self.backend = RedisBackend(app.config["CACHE_URL"])
+        elif backend == "file":
+            self.backend = FileBackend(
+                app.config.get("CACHE_DIR") or os.path.join(tempfile.gettempdir(), "ps-cache"),
+                max_entries=app.config.get("CACHE_MAX_ENTRIES", FILE_MAX_ENTRIES),
+            )
+        else:
+            self.backend = MemoryBackend(app.config.get("CACHE_MAX_ENTRIES", 2048))
+        self.namespace = app.config.get("CACHE_NAMESPACE", self.namespace)
+        self.default_ttl = app.config.get("CACHE_DEFAULT_TTL", self.default_ttl)
+        app.cache = self
+        return app
+
+    # --- Claves ---
+    def _key(self, key):
+        return f"{self.namespace}:{key}"
+
+    def _tag_key(self, tag):
+        return f"{self.namespace}:tag:{tag}"
+
+    def _tag_versions(self, tags):
+        if not tags:
+            return {}
+        values = self.backend.get_counters([self._tag_key(tag) for tag in tags])
+        return dict(zip(tags, values))
+
+    # --- Operaciones ---
+    def get(self, key):
+        """Valor cacheado, o None si no existe, venció o alguno de sus tags fue invalidado."""
+        try:
+            entry = self.backend.get(self._key(key))
+            stale = entry is not None and entry[1] and self._tag_versions(list(entry[1])) != entry[1]
+        except Exception as e:
+            logger.warning(f"Cache no disponible ({e}): se recalcula")
+            return None
+        if entry is None or stale:
+            self.misses += 1
+            return None
+        value, _ = entry
+        self.hits += 1
+        return value
+
+    def set(self, key, value, ttl=None, tags=()):
+        tags = tuple(tags)
+        try:
+            self.backend.set(self._key(key), (value, self._tag_versions(tags)), ttl or self.default_ttl)
+        except Exception as e:
+            logger.warning(f"No se pudo guardar en cache {key}: {e}")
+
+    def delete(self, key):
+        self.backend.delete(self._key(key))
+
+    def invalidate_tags(self, tags):
+        """Descarta todas las entradas con alguno de los tags (incrementa su versión)."""
+        for tag in tags:
+            try:
+                self.backend.incr(self._tag_key(tag))
+            except Exception as e:
+                logger.warning(f"No se pudo invalidar el tag {tag}: {e}")
+
+    def get_or_set(self, key, compute, ttl=None, tags=()):
+        """
+        Devuelve el valor cacheado o lo calcula una sola vez (single-flight):
+        los demás hilos del proceso esperan al que calcula, y entre procesos
+        un lock en el backend hace que el resto espere el valor en lugar de recalcularlo.
+        Si compute devuelve None el resultado no se cachea.
+        """
+        value = self.get(key)
+        if value is not None:
+            return value
+
+        with self._local_lock(key):
+            value = self.get(key)
+            if value is not None:
+                return value
+
+            lock_key = self._key(f"lock:{key}")
+            deadline = time.monotonic() + LOCK_TIMEOUT
+            while not self._acquire(lock_key):
+                time.sleep(LOCK_POLL_INTERVAL)
+                value = self.get(key)
+                if value is not None:
+                    return value
+                if time.monotonic() >= deadline:
+                    # El proceso que tenía el lock no terminó: se calcula igual
+                    break
+            try:
+                value = compute()
+                if value is not None:
+                    self.set(key, value, ttl=ttl, tags=tags)
+                return value
+            finally:
+                self._release(lock_key)
+
+    def clear(self):
+        """Borra las entradas y versiones de tags de este namespace."""
+        self.backend.clear(f"{self.namespace}:")
+
+    def stats(self) -> dict:
+        return {
+            "backend": type(self.backend).__name__,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+    # --- Locks de single-flight ---
+    @contextmanager
+    def _local_lock(self, key):
+        # Lock por clave con contador de usuarios: se descarta cuando nadie lo usa
+        # (las claves derivan de ETags, no se pueden acumular sin límite)
+        with self._local_locks_guard:
+            entry = self._local_locks.get(key)
+            if entry is None:
+                entry = self._local_locks[key] = [threading.Lock(), 0]
+            entry[1] += 1
+        try:
+            with entry[0]:
+                yield
+        finally:
+            with self._local_locks_guard:
+                entry[1] -= 1
+                if entry[1] == 0:
+                    del self._local_locks[key]
+
+    def _acquire(self, lock_key):
+        try:
+            return self.backend.add(lock_key, 1, LOCK_TIMEOUT)
+        except Exception:
+            # Sin backend compartido no se coordina entre procesos
+            return True
+
+    def _release(self, lock_key):
+        try:
+            self.backend.delete(lock_key)
+        except Exception:
+            pass
+
+
+cache = Cache()
@@ -0,0 +1,144 @@
+"""
+Versiones de datos para invalidar caches de respuestas (ETag).
+
+Cada commit que modifica tablas publicadas por la API incrementa la versión de
+su ámbito en `data_versions`, dentro de la misma transacción. Las lecturas se
+memorizan por proceso durante VERSION_TTL segundos; el proceso que escribe ve su
+propio cambio de inmediato.
+
+Tras el commit, los mismos ámbitos se invalidan como tags en core.utils.cache,
+así las entradas compartidas entre workers se descartan sin esperar al TTL.
+
+Costo: el UPSERT toma el lock de la fila del ámbito hasta el commit, así que las
+transacciones que escriben el mismo ámbito se serializan en ese último tramo. Se
+acepta porque las escrituras del admin son pocas y cortas, y a cambio la versión
+nunca queda desfasada de los datos (un bump posterior al commit podría perderse si
+el proceso cae entre ambos). Las cargas masivas hacen un bump por lote (ver seed_generator).
+"""
+import threading
+import time
+
+from sqlalchemy import event, func
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from core.database import db
+from core.utils.cache import cache
+from core.models.DataVersion import DataVersion
+
+# Tabla modificada -> ámbito cuya versión se incrementa
+TABLE_SCOPES = {
+    'sites': 'sites',
+    'site_images': 'sites',
+    'historic_site_tag': 'sites',
+    'categories': 'sites',
+    'states': 'sites',
+    'tags': 'tags',
+    'reviews': 'reviews',
+    'site_ratings': 'reviews',
+}
+# Cuánto se reutiliza la versión leída de la base (retraso máximo entre procesos)
+VERSION_TTL = 1.0
+
+
+class _VersionMemo:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries = {}
+
+    def get(self, scope):
+        with self._lock:
+            entry = self._entries.get(scope)
+        if entry and entry[1] > time.monotonic():
+            return entry[0]
+        return None
+
+    def set(self, versions: dict):
+        expires = time.monotonic() + VERSION_TTL
+        with self._lock:
+            for scope, version in versions.items():
+                self._entries[scope] = (version, expires)
+
+    def forget(self, scopes):
+        with self._lock:
+            for scope in scopes:
+                self._entries.pop(scope, None)
+
+
+_memo = _VersionMemo()
+
+
+def current(scopes) -> tuple:
+    """Versiones actuales de los ámbitos pedidos, en el mismo orden."""
+    versions = {scope: _memo.get(scope) for scope in scopes}
+    missing = [scope for scope, version in versions.items() if version is None]
+    if missing:
+        found = dict(
+            db.session.query(DataVersion.scope, DataVersion.version)
+            .filter(DataVersion.scope.in_(missing))
+            .all()
+        )
+        loaded = {scope: found.get(scope, 0) for scope in missing}
+        _memo.set(loaded)
+        versions.update(loaded)
+    return tuple(versions[scope] for scope in scopes)
+
+
+def bump_statement(scopes):
+    """UPSERT que incrementa la versión de los ámbitos (se ejecuta en la transacción del llamador)."""
+    table = DataVersion.__table__
+    stmt = insert(table).values([{'scope': scope, 'version': 1} for scope in sorted(scopes)])
+    return stmt.on_conflict_do_update(
+        index_elements=[table.c.scope],
+        set_={'version': table.c.version + 1, 'updated_at': func.now()}
+    )
+
+
+def forget(scopes):
+    """Descarta las versiones memorizadas e invalida los tags de cache (tras un bump ya confirmado)."""
+    _memo.forget(scopes)
+    cache.invalidate_tags(sorted(scopes))
+
+
+def _mark(session, table_name):
+    scope = TABLE_SCOPES.get(table_name)
+    if scope:
+        session.info.setdefault("data_version_scopes", set()).add(scope)
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_scopes(session, flush_context):
+    for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+        table = getattr(obj, "__table__", None)
+        if table is not None:
+            _mark(session, table.name)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _collect_bulk_scopes(orm_execute_state):
+    # INSERT/UPDATE/DELETE ejecutados directo con session.execute (ej: agregados de reseñas)
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        table = getattr(orm_execute_state.statement, "table", None)
+        if table is not None:
+            _mark(orm_execute_state.session, table.name)
+
+
+@event.listens_for(Session, "before_commit")
+def _bump_versions(session):
+    # Vuelca lo pendiente para conocer todas las tablas modificadas antes de incrementar
+    session.flush()
+    scopes = session.info.get("data_version_scopes")
+    if scopes:
+        session.execute(bump_statement(scopes))
+
+
+@event.listens_for(Session, "after_commit")
+def _forget_bumped(session):
+    scopes = session.info.pop("data_version_scopes", None)
+    if scopes:
+        forget(scopes)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_scopes(session):
+    session.info.pop("data_version_scopes", None)
@@ -0,0 +1,107 @@
+"""
+Generación de derivados de imágenes (miniaturas) al momento de subirlas.
+
+Cada imagen se reescala a un conjunto fijo de tamaños (thumb/card/full) y se
+codifica en WebP (o JPEG si Pillow no tiene soporte de WebP). Así el portal no
+descarga el original a tamaño completo para cada tarjeta del listado.
+"""
+import io
+import logging
+import os
+
+from PIL import Image, ImageOps, features
+
+logger = logging.getLogger(__name__)
+
+# Lado mayor (en px) de cada derivado
+VARIANTS = {
+    "thumb": 320,
+    "card": 800,
+    "full": 1600,
+}
+# Tamaño de la miniatura de avatares
+AVATAR_VARIANTS = {
+    "thumb": 256,
+}
+QUALITY = 82
+
+
+def output_format():
+    """Formato de salida: WebP si el build de Pillow lo soporta, si no JPEG."""
+    if features.check("webp"):
+        return "WEBP", "webp", "image/webp"
+    return "JPEG", "jpg", "image/jpeg"
+
+
+def variant_path(original_path: str, name: str, extension: str) -> str:
+    """Ruta del derivado en MinIO: `<ruta sin extensión>_<nombre>.<ext>`."""
+    base, _ = os.path.splitext(original_path)
+    return f"{base}_{name}.{extension}"
+
+
+def generate_variants(file, sizes=None) -> dict:
+    """
+    Genera los derivados de una imagen.
+
+    Args:
+        file: objeto tipo archivo (FileStorage, BytesIO, ...). Se deja posicionado al inicio.
+        sizes (dict): {nombre: lado mayor en px} (por defecto VARIANTS)
+
+    Returns:
+        dict: {nombre: (bytes, extensión, content_type)}. Vacío si el archivo no es
+        una imagen válida.
+    """
+    sizes = sizes or VARIANTS
+
+    try:
+        file.seek(0)
+        with Image.open(file) as source:
+            # Respeta la orientación EXIF y trabaja siempre en RGB
+            image = ImageOps.exif_transpose(source)
+            image = image.convert("RGB")
+    except Exception as e:
+        logger.warning(f"No se pudieron generar derivados de la imagen: {e}")
+        return {}
+    finally:
+        file.seek(0)
+
+    pil_format, extension, content_type = output_format()
+    variants = {}
+    for name, max_side in sizes.items():
+        resized = image.copy()
+        # thumbnail nunca agranda: si el original es más chico, se mantiene su tamaño
+        resized.thumbnail((max_side, max_side), Image.Resampling.LANCZOS)
+        buffer = io.BytesIO()
+        resized.save(buffer, pil_format, quality=QUALITY, optimize=True)
+        variants[name] = (buffer.getvalue(), extension, content_type)
+    return variants
+
+
+def upload_variants(client, bucket_name: str, original_path: str, file, sizes=None) -> dict:
+    """
+    Genera y sube los derivados de una imagen ya subida.
+    Si falla alguna subida, elimina los derivados que llegaron a subirse.
+
+    Returns:
+        dict: {nombre: ruta en MinIO}
+    """
+    uploaded = {}
+    try:
+        for name, (data, extension, content_type) in generate_variants(file, sizes).items():
+            path = variant_path(original_path, name, extension)
+            client.put_object(
+                bucket_name=bucket_name,
+                object_name=path,
+                data=io.BytesIO(data),
+                length=len(data),
+                content_type=content_type,
+            )
+            uploaded[name] = path
+    except Exception:
+        for path in uploaded.values():
+            try:
+                client.remove_object(bucket_name, path)
+            except Exception as e:
+                logger.error(f"No se pudo eliminar el derivado {path}: {e}")
+        raise
+    return uploaded
@@ -1,4 +1,151 @@
-def paginate_query(query, page, per_page=25, order_by="id", sorted_by="asc",url_params=None):
+import base64
+import json
+import logging
+import math
+import threading
+import time
+from datetime import datetime
+
+from sqlalchemy import event, literal, tuple_
+from sqlalchemy.orm import Session
+from sqlalchemy.sql.util import find_tables
+
+from core.database import db
+
+logger = logging.getLogger(__name__)
+
+# Modos de conteo del total en paginate_query
+COUNT_EXACT = "exact"
+COUNT_CACHED = "cached"
+COUNT_ESTIMATED = "estimated"
+COUNT_MODES = (COUNT_EXACT, COUNT_CACHED, COUNT_ESTIMATED)
+
+# Segundos que se reutiliza un total cacheado para la misma consulta (mismos filtros)
+COUNT_CACHE_TTL = 60
+COUNT_CACHE_MAX_ENTRIES = 1024
+# Por debajo de esta estimación del planner se cuenta exacto (es barato y más preciso)
+ESTIMATE_EXACT_THRESHOLD = 10000
+
+
+class InvalidCursorError(ValueError):
+    """El cursor recibido no se puede decodificar o no corresponde al orden pedido."""
+
+
+class _CountCache:
+    """
+    Totales cacheados por firma normalizada de la consulta (SQL compilado + parámetros).
+    Las entradas vencen por TTL y además se descartan cuando se confirma (commit)
+    un cambio ORM sobre alguna de las tablas que usa la consulta.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries = {}
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            total, expires_at, _ = entry
+            if time.monotonic() >= expires_at:
+                del self._entries[key]
+                return None
+            return total
+
+    def set(self, key, total, tables):
+        with self._lock:
+            if len(self._entries) >= COUNT_CACHE_MAX_ENTRIES:
+                # Se descarta la entrada más vieja (orden de inserción)
+                self._entries.pop(next(iter(self._entries)))
+            self._entries[key] = (total, time.monotonic() + COUNT_CACHE_TTL, frozenset(tables))
+
+    def invalidate_tables(self, tables):
+        with self._lock:
+            for key in [k for k, entry in self._entries.items() if entry[2] & tables]:
+                del self._entries[key]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+_count_cache = _CountCache()
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_changed_tables(session, flush_context):
+    changed = session.info.setdefault("count_cache_tables", set())
+    for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+        table = getattr(obj, "__table__", None)
+        if table is not None:
+            changed.add(table.name)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_count_cache(session):
+    changed = session.info.pop("count_cache_tables", None)
+    if changed:
+        _count_cache.invalidate_tables(changed)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_changed_tables(session):
+    session.info.pop("count_cache_tables", None)
+
+
+def _compile(query):
+    """Compila la consulta (sin ORDER BY) para el dialecto del engine."""
+    statement = query.order_by(None).statement
+    return statement, statement.compile(
+        dialect=db.engine.dialect, compile_kwargs={"render_postcompile": True}
+    )
+
+
+def _estimate_rows(query):
+    """Estimación de filas del planner de PostgreSQL (EXPLAIN, no ejecuta la consulta)."""
+    _, compiled = _compile(query)
+    # SAVEPOINT: si el EXPLAIN falla no deja abortada la transacción del request
+    with db.session.begin_nested():
+        result = db.session.connection().exec_driver_sql(
+            "EXPLAIN (FORMAT JSON) " + str(compiled), compiled.params
+        ).scalar()
+    plan = json.loads(result) if isinstance(result, str) else result
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+def count_query(query, count_mode=COUNT_EXACT):
+    """
+    Devuelve (total, es_estimado) según la estrategia pedida.
+
+    Args:
+        query: Query de SQLAlchemy
+        count_mode: 'exact' (COUNT(*) siempre), 'cached' (COUNT(*) reutilizado por
+            COUNT_CACHE_TTL segundos para los mismos filtros) o 'estimated'
+            (estimación del planner; si es chica se cuenta exacto)
+    """
+    if count_mode == COUNT_CACHED:
+        statement, compiled = _compile(query)
+        key = (str(compiled), repr(sorted(compiled.params.items(), key=lambda item: item[0])))
+        total = _count_cache.get(key)
+        if total is None:
+            total = query.order_by(None).count()
+            _count_cache.set(key, total, {table.name for table in find_tables(statement, include_joins=True)})
+        return total, False
+
+    if count_mode == COUNT_ESTIMATED:
+        try:
+            estimate = _estimate_rows(query)
+        except Exception as e:
+            logger.warning(f"No se pudo estimar el total, se cuenta exacto: {e}")
+        else:
+            if estimate >= ESTIMATE_EXACT_THRESHOLD:
+                return estimate, True
+
+    return query.order_by(None).count(), False
+
+
+def paginate_query(query, page, per_page=25, order_by="id", sorted_by="asc",url_params=None, count_mode=COUNT_EXACT):
     """
     Pagina una query de SQLAlchemy
 
@@ -8,6 +155,7 @@ def paginate_query(query, page, per_page=25, order_by="id", sorted_by="asc",url_
         per_page: Elementos por página
         order_by: Columa de la tabla por la que se ordena le paginacion (nombre, id, etc)
         sorted_by: Forma en la que se ordena la paginacion (asc o desc)
+        count_mode: cómo se obtiene el total ('exact', 'cached' o 'estimated', ver count_query)
     Returns:
         dict con información de paginación
     """
@@ -17,20 +165,31 @@ def paginate_query(query, page, per_page=25, order_by="id", sorted_by="asc",url_
             page = 1
     except (ValueError, TypeError):
         page = 1
+    if count_mode not in COUNT_MODES:
+        count_mode = COUNT_EXACT
+
+    # Se pide una fila de más: has_next no depende del total (que puede ser estimado)
+    rows = query.limit(per_page + 1).offset((page - 1) * per_page).all()
+    has_next = len(rows) > per_page
+    items = rows[:per_page]
 
-    pagination = query.paginate(page=page, per_page=per_page, error_out=False)
+    total, total_is_estimate = count_query(query, count_mode)
+    # Un total cacheado/estimado nunca puede ser menor a lo que ya se vio
+    total = max(total, (page - 1) * per_page + len(items) + (1 if has_next else 0))
+    pages = int(math.ceil(total / float(per_page))) if total and per_page else 0
 
     return {
-        "items": pagination.items,
-        "total": pagination.total,
-        "pages": pagination.pages,
-        "current_page": pagination.page,
-        "per_page": pagination.per_page,
-        "has_next": pagination.has_next,
-        "has_prev": pagination.has_prev,
-        "next_num": pagination.next_num,
-        "prev_num": pagination.prev_num,
-        "page_range": get_page_range(pagination.page, pagination.pages),
+        "items": items,
+        "total": total,
+        "total_is_estimate": total_is_estimate,
+        "pages": pages,
+        "current_page": page,
+        "per_page": per_page,
+        "has_next": has_next,
+        "has_prev": page > 1,
+        "next_num": page + 1 if has_next else None,
+        "prev_num": page - 1 if page > 1 else None,
+        "page_range": get_page_range(page, pages),
         "order_by": order_by,
         "sorted_by": sorted_by,
     }
@@ -47,4 +206,101 @@ def get_page_range(current_page, total_pages, delta=2):
     if current_page >= total_pages - delta:
         return list(range(total_pages - 2 * delta, total_pages + 1))
 
-    return list(range(current_page - delta, current_page + delta + 1))
\ No newline at end of file
+    return list(range(current_page - delta, current_page + delta + 1))
+
+
+def encode_cursor(sort_name, sorted_by, values):
+    """
+    Codifica la posición (valor de orden + id de la última fila) como un token opaco.
+
+    Args:
+        sort_name: nombre del ordenamiento (ej: 'site_name')
+        sorted_by: 'asc' o 'desc'
+        values: lista [valor_de_orden, id]
+    """
+    encoded = [
+        {"$dt": value.isoformat()} if isinstance(value, datetime) else value
+        for value in values
+    ]
+    payload = json.dumps({"s": sort_name, "d": sorted_by, "v": encoded}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor, sort_name, sorted_by):
+    """
+    Decodifica un cursor generado por encode_cursor.
+    Lanza InvalidCursorError si está corrupto o fue generado con otro ordenamiento.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        values = [
+            datetime.fromisoformat(value["$dt"]) if isinstance(value, dict) else value
+            for value in payload["v"]
+        ]
+    except (ValueError, TypeError, KeyError, AttributeError):
+        raise InvalidCursorError("Cursor inválido")
+
+    if payload.get("s") != sort_name or payload.get("d") != sorted_by or len(values) != 2:
+        raise InvalidCursorError("El cursor no corresponde al ordenamiento solicitado")
+    return values
+
+
+def keyset_paginate(query, sort_column, id_column, cursor=None, per_page=25,
+                    sort_name="id", sorted_by="asc", with_total=False, count_mode=COUNT_EXACT):
+    """
+    Pagina por cursor (keyset) en lugar de OFFSET/LIMIT.
+    Filtra con (sort_column, id) > (último valor, último id), así el costo de cualquier
+    página es el mismo que el de la primera y no se ejecuta COUNT(*).
+
+    Args:
+        query: Query de SQLAlchemy (sin ORDER BY propio)
+        sort_column: columna o expresión de orden (no nula)
+        id_column: columna única que desempata (ej: Site.id)
+        cursor: token devuelto como next_cursor en la página anterior (None = primera página)
+        per_page: Elementos por página
+        sort_name: nombre del ordenamiento (se guarda en el cursor)
+        sorted_by: 'asc' o 'desc'
+        with_total: si True también se cuenta el total (COUNT aparte, opcional)
+        count_mode: cómo se cuenta el total si with_total ('exact', 'cached', 'estimated')
+    Returns:
+        dict con items, next_cursor, has_next, has_prev, per_page y total
+    """
+    sorted_by = "desc" if str(sorted_by).lower() == "desc" else "asc"
+    single_entity = len(query.column_descriptions) == 1
+    total = count_query(query, count_mode)[0] if with_total else None
+
+    if cursor:
+        last_value, last_id = decode_cursor(cursor, sort_name, sorted_by)
+        current = tuple_(sort_column, id_column)
+        last = tuple_(literal(last_value), literal(last_id))
+        query = query.filter(current < last if sorted_by == "desc" else current > last)
+
+    if sorted_by == "desc":
+        query = query.order_by(None).order_by(sort_column.desc(), id_column.desc())
+    else:
+        query = query.order_by(None).order_by(sort_column.asc(), id_column.asc())
+
+    # Se pide una fila de más para saber si hay página siguiente
+    rows = query.add_columns(
+        sort_column.label("_keyset_value"), id_column.label("_keyset_id")
+    ).limit(per_page + 1).all()
+
+    has_next = len(rows) > per_page
+    rows = rows[:per_page]
+    items = [row[0] if single_entity else tuple(row[:-2]) for row in rows]
+
+    next_cursor = None
+    if has_next and rows:
+        next_cursor = encode_cursor(sort_name, sorted_by, [rows[-1][-2], rows[-1][-1]])
+
+    return {
+        "items": items,
+        "next_cursor": next_cursor,
+        "has_next": has_next,
+        "has_prev": bool(cursor),
+        "per_page": per_page,
+        "total": total,
+        "order_by": sort_name,
+        "sorted_by": sorted_by,
+    }
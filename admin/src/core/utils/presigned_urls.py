@@ -0,0 +1,82 @@
+import threading
+import time
+from collections import OrderedDict
+from datetime import timedelta
+
+# Vigencia de las URLs firmadas (la misma que usa MinIO por defecto)
+DEFAULT_EXPIRES = timedelta(days=7)
+# Una URL se deja de reutilizar cuando le queda menos de este margen de vida
+REFRESH_MARGIN = timedelta(hours=1)
+MAX_ENTRIES = 2048
+# Período de rotación: las URLs firmadas en un período no se reutilizan en el siguiente.
+# Las respuestas que las incluyen agregan la época al ETag (ver web.utils.http_cache),
+# así una respuesta nunca contiene URLs con menos de DEFAULT_EXPIRES - ROTATION de vida.
+ROTATION = timedelta(days=1)
+
+
+def rotation_epoch(rotation=ROTATION) -> int:
+    """Número del período de rotación actual (reloj de pared, igual en todos los workers)."""
+    return int(time.time() // rotation.total_seconds())
+
+
+class PresignedUrlCache:
+    """
+    Cache LRU de URLs presignadas de MinIO.
+
+    Firmar una URL (presigned_get_object) es un cálculo HMAC por llamada; para la misma
+    imagen la URL firmada sirve hasta que vence, así que se reutiliza hasta poco antes
+    de su vencimiento y nunca fuera del período de rotación en que se firmó.
+    La clave es (bucket, objeto, vigencia en segundos).
+    """
+
+    def __init__(self, max_entries=MAX_ENTRIES, refresh_margin=REFRESH_MARGIN, rotation=ROTATION):
+        self.max_entries = max_entries
+        self.refresh_margin = refresh_margin.total_seconds()
+        self.rotation = rotation
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get_url(self, client, bucket_name, object_name, expires=DEFAULT_EXPIRES):
+        """Devuelve una URL firmada vigente para el objeto (firmando solo si hace falta)."""
+        key = (bucket_name, object_name, int(expires.total_seconds()))
+        now = time.monotonic()
+        epoch = rotation_epoch(self.rotation)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[1] > now and entry[2] == epoch:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+            self.misses += 1
+
+        url = client.presigned_get_object(
+            bucket_name=bucket_name,
+            object_name=object_name,
+            expires=expires,
+        )
+        reuse_until = now + max(expires.total_seconds() - self.refresh_margin, 0)
+        with self._lock:
+            self._entries[key] = (url, reuse_until, epoch)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return url
+
+    def invalidate(self, bucket_name, object_name):
+        """Descarta las URLs cacheadas de un objeto (ej: si se borra o reemplaza)."""
+        with self._lock:
+            for key in [k for k in self._entries if k[0] == bucket_name and k[1] == object_name]:
+                del self._entries[key]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "entries": len(self._entries)}
+
+
+presigned_urls = PresignedUrlCache()
@@ -1,8 +1,11 @@
 from datetime import datetime
 from typing import Any, Dict, List, Optional, Union
-from sqlalchemy import and_, inspect, or_
+from sqlalchemy import Float, cast, func, inspect, literal, or_
 from sqlalchemy.orm import Query
-from geoalchemy2 import Geography, functions as geofunctions, elements as geoelements
+from geoalchemy2 import functions as geofunctions
+
+# Configuración de texto completo (español sin acentos, creada junto a la tabla sites)
+TEXT_SEARCH_CONFIG = "public.spanish_unaccent"
 
 class GenericSearchBuilder:
     """Constructor genérico de queries de búsqueda para cualquier modelo SQLAlchemy"""
@@ -31,15 +34,15 @@ class GenericSearchBuilder:
         Returns:
             Query de SQLAlchemy filtrada
         """
-        # Seguro hay una mejor forma de hacer esto metiendolo como un filtro custom pero no la encuentro ahora
         query = self.model_class.query
         if lat is not None and lng is not None and radius is not None:
-            center = geoelements.WKTElement(f"POINT({lng} {lat})", srid=4326)
-            query = query.filter(
-                geofunctions.ST_DWithin(
-                    self.model_class.location.cast(Geography), center, radius
-                )
-            )
+            radius_m = radius * 1000
+            # ST_DWithin sobre geography(location) usa su índice GIST y ya hace internamente
+            # el prefiltro por caja envolvente (no hace falta otro sobre la geometría).
+            # Se mide sobre la esfera (use_spheroid=false), la misma métrica que distance_expression
+            query = query.filter(geofunctions.ST_DWithin(
+                location_geography(self.model_class), point_geography(lat, lng), radius_m, False
+            ))
 
         # Procesar cada filtro
         for filter_name, filter_value in filters.items():
@@ -56,6 +59,7 @@ class GenericSearchBuilder:
         # Filtros especiales (no corresponden directamente a columnas)
         special_filters = {
             "search_text": self._apply_text_search,
+            "full_text": self._apply_full_text_search,
             "date_from": self._apply_date_from,
             "date_to": self._apply_date_to,
             "date_range": self._apply_date_range,
@@ -88,6 +92,21 @@ class GenericSearchBuilder:
 
         return query.filter(or_(*conditions))
 
+    def _apply_full_text_search(self, query: Query, search_text: str) -> Query:
+        """
+        Búsqueda de texto completo sobre la columna `search_vector` del modelo (índice GIN).
+        Acepta la sintaxis de buscador web: "frase exacta", -excluir, or.
+        Si el modelo no tiene vector de búsqueda cae en la búsqueda ILIKE.
+        """
+        if not search_text:
+            return query
+        if not hasattr(self.model_class, "search_vector"):
+            return self._apply_text_search(query, search_text)
+
+        return query.filter(
+            self.model_class.search_vector.op("@@")(build_tsquery(search_text))
+        )
+
     def _apply_date_from(self, query: Query, date_from: Union[str, datetime]) -> Query:
         """Aplica filtro de fecha desde"""
         date_columns = self._get_date_columns()
@@ -188,6 +207,11 @@ class GenericSearchBuilder:
             "endswith": lambda c, v: c.ilike(f"%{v}"),
             "in": lambda c, v: c.in_(v) if isinstance(v, list) else c == v,
             "not_in": lambda c, v: ~c.in_(v) if isinstance(v, list) else c != v,
+            # Requieren pg_trgm y un índice GIN gin_trgm_ops sobre la columna:
+            # trgm = subcadena (ILIKE) o parecido a todo el valor (tolera errores de tipeo)
+            "trgm": lambda c, v: or_(c.ilike(f"%{v}%"), c.op("%")(v)),
+            # similar = el texto se parece a alguna palabra de la columna (word_similarity)
+            "similar": lambda c, v: literal(v).op("<%")(c),
         }
 
         if operator in operators:
@@ -224,6 +248,45 @@ class GenericSearchBuilder:
 
 
 # Funciones de conveniencia
+def build_tsquery(search_text: str):
+    """Convierte el texto del usuario en un tsquery (websearch_to_tsquery, sin acentos)."""
+    return func.websearch_to_tsquery(TEXT_SEARCH_CONFIG, search_text)
+
+
+def text_search_rank(model_class, search_text: str):
+    """
+    Expresión de relevancia (ts_rank_cd, normalizada por longitud) para ordenar resultados.
+    ts_rank_cd devuelve real (float4): se pasa a float8 para que la comparación del cursor
+    (valor float8 decodificado del JSON) sea exacta y no repita ni saltee filas empatadas.
+    """
+    return cast(func.ts_rank_cd(model_class.search_vector, build_tsquery(search_text), 32), Float(53))
+
+
+def location_geography(model_class):
+    """
+    `geography(location)`: distancias en metros sobre la Tierra.
+    Es la misma expresión del índice GIST ix_sites_location_geography, así el
+    planificador lo usa (un CAST a Geography genérico no coincide con el índice).
+    """
+    return func.geography(model_class.location)
+
+
+def point_geography(lat: float, lng: float):
+    """Punto (lat, lng) en WGS 84 como geography."""
+    return func.geography(func.ST_SetSRID(func.ST_MakePoint(lng, lat), 4326))
+
+
+def distance_expression(model_class, lat: float, lng: float):
+    """
+    Distancia en metros (sobre la esfera) desde la ubicación del modelo hasta (lat, lng).
+
+    Usa el operador KNN `<->`: en un ORDER BY recorre el índice GIST de más cerca a más
+    lejos sin calcular todas las distancias. La misma expresión se usa para ordenar, para
+    el cursor y para informar `distance_m`, así el orden y los valores siempre coinciden.
+    """
+    return location_geography(model_class).op("<->", return_type=Float)(point_geography(lat, lng))
+
+
 def build_search_query(model_class, filters: Dict[str, Any], lat: int = None,lng:int = None, radius:int = None) -> Query:
     """
     Función de conveniencia para construir queries de búsqueda
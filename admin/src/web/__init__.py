@@ -1,6 +1,6 @@
+import click
 from flask import Flask
 from flask import render_template
-from flask_session import Session
 from flask_cors import CORS
 from web.handlers import error
 from core import database
@@ -20,13 +20,16 @@ from .config import get_current_config
 import os
 from dotenv import load_dotenv
 from core import seeds
+from src.web.session_store import init_session
 from src.web.storage import storage
+from src.web.view_counter import view_counter
+from src.web.query_stats import query_stats
+from src.web.export_worker import export_worker
+from core.utils.cache import cache
 from authlib.integrations.flask_client import OAuth
 
 load_dotenv()
 
-session = Session()
-
 def create_app(env = 'development', static_folder = "../../static"):
 
     app = Flask(__name__, static_folder=static_folder)
@@ -34,8 +37,12 @@ def create_app(env = 'development', static_folder = "../../static"):
     app.config.from_object(get_current_config(env))
 
     database.init_db(app)
-    session.init_app(app)
+    init_session(app)
     storage.init_app(app)
+    view_counter.init_app(app)
+    export_worker.init_app(app)
+    cache.init_app(app)
+    query_stats.init_app(app)
 
     CORS(app, supports_credentials=True, origins=[
         "http://localhost:8080",
@@ -104,25 +111,55 @@ def create_app(env = 'development', static_folder = "../../static"):
         reset_db(app)
 
     @app.cli.command("seed-db")
-    def seed_db_command():
-        import os
-
+    @click.option("--sites", default=0, show_default=True, help="Sitios sintéticos a generar (además de los de demo).")
+    @click.option("--reviews", default=0, show_default=True, help="Reseñas sintéticas a generar.")
+    @click.option("--seed", default=2025, show_default=True, help="Semilla de los datos generados.")
+    @click.option("--batch-size", default=20000, show_default=True, help="Filas por COPY y commit.")
+    def seed_db_command(sites, reviews, seed, batch_size):
         from core.seeds import seed_data
-
-        #env = os.getenv("FLASK_ENV", "production")
+        from core import seed_generator
 
         seed_data()
-
-    # Inicialización automática para producción
-    with app.app_context():
-        if env == "production":
-            from core.database import reset_db
-            from core.seeds import seed_data as seed_db
-            # Borra y crea la base de datos
-            reset_db(app)
-            # Corre los seeds
-            seed_db()
-    
-
+        if sites or reviews:
+            new_sites, new_reviews = seed_generator.generate(sites, reviews, seed=seed, batch_size=batch_size)
+            print(f"Generados {new_sites} sitios y {new_reviews} reseñas.")
+
+    @app.cli.command("rebuild-ratings")
+    def rebuild_ratings_command():
+        from core.services.rating_service import RatingService
+
+        total = RatingService.rebuild_all()
+        print(f"Agregados de calificaciones recalculados para {total} sitios.")
+
+    @app.cli.command("backfill-image-variants")
+    @click.option("--batch-size", default=50, show_default=True, help="Imágenes por commit.")
+    def backfill_image_variants_command(batch_size):
+        from core.services.sites_service import SiteService
+
+        total = SiteService.backfill_image_variants(batch_size=batch_size)
+        print(f"Derivados generados para {total} imágenes.")
+
+    # Al arrancar solo se verifica la versión del esquema (sin DDL ni seeds).
+    # En producción una base sin migrar impide arrancar. Solo el grupo `flask db`
+    # (Flask-Migrate) se saltea la verificación, porque es el que migra.
+    strict = env == "production"
+    ctx = click.get_current_context(silent=True)
+    if ctx is None or ctx.parent is not None:
+        # Servidor WSGI o comando propio de Flask que carga la app (flask run, flask shell)
+        database.check_schema(app, strict=strict)
+    else:
+        # La CLI carga la app para resolver un comando registrado en app.cli:
+        # se verifica una vez, al conocer el nombre del primer comando que no sea `db`
+        resolve_command = app.cli.get_command
+        checked = False
+
+        def get_command(ctx, name):
+            nonlocal checked
+            if name != "db" and not checked:
+                checked = True
+                database.check_schema(app, strict=strict)
+            return resolve_command(ctx, name)
+
+        app.cli.get_command = get_command
 
     return app
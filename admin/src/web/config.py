@@ -3,8 +3,13 @@ from datetime import timedelta
 
 class config:
     TESTING = False
-    SECRET_KEY = 'secret_key'
-    SESSION_TYPE = 'filesystem'
+    SECRET_KEY = os.getenv("SECRET_KEY", 'secret_key')
+
+    # Sesiones: cookie (firmada), sqlalchemy, redis o filesystem (ver web/session_store.py)
+    SESSION_BACKEND = os.getenv("SESSION_BACKEND", "cookie")
+    SESSION_REDIS_URL = os.getenv("SESSION_REDIS_URL", "redis://localhost:6379/1")
+    # Backends del servidor: borrar sesiones vencidas cada ~N requests (None: usar `flask session_cleanup`)
+    SESSION_CLEANUP_N_REQUESTS = int(os.getenv("SESSION_CLEANUP_N_REQUESTS", 1000)) or None
 
     JWT_SECRET_KEY = os.environ.get("JWT_SECRET_KEY", SECRET_KEY)
     JWT_ACCESS_TOKEN_EXPIRES = timedelta(days=1)
@@ -17,6 +22,30 @@ class config:
         "pool_pre_ping": True,
     }
 
+    # Buffer de vistas: se vuelca cada N segundos o al acumular N visitas
+    VIEW_COUNTER_FLUSH_INTERVAL = int(os.getenv("VIEW_COUNTER_FLUSH_INTERVAL", 10))
+    VIEW_COUNTER_FLUSH_THRESHOLD = int(os.getenv("VIEW_COUNTER_FLUSH_THRESHOLD", 100))
+
+    # Hilos del pool local de exportaciones en segundo plano
+    EXPORT_WORKERS = int(os.getenv("EXPORT_WORKERS", 2))
+    # Segundos tras los que una exportación sin terminar se marca como fallida
+    EXPORT_JOB_TIMEOUT = int(os.getenv("EXPORT_JOB_TIMEOUT", 2 * 3600))
+
+    # Cache del servidor: memory (por proceso), file (compartido en el host) o redis
+    CACHE_BACKEND = os.getenv("CACHE_BACKEND", "memory")
+    CACHE_URL = os.getenv("CACHE_URL", "redis://localhost:6379/0")
+    CACHE_DIR = os.getenv("CACHE_DIR")
+    CACHE_NAMESPACE = os.getenv("CACHE_NAMESPACE", "ps")
+    CACHE_DEFAULT_TTL = int(os.getenv("CACHE_DEFAULT_TTL", 300))
+
+    # Consultas SQL por request (web/query_stats.py): header Server-Timing y log JSON.
+    # Por defecto solo en desarrollo: el header expone tiempos internos de la base.
+    # El panel de depuración en las plantillas se activa por defecto solo en debug.
+    QUERY_STATS_ENABLED = os.getenv("QUERY_STATS_ENABLED", "false").lower() == "true"
+    QUERY_STATS_SLOW_MS = float(os.getenv("QUERY_STATS_SLOW_MS", 200))
+    # Repeticiones de una misma forma de sentencia para reportarla como N+1
+    QUERY_STATS_N_PLUS_ONE = int(os.getenv("QUERY_STATS_N_PLUS_ONE", 5))
+
 
 class ProductionConfig(config):
     """Production configuration."""
@@ -41,11 +70,11 @@ class DevelopmentConfig(config):
     DB_PASS = "123456"
     DB_HOST = "localhost"
     DB_NAME = "proyecto"
-    SESSION_TYPE = "filesystem"
     SQLALCHEMY_TRACK_MODIFICATIONS = True
-    SQLALCHEMY_DATABASE_URI = (
-        f"postgresql://{DB_USER}:{DB_PASS}@{DB_HOST}:5432/{DB_NAME}"
+    SQLALCHEMY_DATABASE_URI = os.getenv(
+        "DATABASE_URL", f"postgresql://{DB_USER}:{DB_PASS}@{DB_HOST}:5432/{DB_NAME}"
     )
+    QUERY_STATS_ENABLED = os.getenv("QUERY_STATS_ENABLED", "true").lower() == "true"
 
 class TestingConfig(config):
     TESTING = True
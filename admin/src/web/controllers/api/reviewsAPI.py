@@ -1,17 +1,20 @@
 from flask import Blueprint, request, jsonify, session
 from core.services.review_service import ReviewService 
+from core.services.rating_service import RatingService
 from core.models.Site import Site 
 from core.models.Review import Review 
 from core.database import db
+from core.utils.pagination import keyset_paginate, InvalidCursorError
 from datetime import datetime, timezone
 from web.utils.jwt_utils import jwt_required
+from web.utils.http_cache import cached_response
 from core.services.flag_service import FlagService
 from core.models.User import User
 # Definición del Blueprint: La base de URL ahora es solo /api
 reviewsAPI_blueprint = Blueprint("reviewsAPI", __name__, url_prefix="/api")
 
 def check_flag():
-    flag = FlagService.get_flag_by_name("reviews_enabled")
+    flag = FlagService.get_cached_flag("reviews_enabled")
     if not flag:
         #no deberia pasar nunca pero por si algun gracioso me borra la db :)
         return jsonify({
@@ -188,14 +191,21 @@ def api_create_review():
 
 
 @reviewsAPI_blueprint.route("/reviews", methods=["GET"])
+@cached_response(scopes=('reviews', 'sites'))
 def api_get_public_reviews():
     """
     API pública para devolver SOLO reseñas aprobadas.
+
+    Query params opcionales para paginar por cursor (en lugar de page):
+        - cursor: vacío para la primera página, luego el next_cursor recibido
+        - sort: created_at o rating (default: created_at), order: asc o desc (default: desc)
+        - include_total: si se calcula el total (default: false)
     """
     try:
         site_id = request.args.get("site_id", type=int)
         page = request.args.get("page", 1, type=int)
         per_page = request.args.get("per_page", 10, type=int)
+        cursor = request.args.get("cursor")
 
         # Filtro por 'Aprobada' y que el sitio no esté eliminado
         query = Review.query.filter_by(status="Aprobada").join(Site).filter(Site.deleted == False)
@@ -203,11 +213,37 @@ def api_get_public_reviews():
         if site_id:
             query = query.filter(Review.site_id == site_id)
 
+        if cursor is not None:
+            sort = "rating" if request.args.get("sort") == "rating" else "created_at"
+            order = "asc" if request.args.get("order") == "asc" else "desc"
+            try:
+                pagination = keyset_paginate(
+                    query,
+                    Review.rating if sort == "rating" else Review.created_at,
+                    Review.id,
+                    cursor=cursor,
+                    per_page=per_page,
+                    sort_name=sort,
+                    sorted_by=order,
+                    with_total=request.args.get("include_total", "false").lower() == "true"
+                )
+            except InvalidCursorError as e:
+                return jsonify({"ok": False, "error": str(e)}), 400
+
+            return jsonify({
+                "ok": True,
+                "total": pagination["total"],
+                "per_page": pagination["per_page"],
+                "has_next": pagination["has_next"],
+                "next_cursor": pagination["next_cursor"],
+                "reviews": ReviewService.reviews_to_dict(pagination["items"])
+            }), 200
+
         pagination = query.order_by(Review.created_at.desc()).paginate(
             page=page, per_page=per_page, error_out=False
         )
 
-        reviews_data = [r.to_dict() for r in pagination.items]
+        reviews_data = ReviewService.reviews_to_dict(pagination.items)
 
         return jsonify({
             "ok": True,
@@ -295,10 +331,14 @@ def api_update_review(review_id):
              return jsonify({"ok": False, "error": "No estás autorizado para editar esta reseña."}), 403
 
         # Actualizar campos
+        old_status, old_rating = review.status, review.rating
         review.rating = rating
         review.content = text.strip()
         review.status = 'Pendiente' # Vuelve a moderación
         review.rejection_reason = None 
+
+        # Si estaba aprobada deja de contar en el agregado hasta que se vuelva a moderar
+        RatingService.track_review_change(review, old_status, old_rating)
         
         # Actualizar la fecha
         review.updated_at = datetime.now(timezone.utc)
@@ -354,7 +394,8 @@ def api_delete_review(review_id):
             print(f" BORRADO DENEGADO: Reseña de {review.user_email} intentada por {email_from_payload}")
             return jsonify({"ok": False, "error": "No estás autorizado para eliminar esta reseña."}), 403
 
-        # Proceder a eliminar
+        # Proceder a eliminar (descontando la reseña del agregado si estaba aprobada)
+        RatingService.track_review_deleted(review)
         db.session.delete(review)
         db.session.commit()
         
@@ -368,6 +409,7 @@ def api_delete_review(review_id):
         return jsonify({"ok": False, "error": "Error interno al eliminar la reseña"}), 500
 
 @reviewsAPI_blueprint.route("/reviews/list/<int:site_id>", methods=["GET"])
+@cached_response(scopes=('reviews', 'sites'))
 def api_get_site_reviews(site_id):
     """
     Endpoint para obtener todas las reseñas de un sitio
@@ -380,10 +422,7 @@ def api_get_site_reviews(site_id):
     try:
         reviews = ReviewService.get_approved_reviews_by_site_paginated(site_id, 1, 25, 'created_at', 'desc')
 
-        items = reviews['items']
-        reviews_data = []
-        for r in items:
-            reviews_data.append(r.to_dict())
+        reviews_data = ReviewService.reviews_to_dict(reviews['items'])
 
         return jsonify({'data': reviews_data}), 200
     
@@ -420,7 +459,7 @@ def api_get_user_reviews(user_id):
         pagination = query.paginate(page=page, per_page=per_page, error_out=False)
         
         return jsonify({
-            'data': [review.to_dict() for review in pagination.items],
+            'data': ReviewService.reviews_to_dict(pagination.items),
             'pagination': {
                 'page': pagination.page,
                 'per_page': pagination.per_page,
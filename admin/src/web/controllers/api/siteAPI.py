@@ -1,19 +1,35 @@
-from flask import Blueprint, render_template, request, redirect, url_for,session, flash,abort,Response, jsonify
+import math
+
+from flask import Blueprint, render_template, request, redirect, url_for,session, flash,abort,Response, jsonify, current_app
 from core.models.Site import Site
 from core.models.Tag import Tag
 from core.models.Category import Category
 from core.models.State import State
 from core.database import db
 from sqlalchemy.orm import selectinload
-from sqlalchemy import or_, and_
+from sqlalchemy import or_, and_, func
 from core.services.sites_service import SiteService
+from core.services.map_service import MapService, MAX_ZOOM
 from core.models.UserFavorite import UserFavorite
-from core.utils.pagination import paginate_query
+from core.models.SiteRating import SiteRating
+from core.utils.pagination import paginate_query, keyset_paginate, InvalidCursorError, COUNT_CACHED
 from web.utils.jwt_utils import jwt_required
+from web.utils.http_cache import cached_response
 
 
 sitesAPI_blueprint = Blueprint("sitesAPI", __name__, url_prefix="/api/sites")
 
+def _cursor_pagination_json(pagination):
+    """Bloque 'pagination' de las respuestas en modo cursor."""
+    return {
+        'per_page': pagination['per_page'],
+        'total': pagination['total'],
+        'has_prev': pagination['has_prev'],
+        'has_next': pagination['has_next'],
+        'next_cursor': pagination['next_cursor']
+    }
+
+
 @sitesAPI_blueprint.route("/", methods=["GET"])
 def list_sites():
     """
@@ -22,21 +38,33 @@ def list_sites():
     Query params:
         - page: número de página (default: 1)
         - per_page: items por página (default: 12)
-        - q: búsqueda por nombre y descripción breve
+        - q: búsqueda de texto completo (nombre, descripciones, ciudad y provincia).
+          Acepta "frase exacta" y -exclusión; ignora acentos
         - province: filtro por provincia
         - city: filtro por ciudad
         - tags: filtro por tags (IDs separados por coma)
         - state: filtro por nombre de estado
-        - sort: ordenamiento (site_name, registration, rating, default: site_name)
-        - order: dirección (asc, desc, default: asc)
+        - sort: ordenamiento (site_name, registration, rating, views, relevance, distance;
+          default: relevance si hay q, si no site_name)
+        - order: dirección (asc, desc, default: asc; desc si se ordena por relevancia)
         - lat: latitud para ordenamiento por distancia (opcional)
         - lng: longitud para ordenamiento por distancia (opcional)
-        - radius: radio en km para filtrar por distancia (opcional)
+        - radius: radio en km para filtrar por distancia (opcional, requiere lat/lng)
+        Con lat/lng cada sitio incluye `distance_m` (metros) y se puede pedir
+        sort=distance para obtener primero los más cercanos.
         - user_id: filtrar solo favoritos del usuario (opcional)
+        - cursor: paginación por cursor (opcional). Enviar vacío para la primera página
+          y luego el next_cursor recibido; reemplaza a page
+        - include_total: en modo cursor, si se calcula el total (default: false)
+        - count: cómo se calcula el total: exact, cached o estimated (default: cached)
     """
     # Parámetros de paginación
     page = request.args.get('page', 1, type=int)
     per_page = request.args.get('per_page', 12, type=int)
+    cursor = request.args.get('cursor')
+    include_total = request.args.get('include_total', 'false').lower() == 'true'
+    # El total se reutiliza entre páginas con los mismos filtros (cache con TTL)
+    count_mode = request.args.get('count', COUNT_CACHED)
     
     # Parámetros de búsqueda y filtros
     search_query = request.args.get('q', '').strip()
@@ -55,13 +83,17 @@ def list_sites():
             pass
     
     # Parámetros de ordenamiento
-    sort_by = request.args.get('sort', 'site_name')  # site_name, registration, rating
-    order = request.args.get('order', 'asc')  # asc, desc
+    # Con búsqueda, por defecto se ordena por relevancia
+    sort_by = request.args.get('sort', 'relevance' if search_query else 'site_name')  # site_name, registration, rating, views, relevance
+    order = request.args.get('order', 'desc' if sort_by == 'relevance' else 'asc')  # asc, desc
     
     # Parámetros de geolocalización
     lat = request.args.get('lat', type=float)
     lng = request.args.get('lng', type=float)
     radius = request.args.get('radius', type=float)  # en km
+    has_point = lat is not None and lng is not None
+    if sort_by == 'distance' and not has_point:
+        return jsonify({'error': 'sort=distance requiere lat y lng'}), 400
     
     filters = {
         'active': True,
@@ -69,13 +101,15 @@ def list_sites():
     }
 
     if search_query:
-        filters['search_text'] = search_query
+        # Texto completo (tsvector + índice GIN), sin distinguir acentos
+        filters['full_text'] = search_query
     
+    # Subcadena o valor con errores de tipeo, resuelto con índice de trigramas
     if city_filter:
-        filters['city'] = {'operator': 'ilike', 'value': city_filter}
+        filters['city'] = {'operator': 'trgm', 'value': city_filter}
     
     if province_filter:
-        filters['province'] = {'operator': 'ilike', 'value': province_filter}
+        filters['province'] = {'operator': 'trgm', 'value': province_filter}
     
     if state_filter:
         try:
@@ -90,26 +124,42 @@ def list_sites():
     if user_id_filter:
         filters['user_id'] = user_id_filter
     
-    pagination = SiteService.get_sites_filtered(
-        filters=filters,
-        order_by=sort_by,
-        sorted_by=order,
-        paginate=True,
-        page=page,
-        per_page=per_page,
-        lng=lng,
-        lat=lat,
-        radius=radius
-    )
+    try:
+        pagination = SiteService.get_sites_filtered(
+            filters=filters,
+            order_by=sort_by,
+            sorted_by=order,
+            paginate=True,
+            page=page,
+            per_page=per_page,
+            lng=lng,
+            lat=lat,
+            radius=radius,
+            cursor=cursor,
+            with_total=include_total,
+            count_mode=count_mode
+        )
+    except InvalidCursorError as e:
+        return jsonify({'error': str(e)}), 400
     
     # Serializar resultados
-    sites_json = [site.to_dict() for site in pagination['items']]
+    sites_json = SiteService.sites_to_dict(pagination['items'])
+    if has_point:
+        distances = SiteService.distances_for([site['id'] for site in sites_json], lat, lng)
+        for site in sites_json:
+            site['distance_m'] = distances.get(site['id'])
+    if cursor is not None:
+        return jsonify({
+            'data': sites_json,
+            'pagination': _cursor_pagination_json(pagination)
+        })
     return jsonify({
         'data': sites_json,
         'pagination': {
             'page': pagination['current_page'],
             'per_page': pagination['per_page'],
             'total': pagination['total'],
+            'total_is_estimate': pagination['total_is_estimate'],
             'total_pages': pagination['pages'],
             'has_prev': pagination['has_prev'],
             'has_next': pagination['has_next'],
@@ -120,6 +170,7 @@ def list_sites():
 
 
 @sitesAPI_blueprint.route("/tags", methods=["GET"])
+@cached_response(scopes=('tags',))
 def list_tags():
     """
     Lista todos los tags disponibles.
@@ -134,6 +185,7 @@ def list_tags():
 
 
 @sitesAPI_blueprint.route("/provinces", methods=["GET"])
+@cached_response(scopes=('sites',))
 def list_provinces():
     """
     Lista todas las provincias únicas de los sitios activos.
@@ -152,6 +204,7 @@ def list_provinces():
     return jsonify({'data': provinces_json})
 
 @sitesAPI_blueprint.route("/states", methods=["GET"])
+@cached_response(scopes=('sites',))
 def list_states():
     """
     Lista todos los estados de conservación disponibles.
@@ -167,23 +220,23 @@ def list_states():
 @sitesAPI_blueprint.route("/<int:site_id>", methods=["GET"])
 def siteDetails(site_id):
     """
-    Detalle sobre un sitio. Incrementa el contador de vistas.
+    Detalle sobre un sitio. Registra la visita en el buffer de vistas
+    (se vuelca a la base en lote, ver web/view_counter.py).
     
     Returns:
         JSON con toda la información de un sitio
     """
     
     site = SiteService.get_site_by_id(site_id)
+    if not site:
+        return jsonify({'error': 'Sitio no encontrado'}), 404
     
-    # Incrementar el contador de vistas
-    try:
-        site.views += 1
-        db.session.commit()
-    except Exception as e:
-        db.session.rollback()
-        print(f"Error incrementando vistas: {e}")
+    # Registrar la visita sin escribir en la base (GET de solo lectura)
+    current_app.view_counter.increment(site.id)
     
     json = site.to_dict()
+    # Se suman las visitas que todavía no se volcaron
+    json['views'] = (json['views'] or 0) + current_app.view_counter.pending(site.id)
     
     return jsonify({'data': json})
 
@@ -264,6 +317,8 @@ def list_favorites():
         - limit (optional): Número máximo de sitios a devolver (ej: 4 para la home)
         - sort: ordenamiento (added_date, site_name, rating, registration, default: added_date)
         - order: dirección (asc, desc, default: desc)
+        - cursor (optional): paginación por cursor (vacío = primera página, luego next_cursor)
+        - include_total (optional): en modo cursor, si se calcula el total
     
     Response: 
     {
@@ -291,6 +346,10 @@ def list_favorites():
     
     # Parámetro limit (para usar en home, por ejemplo)
     limit = request.args.get('limit', type=int)
+
+    # Paginación por cursor (opcional)
+    cursor = request.args.get('cursor')
+    include_total = request.args.get('include_total', 'false').lower() == 'true'
     
     # Validar user_id
     user_id = request.args.get('user_id')
@@ -331,9 +390,11 @@ def list_favorites():
         
         # Aplicar ordenamiento
         if sort_by == 'site_name':
-            order_column = Site.name
+            order_column = Site.site_name
         elif sort_by == 'rating':
-            order_column = Site.rating_avg
+            # Promedio materializado (LEFT JOIN para incluir sitios sin reseñas)
+            query = query.outerjoin(SiteRating, SiteRating.site_id == Site.id)
+            order_column = func.coalesce(SiteRating.rating_average, 0)
         elif sort_by == 'registration':
             order_column = Site.registration
         elif sort_by == 'added_date':
@@ -342,6 +403,26 @@ def list_favorites():
             # Default: ordenar por fecha de agregado a favoritos
             order_column = UserFavorite.created_at
         
+        # Modo cursor: orden fijo por (columna, id del sitio)
+        if cursor is not None and not limit:
+            try:
+                pagination = keyset_paginate(
+                    query, order_column, Site.id, cursor=cursor, per_page=per_page,
+                    sort_name=sort_by, sorted_by=order, with_total=include_total
+                )
+            except InvalidCursorError as e:
+                return jsonify({'error': str(e), 'data': [], 'user_id': user_id}), 400
+
+            sites_json = SiteService.sites_to_dict([site for site, _ in pagination['items']])
+            for site_dict, (_, added_date) in zip(sites_json, pagination['items']):
+                site_dict['favorited_at'] = added_date.isoformat() if added_date else None
+
+            return jsonify({
+                'data': sites_json,
+                'user_id': user_id,
+                'pagination': _cursor_pagination_json(pagination)
+            }), 200
+
         # Aplicar dirección del ordenamiento
         if order.lower() == 'asc':
             query = query.order_by(order_column.asc())
@@ -352,11 +433,9 @@ def list_favorites():
         if limit and limit > 0:
             items = query.limit(limit).all()
             
-            sites_json = []
-            for site, added_date in items:
-                site_dict = site.to_dict()
+            sites_json = SiteService.sites_to_dict([site for site, _ in items])
+            for site_dict, (_, added_date) in zip(sites_json, items):
                 site_dict['favorited_at'] = added_date.isoformat() if added_date else None
-                sites_json.append(site_dict)
             
             return jsonify({
                 'data': sites_json,
@@ -372,12 +451,10 @@ def list_favorites():
         )
         
         # Serializar sitios
-        sites_json = []
-        for site, added_date in pagination['items']:
-            site_dict = site.to_dict()
+        sites_json = SiteService.sites_to_dict([site for site, _ in pagination['items']])
+        for site_dict, (_, added_date) in zip(sites_json, pagination['items']):
             # Agregar fecha en que fue agregado a favoritos
             site_dict['favorited_at'] = added_date.isoformat() if added_date else None
-            sites_json.append(site_dict)
         
         return jsonify({
             'data': sites_json,
@@ -408,6 +485,7 @@ def list_favorites():
 
 
 @sitesAPI_blueprint.route("/most-visited", methods=["GET"])
+@cached_response(scopes=('sites', 'views', 'reviews'))
 def most_visited():
     """
     Obtiene los 4 sitios más visitados (activos y no eliminados).
@@ -418,14 +496,14 @@ def most_visited():
     try:
         sites = db.session.query(Site)\
             .filter(Site.active == True, Site.deleted == False)\
-            .order_by(Site.views.desc())\
+            .order_by(func.coalesce(Site.views, 0).desc(), Site.id.desc())\
             .limit(4)\
             .all()
         
         if not sites:
             return jsonify({'data': [], 'message': 'No hay sitios disponibles'}), 200
         
-        sites_json = [site.to_dict() for site in sites]
+        sites_json = SiteService.sites_to_dict(sites)
         return jsonify({'data': sites_json}), 200
         
     except Exception as e:
@@ -433,6 +511,7 @@ def most_visited():
 
 
 @sitesAPI_blueprint.route("/recently-added", methods=["GET"])
+@cached_response(scopes=('sites', 'reviews'))
 def recently_added():
     """
     Obtiene los 4 sitios agregados más recientemente (activos y no eliminados).
@@ -443,20 +522,21 @@ def recently_added():
     try:
         sites = db.session.query(Site)\
             .filter(Site.active == True, Site.deleted == False)\
-            .order_by(Site.registration.desc())\
+            .order_by(Site.registration.desc(), Site.id.desc())\
             .limit(4)\
             .all()
         
         if not sites:
             return jsonify({'data': [], 'message': 'No hay sitios disponibles'}), 200
         
-        sites_json = [site.to_dict() for site in sites]
+        sites_json = SiteService.sites_to_dict(sites)
         return jsonify({'data': sites_json}), 200
         
     except Exception as e:
         return jsonify({'error': 'Error obteniendo sitios recientes', 'detail': str(e)}), 500
 
 @sitesAPI_blueprint.route("/top-ranked", methods=["GET"])
+@cached_response(scopes=('sites', 'reviews'))
 def top_ranked():
     """
     Obtiene los 4 sitios mejores calificados (mayor promedio de reseñas aprobadas).
@@ -471,34 +551,22 @@ def top_ranked():
     try:
         limit = request.args.get('limit', 4, type=int)
         
-        from core.models.Review import Review
-        from sqlalchemy import func
-        
-        avg_rating_subquery = db.session.query(
-            Review.site_id,
-            func.avg(Review.rating).label('avg_rating'),
-            func.count(Review.id).label('review_count')
-        ).filter(
-            Review.status == 'Aprobada'
-        ).group_by(
-            Review.site_id
-        ).subquery()
-        
-        sites = db.session.query(Site, avg_rating_subquery.c.avg_rating)\
-            .join(avg_rating_subquery, Site.id == avg_rating_subquery.c.site_id)\
+        # Lectura directa del agregado materializado (índice por promedio)
+        sites = db.session.query(Site)\
+            .join(SiteRating, SiteRating.site_id == Site.id)\
             .filter(
                 Site.active == True,
                 Site.deleted == False,
-                avg_rating_subquery.c.review_count > 0  # Al menos 1 reseña
+                SiteRating.reviews_count > 0  # Al menos 1 reseña
             )\
-            .order_by(avg_rating_subquery.c.avg_rating.desc())\
+            .order_by(SiteRating.rating_average.desc(), SiteRating.reviews_count.desc())\
             .limit(limit)\
             .all()
         
         if not sites:
             return jsonify({'data': [], 'message': 'No hay sitios con reseñas disponibles'}), 200
         
-        sites_json = [site.to_dict() for site, _ in sites]
+        sites_json = SiteService.sites_to_dict(sites)
         
         return jsonify({'data': sites_json}), 200
         
@@ -507,3 +575,53 @@ def top_ranked():
         import traceback
         traceback.print_exc()
         return jsonify({'error': 'Error obteniendo sitios mejor calificados', 'detail': str(e)}), 500
+
+
+@sitesAPI_blueprint.route("/map", methods=["GET"])
+@cached_response(scopes=('sites',))
+def map_clusters():
+    """
+    Sitios de un viewport del mapa, agrupados del lado del servidor.
+
+    Query params:
+        - bbox: min_lng,min_lat,max_lng,max_lat (obligatorio)
+        - zoom: nivel de zoom del mapa (0-22, default: 5)
+
+    Returns:
+        JSON con una lista de clusters {lat, lng, count, id, name};
+        id y name vienen solo cuando el cluster es un único sitio.
+    """
+    try:
+        bbox = [float(value) for value in request.args.get('bbox', '').split(',')]
+        min_lng, min_lat, max_lng, max_lat = bbox
+    except ValueError:
+        return jsonify({'error': 'bbox debe ser min_lng,min_lat,max_lng,max_lat'}), 400
+    # float() acepta nan e inf: no son coordenadas
+    if not all(math.isfinite(value) for value in bbox):
+        return jsonify({'error': 'bbox debe tener valores finitos'}), 400
+    # Un viewport puede exceder el mundo (zoom bajo): se recorta a coordenadas válidas
+    min_lng, max_lng = max(min_lng, -180.0), min(max_lng, 180.0)
+    min_lat, max_lat = max(min_lat, -90.0), min(max_lat, 90.0)
+    if min_lng > max_lng or min_lat > max_lat:
+        return jsonify({'error': 'bbox inválido'}), 400
+    zoom = request.args.get('zoom', 5, type=int)
+
+    clusters = MapService.clusters(min_lng, min_lat, max_lng, max_lat, zoom)
+    return jsonify({
+        'data': clusters,
+        'zoom': zoom,
+        'total': sum(cluster['count'] for cluster in clusters)
+    })
+
+
+@sitesAPI_blueprint.route("/tiles/<int:z>/<int:x>/<int:y>.mvt", methods=["GET"])
+@cached_response(scopes=('sites',))
+def map_tile(z, x, y):
+    """
+    Vector tile (Mapbox Vector Tile) con los sitios agrupados del tile z/x/y.
+    Capa 'sites' con propiedades count, id y name.
+    """
+    if not 0 <= z <= MAX_ZOOM or not (0 <= x < 2 ** z and 0 <= y < 2 ** z):
+        return jsonify({'error': 'Tile fuera de rango'}), 400
+
+    return Response(MapService.tile(z, x, y), mimetype='application/vnd.mapbox-vector-tile')
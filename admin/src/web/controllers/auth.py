@@ -74,6 +74,7 @@ def authenticate():
                 "first_name": user.first_name,
                 "last_name": user.last_name,
                 "avatar": user.avatar,
+                "avatar_thumb": user.avatar_thumb or user.avatar,
                 "role": user.role.name if user.role else None,
                 "is_admin": user.sysAdmin
             }
@@ -315,7 +316,8 @@ def me():
             "last_name": user.last_name,
             "role": user.role.name if user.role else None,
             "is_admin": user.sysAdmin,
-            "avatar": user.avatar
+            "avatar": user.avatar,
+            "avatar_thumb": user.avatar_thumb or user.avatar
         }), 200
         
     except Exception as e:
@@ -382,7 +384,8 @@ def register():
                 "email": new_user.email,
                 "first_name": new_user.first_name,
                 "last_name": new_user.last_name,
-                "avatar": new_user.avatar
+                "avatar": new_user.avatar,
+                "avatar_thumb": new_user.avatar_thumb or new_user.avatar
             }
         }), 201)
         
@@ -1,4 +1,4 @@
-from flask import Blueprint, flash, redirect, render_template, request, session, url_for
+from flask import Blueprint, flash, jsonify, redirect, render_template, request, session, url_for
 from core.services.flag_service import FlagService
 from core.services.user_service import UserService
 from web.handlers.auth import login_required,system_admin_required
@@ -70,3 +70,11 @@ def toggle(flag_id):
         flash("Ocurrió un error inesperado al cambiar el flag.", "error")
         
         return redirect(url_for("feature-flags.index"))
+
+
+@feature_flag_blueprint.get("/cache-stats")
+@login_required
+@system_admin_required
+def cache_stats():
+    """Métricas del cache de flags de este proceso (tasa de aciertos, recargas)"""
+    return jsonify(FlagService.cache_stats())
@@ -1,4 +1,4 @@
-from flask import Blueprint, render_template, request, redirect, url_for,session, flash,abort,Response
+from flask import Blueprint, render_template, request, redirect, url_for,session, flash,abort,Response,stream_with_context,jsonify
 from core.models.Site import Site
 from core.models.Tag import Tag
 from core.models.Audit import Audit
@@ -8,8 +8,9 @@ from geoalchemy2.elements import WKTElement
 from core.services.sites_service import SiteService
 from core.services.user_service import UserService
 from src.web.handlers.auth import login_required, require_role
-from src.web.utils.export import export_sites_to_csv, get_csv_filename
-from datetime import date
+from src.web.utils.export import iter_sites_csv, get_csv_filename, available_export_formats, EXPORT_FORMATS
+from core.services.export_service import ExportService
+from datetime import date, timedelta
 import json
 import logging
 
@@ -478,11 +479,23 @@ def edit(site_id):
         new_location = create_point_from_coords(latitude, longitude)
         
         location_changed = False
-        if new_location is not None and (site.location is None):
-            site.location = new_location
-            location_changed = True
-            #No deberia darse el caso en que site.location sea None pero por las dudas lo reviso
-            general_changes["location"] = {"old": site.location if site.location else "N/A", "new": new_location}
+        if new_location is not None:
+            # Se compara contra lat/lon ya calculados en SQL (Site.latitude/longitude)
+            new_coords = (
+                round(float(str(latitude).strip().replace(',', '.')), 7),
+                round(float(str(longitude).strip().replace(',', '.')), 7),
+            )
+            old_coords = (
+                (round(site.latitude, 7), round(site.longitude, 7))
+                if site.latitude is not None and site.longitude is not None else None
+            )
+            if new_coords != old_coords:
+                site.location = new_location
+                location_changed = True
+                general_changes["location"] = {
+                    "old": f"{old_coords[0]}, {old_coords[1]}" if old_coords else "N/A",
+                    "new": f"{new_coords[0]}, {new_coords[1]}"
+                }
 
         # Obtener tags como string separado por comas
         tags_str = request.form.get("tags", "")
@@ -811,6 +824,8 @@ def search():
             paginate=True,
             page=page,
             per_page=25,
+            # El total se reutiliza al cambiar de página (se invalida al editar sitios)
+            count_mode="cached",
         )
     sites = pagination["items"] if pagination else []
 
@@ -830,38 +845,13 @@ def search():
         hoy=date.today().isoformat()
     )
 
-@sites_blueprint.route("/export_csv", methods=["POST"])
-@login_required
-@require_role(['Administrador'])
-def export_csv():
+def _export_params_from_form():
     """
-    Exporta sitios históricos filtrados a formato CSV.
-    
-    Aplica los mismos filtros que la función de búsqueda pero exporta
-    todos los resultados (sin paginación) a un archivo CSV descargable.
-    
-    Filtros soportados (desde form data):
-    - site_name: Nombre del sitio
-    - city: Ciudad
-    - province: Provincia
-    - tags: Etiquetas asociadas
-    - registration_from/registration_to: Rango de fechas
-    - active: Estado activo
-    - state_id: Estado de conservación
-    - order_by: Campo de ordenamiento
-    - sentido: Dirección del ordenamiento
-    
+    Lee los filtros del formulario de exportación (los mismos del listado).
+
     Returns:
-        Response: Archivo CSV con headers apropiados para descarga
-        
-    Raises:
-        400: Si no hay datos para exportar
-        
-    Note:
-        Solo usuarios con rol 'Administrador' pueden exportar datos.
-        El archivo se genera con timestamp en el nombre.
+        tuple: (filtros para SiteService, order_by, sentido)
     """
-
     tags_raw = request.form.getlist("tags")
     tags = [int(t) for t in tags_raw if t and str(t).isdigit()]
 
@@ -880,8 +870,6 @@ def export_csv():
         "sentido": request.form.get("sentido", "asc"),
     }
 
-    # print("Filtros recibidos en export_csv:", filtros)
-
     state_id_raw = request.form.get("state_id", "")
     if state_id_raw and state_id_raw.isdigit():
         filtros["state_id"] = int(state_id_raw)
@@ -902,26 +890,113 @@ def export_csv():
     if state_id_raw and state_id_raw.isdigit():
         service_filters["state_id"] = int(state_id_raw)
 
-    sites = SiteService.get_sites_filtered(
+    return service_filters, filtros["order_by"], filtros["sentido"]
+
+
+@sites_blueprint.route("/export_csv", methods=["POST"])
+@login_required
+@require_role(['Administrador'])
+def export_csv():
+    """
+    Exporta sitios históricos filtrados a formato CSV.
+    
+    Aplica los mismos filtros que la función de búsqueda pero exporta
+    todos los resultados (sin paginación) a un archivo CSV descargable.
+    La respuesta se envía por fragmentos a medida que se leen las filas.
+    
+    Filtros soportados (desde form data):
+    - site_name: Nombre del sitio
+    - city: Ciudad
+    - province: Provincia
+    - tags: Etiquetas asociadas
+    - registration_from/registration_to: Rango de fechas
+    - active: Estado activo
+    - state_id: Estado de conservación
+    - order_by: Campo de ordenamiento
+    - sentido: Dirección del ordenamiento
+    
+    Returns:
+        Response: Archivo CSV con headers apropiados para descarga
+        
+    Raises:
+        400: Si no hay datos para exportar
+        
+    Note:
+        Solo usuarios con rol 'Administrador' pueden exportar datos.
+        El archivo se genera con timestamp en el nombre.
+    """
+
+    service_filters, order_by, sentido = _export_params_from_form()
+
+    rows = SiteService.get_sites_export_rows(
         filters=service_filters,
-        order_by=filtros["order_by"],
-        sorted_by=filtros["sentido"],
-        paginate=False,
+        order_by=order_by,
+        sorted_by=sentido,
     )
 
-    # print(f"Exportando {len(sites)} sitios con filtros: {filtros}")
-
-    if not sites:
+    # Solo se verifica que haya al menos un sitio; el resto se lee mientras se envía
+    if rows.limit(1).first() is None:
         return "No hay datos para exportar", 400
 
-    csv_content = export_sites_to_csv(sites)
     filename = get_csv_filename()
     return Response(
-        csv_content,
+        stream_with_context(iter_sites_csv(rows)),
         mimetype="text/csv; charset=utf-8",
         headers={"Content-Disposition": f"attachment; filename={filename}"}
     )
 
+def _fail_stale_export_jobs():
+    # Trabajos de un worker que se detuvo: se marcan como fallidos en vez de quedar en curso
+    ExportService.fail_stale_jobs(timedelta(seconds=current_app.config["EXPORT_JOB_TIMEOUT"]))
+
+
+@sites_blueprint.route("/export_jobs", methods=["POST"])
+@login_required
+@require_role(['Administrador'])
+def create_export_job():
+    """
+    Crea una exportación en segundo plano con los filtros del listado.
+
+    Form data: los mismos filtros que export_csv, más `format`
+    ('csv', 'csv.gz', 'ndjson' o 'parquet').
+
+    Returns:
+        202 con el trabajo y la URL para consultar su estado; 400 si el formato no es válido.
+    """
+    fmt = request.form.get("format", "csv")
+    if fmt not in available_export_formats():
+        return jsonify({"error": f"Formato no soportado. Opciones: {', '.join(available_export_formats())}"}), 400
+
+    service_filters, order_by, sentido = _export_params_from_form()
+    _fail_stale_export_jobs()
+    job = ExportService.create_job(session.get("user_id"), fmt, service_filters, order_by, sentido)
+    current_app.export_worker.submit(job.id)
+
+    return jsonify({
+        "job": job.to_dict(),
+        "status_url": url_for("sites.export_job_status", job_id=job.id),
+    }), 202
+
+
+@sites_blueprint.route("/export_jobs/<job_id>", methods=["GET"])
+@login_required
+@require_role(['Administrador'])
+def export_job_status(job_id):
+    """
+    Estado y progreso de una exportación del usuario actual.
+    Cuando terminó, incluye una URL firmada de descarga.
+    """
+    _fail_stale_export_jobs()
+    job = ExportService.get_job(job_id, user_id=session.get("user_id"))
+    if job is None:
+        return jsonify({"error": "Exportación no encontrada"}), 404
+
+    data = job.to_dict()
+    extension, _ = EXPORT_FORMATS[job.format]
+    created = job.created_at.strftime("%Y%m%d_%H%M") if job.created_at else job.id
+    data["download_url"] = ExportService.download_url(job, f"sitios_{created}.{extension}")
+    return jsonify(data), 200
+
 @sites_blueprint.route("/<int:site_id>/images/add", methods=["POST"])
 @login_required
 @require_role(['Administrador', 'Editor'])
@@ -0,0 +1,92 @@
+import logging
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+
+from core.database import db
+from core.services.export_service import ExportService
+from core.services.sites_service import SiteService, UPLOAD_PART_SIZE
+from src.web.utils.export import EXPORT_FORMATS, write_sites_export
+
+logger = logging.getLogger(__name__)
+
+# Archivos más chicos que esto se generan en memoria; los más grandes, en disco
+SPOOL_MAX_SIZE = 8 * 1024 * 1024
+
+
+class ExportWorker:
+    """
+    Pool local de hilos (por proceso) que genera las exportaciones de sitios.
+
+    El request solo crea el ExportJob y encola su id; el hilo lee las filas con un
+    cursor del servidor, escribe el archivo en un temporal, lo sube a MinIO y
+    actualiza el progreso. No requiere broker externo.
+    """
+
+    def __init__(self, app=None):
+        self._app = None
+        self._executor = None
+        self.max_workers = 2
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self._app = app
+        self.max_workers = app.config.get("EXPORT_WORKERS", self.max_workers)
+        app.export_worker = self
+        return app
+
+    def submit(self, job_id: str):
+        """Encola la generación del archivo y vuelve de inmediato."""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="export")
+        return self._executor.submit(self.run, job_id)
+
+    def run(self, job_id: str):
+        """Genera el archivo de un trabajo (se puede llamar directo, ej. en tests)."""
+        with self._app.app_context():
+            try:
+                self._run(job_id)
+            except Exception as e:
+                logger.error(f"Error en la exportación {job_id}: {e}", exc_info=True)
+                ExportService.mark_failed(job_id, str(e))
+            finally:
+                db.session.remove()
+
+    def _run(self, job_id: str):
+        job = ExportService.get_job(job_id)
+        if job is None or job.is_finished:
+            return
+        extension, content_type = EXPORT_FORMATS[job.format]
+        object_name = ExportService.object_name_for(job, extension)
+
+        rows = SiteService.get_sites_export_rows(
+            filters=dict(job.filters or {}), order_by=job.order_by, sorted_by=job.sorted_by
+        )
+        ExportService.mark_running(job_id, rows.order_by(None).count())
+
+        written = 0
+
+        def on_progress(done):
+            nonlocal written
+            written = done
+            ExportService.update_job(job_id, rows_done=done)
+
+        with tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_SIZE) as output:
+            write_sites_export(rows, output, job.format, on_progress=on_progress)
+            # Fin de la lectura: libera el cursor antes de subir el archivo
+            db.session.rollback()
+
+            size = output.tell()
+            output.seek(0)
+            self._app.storage.put_object(
+                bucket_name=self._app.config["MINIO_BUCKET"],
+                object_name=object_name,
+                data=output,
+                length=size,
+                content_type=content_type,
+                part_size=UPLOAD_PART_SIZE,
+            )
+        ExportService.mark_done(job_id, object_name, size, written)
+
+
+export_worker = ExportWorker()
@@ -1,6 +1,6 @@
 from functools import wraps
 from flask import session, redirect, url_for, flash, abort
-from src.core.services.role_service import RoleService;
+from core.services.role_service import RoleService;
 
 def is_authenticated(session):
     return session.get("user") is not None
@@ -19,6 +19,9 @@ def login_required(f):
 
 
 def require_role(allowed_roles):
+    # Se arma el set una sola vez, al decorar
+    allowed_roles = frozenset(allowed_roles)
+
     def decorator(f):
         @wraps(f)
         def decorated_function(*args, **kwargs):
@@ -55,7 +58,5 @@ def is_granted(session, perm):
     if(session.get("is_admin")):
         return True;
 
-    role = RoleService.getRole(session.get("role_name"));
-    permissions = RoleService.getPermissions(role.id);
-
-    return perm in permissions;
\ No newline at end of file
+    # Set de nombres de permisos cacheado por rol
+    return perm in RoleService.getPermissionNames(session.get("role_name"));
\ No newline at end of file
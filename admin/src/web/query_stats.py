@@ -0,0 +1,143 @@
+import json
+import logging
+import re
+import time
+from collections import Counter, defaultdict
+
+from flask import g, has_request_context, request
+from sqlalchemy import event
+
+from core.database import db
+
+logger = logging.getLogger(__name__)
+
+# Listas de parámetros de largo variable (IN expandido) y literales numéricos
+_PARAM_LIST = re.compile(r"\(\s*%\(\w+\)s(?:\s*,\s*%\(\w+\)s)*\s*\)")
+_NUMBER = re.compile(r"\b\d+(?:\.\d+)?\b")
+_SPACES = re.compile(r"\s+")
+
+
+def statement_shape(statement: str) -> str:
+    """
+    Forma de una sentencia: la misma consulta con distintos parámetros tiene la misma forma.
+    Sirve para detectar N+1 (la misma forma repetida muchas veces en un request).
+    """
+    shape = _SPACES.sub(" ", statement).strip()
+    shape = _PARAM_LIST.sub("(?)", shape)
+    return _NUMBER.sub("?", shape)
+
+
+def repeated_shapes(statements, threshold: int) -> list:
+    """
+    Formas que se repiten al menos `threshold` veces.
+
+    Args:
+        statements: iterable de (sentencia, duración en ms)
+        threshold (int): repeticiones a partir de las que se reporta
+
+    Returns:
+        list: [{'shape', 'count', 'total_ms'}] de mayor a menor cantidad
+    """
+    counts, durations = Counter(), defaultdict(float)
+    for statement, duration in statements:
+        shape = statement_shape(statement)
+        counts[shape] += 1
+        durations[shape] += duration
+    return [
+        {'shape': shape, 'count': count, 'total_ms': round(durations[shape], 2)}
+        for shape, count in counts.most_common()
+        if count >= threshold
+    ]
+
+
+class QueryStats:
+    """
+    Instrumentación de las consultas SQL de cada request sobre el engine de `core.database.db`.
+
+    Por request registra cantidad de sentencias, tiempo total en la base, las más lentas
+    y las formas repetidas (patrones N+1, ej: una consulta por sitio al serializar). Lo expone en:
+    - el header `Server-Timing` (visible en las herramientas de desarrollo del navegador;
+      QUERY_STATS_ENABLED, por defecto en debug),
+    - el panel de depuración de las plantillas del admin (QUERY_STATS_PANEL, por defecto en debug),
+    - el log, como JSON: warning si hay N+1 o el request supera QUERY_STATS_SLOW_MS; si no, debug.
+    """
+
+    def __init__(self, app=None):
+        self.enabled = False
+        self.panel = False
+        self.slow_ms = 200
+        self.n_plus_one_threshold = 5
+        self.top = 5
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.enabled = app.config.get("QUERY_STATS_ENABLED", app.debug)
+        self.panel = app.config.get("QUERY_STATS_PANEL", app.debug)
+        self.slow_ms = app.config.get("QUERY_STATS_SLOW_MS", self.slow_ms)
+        self.n_plus_one_threshold = app.config.get("QUERY_STATS_N_PLUS_ONE", self.n_plus_one_threshold)
+        self.top = app.config.get("QUERY_STATS_TOP", self.top)
+        app.query_stats = self
+        app.jinja_env.globals.update(query_stats_panel=self.panel_data)
+        if not self.enabled:
+            return app
+
+        with app.app_context():
+            engine = db.engine
+        event.listen(engine, "before_cursor_execute", self._before_execute)
+        event.listen(engine, "after_cursor_execute", self._after_execute)
+        app.after_request(self._after_request)
+        return app
+
+    # --- Eventos del engine ---
+    def _before_execute(self, conn, cursor, statement, parameters, context, executemany):
+        context._query_stats_start = time.perf_counter()
+
+    def _after_execute(self, conn, cursor, statement, parameters, context, executemany):
+        # Solo se registran las sentencias del request (no hilos en segundo plano ni la CLI)
+        if has_request_context():
+            duration = (time.perf_counter() - context._query_stats_start) * 1000
+            g.setdefault("query_stats", []).append((statement, duration))
+
+    # --- Resumen del request ---
+    def summary(self) -> dict:
+        """Resumen de las sentencias ejecutadas hasta ahora en el request actual."""
+        statements = g.get("query_stats", []) if has_request_context() else []
+        slowest = sorted(statements, key=lambda item: item[1], reverse=True)[:self.top]
+        return {
+            'count': len(statements),
+            'total_ms': round(sum(duration for _, duration in statements), 2),
+            'slowest': [
+                {'statement': _SPACES.sub(" ", statement)[:500], 'ms': round(duration, 2)}
+                for statement, duration in slowest
+            ],
+            'repeated': repeated_shapes(statements, self.n_plus_one_threshold),
+        }
+
+    def panel_data(self):
+        """Datos para el panel de depuración (None si está desactivado)."""
+        if not (self.enabled and self.panel):
+            return None
+        return self.summary()
+
+    def _after_request(self, response):
+        stats = self.summary()
+        timing = f'db;dur={stats["total_ms"]};desc="{stats["count"]} queries"'
+        existing = response.headers.get("Server-Timing")
+        response.headers["Server-Timing"] = f"{existing}, {timing}" if existing else timing
+
+        problem = stats["repeated"] or stats["total_ms"] >= self.slow_ms
+        level = logging.WARNING if problem else logging.DEBUG
+        if logger.isEnabledFor(level):
+            logger.log(level, json.dumps({
+                'event': 'request_queries',
+                'method': request.method,
+                'path': request.path,
+                'endpoint': request.endpoint,
+                'status': response.status_code,
+                **stats,
+            }, ensure_ascii=False))
+        return response
+
+
+query_stats = QueryStats()
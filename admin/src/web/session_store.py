@@ -0,0 +1,49 @@
+import logging
+
+from flask_session import Session
+
+from core.database import db
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SECRET_KEY = 'secret_key'
+
+server_session = Session()
+
+
+def init_session(app):
+    """
+    Configura el almacenamiento de la sesión según SESSION_BACKEND.
+
+    - cookie: la sesión viaja firmada (SECRET_KEY) en la cookie; leerla no toca
+      disco ni red. Alcanza para lo que guardamos (user_id, is_admin, role_name...).
+    - sqlalchemy: tabla `sessions` en la base (búsqueda por session_id indexado);
+      los vencidos se borran cada ~SESSION_CLEANUP_N_REQUESTS requests o con
+      `flask session_cleanup` si no se configura.
+    - redis: servidor compatible con Redis (SESSION_REDIS_URL); vencen por TTL.
+    - filesystem: el almacenamiento anterior, solo para un único proceso.
+    """
+    backend = app.config.get("SESSION_BACKEND", "cookie")
+
+    if backend == "cookie":
+        if app.config.get("SECRET_KEY") == DEFAULT_SECRET_KEY and not (app.debug or app.testing):
+            raise RuntimeError("SESSION_BACKEND=cookie requiere definir SECRET_KEY en producción")
+        # Interfaz por defecto de Flask (SecureCookieSessionInterface)
+        return app
+
+    if backend == "sqlalchemy":
+        app.config["SESSION_TYPE"] = "sqlalchemy"
+        app.config["SESSION_SQLALCHEMY"] = db
+    elif backend == "redis":
+        import redis
+
+        app.config["SESSION_TYPE"] = "redis"
+        app.config["SESSION_REDIS"] = redis.Redis.from_url(app.config["SESSION_REDIS_URL"])
+    elif backend == "filesystem":
+        app.config["SESSION_TYPE"] = "filesystem"
+    else:
+        raise ValueError(f"SESSION_BACKEND desconocido: {backend}")
+
+    server_session.init_app(app)
+    logger.info(f"Sesiones del lado del servidor en {backend}")
+    return app
@@ -1,55 +1,187 @@
 import csv
+import gzip
+import io
+import json
 from datetime import datetime
 from io import StringIO
 
-def export_sites_to_csv(sites):
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # Parquet es opcional: sin pyarrow solo se ofrecen CSV y NDJSON
+    pa = None
+
+# Columnas mínimas requeridas
+FIELDNAMES = [
+    "ID",
+    "Nombre",
+    "Descripción Breve",
+    "Ciudad",
+    "Provincia",
+    "Estado de Conservación",
+    "Fecha de Registro",
+    "Latitud",
+    "Longitud",
+    "Tags",
+]
+
+# Filas acumuladas antes de enviar un fragmento de la respuesta
+ROWS_PER_CHUNK = 500
+
+
+def _site_row(row):
+    """Convierte una fila de SiteService.get_sites_export_rows en los valores del CSV."""
+    return [
+        row.id,
+        row.site_name,
+        row.short_desc,
+        row.city,
+        row.province,
+        row.state_name or "",
+        row.registration.strftime("%Y-%m-%d %H:%M:%S") if row.registration else "",
+        row.latitude,
+        row.longitude,
+        f"[{row.tags}]" if row.tags else "",
+    ]
+
+
+def iter_sites_csv(rows, rows_per_chunk=ROWS_PER_CHUNK):
     """
-    Exporta sitios históricos a formato CSV según los requisitos del enunciado.
+    Genera el CSV de sitios por fragmentos, sin armar el archivo completo en memoria.
+
+    El primer fragmento (BOM + encabezado) se produce antes de leer filas, así la
+    respuesta empieza a enviarse apenas arranca la consulta.
+
+    Args:
+        rows: iterable de filas de SiteService.get_sites_export_rows
+        rows_per_chunk (int): filas por fragmento emitido
     """
-    output = StringIO()
-
-    # Definir columnas mínimas requeridas
-    fieldnames = [
-        "ID",
-        "Nombre",
-        "Descripción Breve",
-        "Ciudad",
-        "Provincia",
-        "Estado de Conservación",
-        "Fecha de Registro",
-        "Latitud",
-        "Longitud",
-        "Tags",
-    ]
+    buffer = StringIO()
+    writer = csv.writer(buffer, delimiter=",")
 
-    writer = csv.DictWriter(output, fieldnames=fieldnames, delimiter=",")
-    writer.writeheader()
-
-    for site in sites:
-        tags_str = f"[{', '.join(assoc.tag.name for assoc in site.tag_associations)}]" if site.tag_associations else ""
-
-        writer.writerow(
-            {
-                "ID": site.id,
-                "Nombre": site.site_name,
-                "Descripción Breve": site.short_desc,
-                "Ciudad": site.city,
-                "Provincia": site.province,
-                "Estado de Conservación": site.state.name if site.state else "",
-                "Fecha de Registro": (
-                    site.registration.strftime("%Y-%m-%d %H:%M:%S")
-                    if site.registration
-                    else ""
-                ),
-                "Latitud": site.latitude,
-                "Longitud": site.longitude,
-                "Tags": tags_str
-            }
-        )
     # "\ufeff" es denominado BOM y es utilizado para que excel detecte correctamente la codificación
-    content = "\ufeff" + output.getvalue()
-    output.close()
-    return content
+    buffer.write("\ufeff")
+    writer.writerow(FIELDNAMES)
+    yield buffer.getvalue()
+    buffer.seek(0)
+    buffer.truncate()
+
+    pending = 0
+    for row in rows:
+        writer.writerow(_site_row(row))
+        pending += 1
+        if pending >= rows_per_chunk:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+            pending = 0
+    if pending:
+        yield buffer.getvalue()
+    buffer.close()
+
+
+def export_sites_to_csv(rows):
+    """
+    Exporta sitios históricos a formato CSV según los requisitos del enunciado.
+    Devuelve el archivo completo; para respuestas HTTP usar iter_sites_csv.
+    """
+    return "".join(iter_sites_csv(rows))
+
+
+# Formatos de exportación en segundo plano: extensión y content-type del archivo
+EXPORT_FORMATS = {
+    "csv": ("csv", "text/csv; charset=utf-8"),
+    "csv.gz": ("csv.gz", "application/gzip"),
+    "ndjson": ("ndjson", "application/x-ndjson"),
+    "parquet": ("parquet", "application/vnd.apache.parquet"),
+}
+
+
+def available_export_formats():
+    """Formatos soportados en este entorno (Parquet requiere pyarrow)."""
+    return [fmt for fmt in EXPORT_FORMATS if fmt != "parquet" or pa is not None]
+
+
+def _site_record(row):
+    """Fila de exportación como dict (NDJSON y Parquet)."""
+    return {
+        "id": row.id,
+        "name": row.site_name,
+        "short_desc": row.short_desc,
+        "city": row.city,
+        "province": row.province,
+        "state": row.state_name,
+        "registration": row.registration.isoformat() if row.registration else None,
+        "latitude": row.latitude,
+        "longitude": row.longitude,
+        "tags": row.tags.split(", ") if row.tags else [],
+    }
+
+
+def _counted(rows, on_progress, every):
+    """Recorre las filas avisando el progreso cada `every` filas y al final."""
+    done = 0
+    for row in rows:
+        yield row
+        done += 1
+        if on_progress and done % every == 0:
+            on_progress(done)
+    if on_progress:
+        on_progress(done)
+
+
+def write_sites_export(rows, fileobj, fmt, on_progress=None, progress_every=ROWS_PER_CHUNK * 10):
+    """
+    Escribe la exportación de sitios en un archivo binario, leyendo las filas una vez.
+
+    Args:
+        rows: iterable de filas de SiteService.get_sites_export_rows
+        fileobj: archivo binario de destino (no se cierra)
+        fmt (str): uno de EXPORT_FORMATS
+        on_progress (callable): recibe la cantidad de filas escritas hasta el momento
+        progress_every (int): cada cuántas filas se informa el progreso
+    """
+    if fmt not in available_export_formats():
+        raise ValueError(f"Formato de exportación no soportado: {fmt}")
+    rows = _counted(rows, on_progress, progress_every)
+
+    if fmt == "parquet":
+        schema = pa.schema([
+            ("id", pa.int64()),
+            ("name", pa.string()),
+            ("short_desc", pa.string()),
+            ("city", pa.string()),
+            ("province", pa.string()),
+            ("state", pa.string()),
+            ("registration", pa.string()),
+            ("latitude", pa.float64()),
+            ("longitude", pa.float64()),
+            ("tags", pa.list_(pa.string())),
+        ])
+        with pq.ParquetWriter(fileobj, schema) as writer:
+            batch = []
+            for row in rows:
+                batch.append(_site_record(row))
+                if len(batch) >= progress_every:
+                    writer.write_table(pa.Table.from_pylist(batch, schema=schema))
+                    batch = []
+            if batch:
+                writer.write_table(pa.Table.from_pylist(batch, schema=schema))
+        return
+
+    target = gzip.GzipFile(fileobj=fileobj, mode="wb") if fmt == "csv.gz" else fileobj
+    text = io.TextIOWrapper(target, encoding="utf-8", newline="")
+    if fmt == "ndjson":
+        for row in rows:
+            text.write(json.dumps(_site_record(row), ensure_ascii=False))
+            text.write("\n")
+    else:
+        for chunk in iter_sites_csv(rows):
+            text.write(chunk)
+    text.flush()
+    text.detach()
+    if target is not fileobj:
+        target.close()
 
 
 def get_csv_filename():
@@ -0,0 +1,73 @@
+import hashlib
+from functools import wraps
+
+from flask import Response, current_app, make_response, request
+
+from core.utils import data_version
+from core.utils.presigned_urls import rotation_epoch
+
+
+def _cache_key():
+    """Endpoint + argumentos de la URL (en orden estable)."""
+    args = sorted((key, value) for key, values in request.args.lists() for value in values)
+    view_args = sorted((request.view_args or {}).items())
+    return (request.endpoint, tuple(view_args), tuple(args))
+
+
+def _etag(key, versions) -> str:
+    return hashlib.sha1(repr((key, versions)).encode("utf-8")).hexdigest()
+
+
+def cached_response(scopes, max_age=60, stale_while_revalidate=300):
+    """
+    Cachea respuestas GET públicas con ETag fuerte derivado de las versiones de datos
+    y de la época de rotación de las URLs presignadas (los cuerpos pueden incluir URLs
+    de imágenes que vencen: al rotar cambia el ETag y se generan con URLs nuevas).
+
+    - If-None-Match con el ETag vigente: 304 sin ejecutar la vista.
+    - El cuerpo generado para ese ETag se guarda en `current_app.cache` (compartido
+      entre workers según CACHE_BACKEND), con los scopes como tags; solo un worker
+      lo genera cuando vence (single-flight).
+    - Solo se cachean respuestas 200; la vista no debe depender del usuario.
+
+    Args:
+        scopes (tuple): ámbitos de core.utils.data_version de los que depende la respuesta
+        max_age (int): segundos que el cliente/CDN puede reutilizarla sin revalidar
+        stale_while_revalidate (int): segundos extra en que puede servirla vencida mientras revalida
+    """
+    scopes = tuple(scopes)
+    cache_control = f"public, max-age={max_age}, stale-while-revalidate={stale_while_revalidate}"
+    ttl = max_age + stale_while_revalidate
+
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            if request.method != "GET":
+                return view(*args, **kwargs)
+
+            etag = _etag(_cache_key(), (data_version.current(scopes), rotation_epoch()))
+
+            if request.if_none_match.contains_weak(etag):
+                response = Response(status=304)
+            else:
+                uncached = None
+
+                def render():
+                    nonlocal uncached
+                    response = make_response(view(*args, **kwargs))
+                    if response.status_code != 200 or response.is_streamed:
+                        uncached = response
+                        return None
+                    return (response.get_data(), response.status_code, response.mimetype)
+
+                cached = current_app.cache.get_or_set(f"http:{etag}", render, ttl=ttl, tags=scopes)
+                if cached is None:
+                    return uncached
+                body, status, mimetype = cached
+                response = Response(body, status=status, mimetype=mimetype)
+
+            response.set_etag(etag)
+            response.headers["Cache-Control"] = cache_control
+            return response
+        return wrapper
+    return decorator
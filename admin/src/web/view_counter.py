@@ -0,0 +1,123 @@
+import atexit
+import logging
+import threading
+from collections import Counter
+
+from sqlalchemy import bindparam, func, update
+
+from core.database import db
+from core.models.Site import Site
+from core.utils import data_version
+
+logger = logging.getLogger(__name__)
+
+
+class ViewCounter:
+    """
+    Buffer en memoria (por proceso) para el contador de vistas de los sitios.
+
+    En lugar de hacer `site.views += 1` y un commit por cada visita, las visitas
+    se acumulan por sitio y se vuelcan en un único lote de
+    `UPDATE sites SET views = views + n`, cuando se supera un umbral de visitas
+    pendientes o cada cierto intervalo (hilo en segundo plano).
+    El retraso máximo de `views` en la base es de FLUSH_INTERVAL segundos.
+    """
+
+    def __init__(self, app=None):
+        self._app = None
+        self._pending = Counter()
+        self._pending_total = 0
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._thread = None
+        self._atexit_registered = False
+        self.flush_interval = 10
+        self.flush_threshold = 100
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self._app = app
+        self.flush_interval = app.config.get("VIEW_COUNTER_FLUSH_INTERVAL", self.flush_interval)
+        self.flush_threshold = app.config.get("VIEW_COUNTER_FLUSH_THRESHOLD", self.flush_threshold)
+        app.view_counter = self
+        # Al apagar el proceso no se pierden las visitas pendientes
+        # (una sola vez, aunque se llame a create_app varias veces, ej: en los tests)
+        if not self._atexit_registered:
+            atexit.register(self.flush)
+            self._atexit_registered = True
+        return app
+
+    def increment(self, site_id: int, amount: int = 1):
+        """Registra una visita (no toca la base de datos)."""
+        with self._lock:
+            self._pending[site_id] += amount
+            self._pending_total += amount
+            total = self._pending_total
+        self._ensure_worker()
+        if total >= self.flush_threshold:
+            # Se despierta al hilo para que vuelque fuera del request
+            self._wakeup.set()
+
+    def pending(self, site_id: int) -> int:
+        """Visitas de un sitio aún no volcadas a la base."""
+        with self._lock:
+            return self._pending.get(site_id, 0)
+
+    def flush(self) -> int:
+        """
+        Vuelca las visitas acumuladas en un solo lote de UPDATE atómicos.
+        Si falla, las visitas se devuelven al buffer para el próximo intento.
+
+        Returns:
+            int: cantidad de sitios actualizados
+        """
+        if self._app is None:
+            return 0
+        with self._flush_lock:
+            with self._lock:
+                batch, self._pending = self._pending, Counter()
+                self._pending_total = 0
+            if not batch:
+                return 0
+
+            # Orden fijo por id para evitar deadlocks entre procesos
+            rows = [{"b_id": site_id, "b_views": amount} for site_id, amount in sorted(batch.items())]
+            sites = Site.__table__
+            stmt = update(sites)\
+                .where(sites.c.id == bindparam("b_id"))\
+                .values(views=func.coalesce(sites.c.views, 0) + bindparam("b_views"))
+            try:
+                with self._app.app_context():
+                    with db.engine.begin() as conn:
+                        conn.execute(stmt, rows)
+                        # Invalida las respuestas cacheadas que dependen de las vistas
+                        conn.execute(data_version.bump_statement({"views"}))
+            except Exception as e:
+                logger.error(f"Error volcando contador de vistas: {e}")
+                with self._lock:
+                    self._pending.update(batch)
+                    self._pending_total += sum(batch.values())
+                return 0
+            data_version.forget({"views"})
+            return len(rows)
+
+    def _ensure_worker(self):
+        """Inicia (una sola vez por proceso) el hilo que vuelca periódicamente."""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._thread = threading.Thread(target=self._run, name="view-counter-flush", daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        while True:
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            self.flush()
+
+
+view_counter = ViewCounter()
@@ -0,0 +1,55 @@
+import threading
+from contextlib import contextmanager
+
+import pytest
+from sqlalchemy import event
+
+from core.database import db
+from src.web.query_stats import repeated_shapes
+
+
+@pytest.fixture
+def query_budget():
+    """
+    Limita las sentencias SQL que ejecuta el hilo del test dentro del bloque,
+    sobre el engine de la app.
+
+        with query_budget(app, 3):
+            client.get("/api/sites/")
+
+    Falla si se supera `max_queries` o si una misma forma de sentencia se repite
+    `max_repeated` veces o más (N+1); el mensaje lista las sentencias. Las de otros
+    hilos (ej: workers de exportación) no cuentan.
+
+    El bloque recibe la lista de (sentencia, duración) registradas, para comparar
+    cantidades entre bloques:
+
+        with query_budget(app, 6) as statements:
+            SiteService.sites_to_dict(page)
+    """
+    @contextmanager
+    def budget(app, max_queries, max_repeated=None):
+        statements = []
+        thread_id = threading.get_ident()
+        with app.app_context():
+            engine = db.engine
+
+        def record(conn, cursor, statement, parameters, context, executemany):
+            if threading.get_ident() == thread_id:
+                statements.append((statement, 0.0))
+
+        event.listen(engine, "before_cursor_execute", record)
+        try:
+            yield statements
+        finally:
+            event.remove(engine, "before_cursor_execute", record)
+
+        listing = "\n".join(f"  {statement}" for statement, _ in statements)
+        assert len(statements) <= max_queries, (
+            f"{len(statements)} sentencias SQL (presupuesto: {max_queries}):\n{listing}"
+        )
+        if max_repeated is not None:
+            repeated = repeated_shapes(statements, max_repeated)
+            assert not repeated, f"Sentencias repetidas (N+1): {repeated}"
+
+    return budget
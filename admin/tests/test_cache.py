@@ -0,0 +1,188 @@
+import fnmatch
+import os
+import threading
+import time
+
+import pytest
+
+from core.utils.cache import Cache, FileBackend, MemoryBackend, RedisBackend
+
+
+class FakeRedis:
+    """Subconjunto del cliente de redis-py: valores en bytes, INCR en texto como el servidor."""
+
+    def __init__(self):
+        self._data = {}
+        self._expires = {}
+        self._lock = threading.Lock()
+
+    def _alive(self, key):
+        if key in self._expires and self._expires[key] <= time.monotonic():
+            self._data.pop(key, None)
+            self._expires.pop(key, None)
+        return self._data.get(key)
+
+    def get(self, key):
+        with self._lock:
+            return self._alive(key)
+
+    def mget(self, keys):
+        with self._lock:
+            return [self._alive(key) for key in keys]
+
+    def set(self, key, value, nx=False, ex=None):
+        with self._lock:
+            if nx and self._alive(key) is not None:
+                return None
+            self._data[key] = value
+            self._expires.pop(key, None)
+            if ex:
+                self._expires[key] = time.monotonic() + ex
+            return True
+
+    def delete(self, *keys):
+        with self._lock:
+            for key in keys:
+                self._data.pop(key, None)
+
+    def incr(self, key):
+        with self._lock:
+            value = int(self._alive(key) or 0) + 1
+            self._data[key] = str(value).encode()
+            return value
+
+    def scan_iter(self, match="*", count=None):
+        with self._lock:
+            return [key for key in list(self._data) if fnmatch.fnmatchcase(key, match)]
+
+
+@pytest.fixture(params=["memory", "file", "redis"])
+def cache(request, tmp_path):
+    cache = Cache()
+    if request.param == "file":
+        cache.backend = FileBackend(str(tmp_path))
+    elif request.param == "redis":
+        cache.backend = RedisBackend(client=FakeRedis())
+    else:
+        cache.backend = MemoryBackend()
+    return cache
+
+
+def test_set_get_and_ttl(cache):
+    cache.set("home", {"data": [1, 2]}, ttl=1)
+    assert cache.get("home") == {"data": [1, 2]}
+    time.sleep(1.1)
+    assert cache.get("home") is None
+
+
+def test_namespaces_do_not_collide(cache):
+    other = Cache()
+    other.backend = cache.backend
+    other.namespace = "otro"
+    cache.set("key", "a")
+    other.set("key", "b")
+    assert cache.get("key") == "a"
+    assert other.get("key") == "b"
+
+
+def test_invalidate_tags(cache):
+    cache.set("most_visited", "sitios", tags=("sites", "views"))
+    cache.set("tags", "etiquetas", tags=("tags",))
+    cache.invalidate_tags(["views"])
+    assert cache.get("most_visited") is None
+    assert cache.get("tags") == "etiquetas"
+
+    # Las entradas nuevas se guardan con la versión vigente del tag
+    cache.set("most_visited", "sitios nuevos", tags=("sites", "views"))
+    assert cache.get("most_visited") == "sitios nuevos"
+    cache.invalidate_tags(["views"])
+    assert cache.get("most_visited") is None
+
+
+def test_clear_only_touches_its_namespace(cache):
+    other = Cache()
+    other.backend = cache.backend
+    other.namespace = "otro"
+    cache.set("key", "a")
+    other.set("key", "b")
+    cache.clear()
+    assert cache.get("key") is None
+    assert other.get("key") == "b"
+
+
+def test_memory_lru_does_not_evict_tag_versions():
+    cache = Cache()
+    cache.backend = MemoryBackend(max_entries=2)
+    cache.set("home", "viejo", tags=("sites",))
+    cache.invalidate_tags(["sites"])
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.backend.set(cache._key("home"), ("viejo", {"sites": 0}))
+    assert cache.get("home") is None
+
+
+def test_local_locks_are_released(cache):
+    for index in range(50):
+        cache.get_or_set(f"http:etag-{index}", lambda: "valor")
+    assert cache._local_locks == {}
+
+
+def test_get_or_set_is_single_flight(cache):
+    calls = []
+    start = threading.Barrier(8)
+
+    def compute():
+        calls.append(1)
+        time.sleep(0.2)
+        return "valor"
+
+    def worker(results):
+        start.wait()
+        results.append(cache.get_or_set("top_ranked", compute))
+
+    results = []
+    threads = [threading.Thread(target=worker, args=(results,)) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert results == ["valor"] * 8
+    assert len(calls) == 1
+
+
+def test_file_backend_lock_is_shared_between_instances(tmp_path):
+    first, second = Cache(), Cache()
+    first.backend = FileBackend(str(tmp_path))
+    second.backend = FileBackend(str(tmp_path))
+    assert first._acquire("ps:lock:home")
+    assert not second._acquire("ps:lock:home")
+    first._release("ps:lock:home")
+    assert second._acquire("ps:lock:home")
+
+
+def test_file_backend_sweep_caps_entries_and_keeps_tag_versions(tmp_path):
+    cache = Cache()
+    cache.backend = FileBackend(str(tmp_path), max_entries=10, sweep_every=5)
+    cache.invalidate_tags(["sites"])
+    for index in range(60):
+        cache.set(f"http:etag-{index}", "cuerpo", ttl=60 + index, tags=("sites",))
+
+    # Entre barridos pueden acumularse a lo sumo sweep_every entradas por encima del máximo
+    entries = [name for name in os.listdir(tmp_path) if "." not in name and not name.startswith("tmp")]
+    assert len(entries) <= 10 + 5
+    # Se conservan las que vencen más tarde; la versión del tag no se barre
+    assert cache.get("http:etag-59") == "cuerpo"
+    assert cache.get("http:etag-0") is None
+    assert cache._tag_versions(["sites"]) == {"sites": 1}
+
+
+def test_file_backend_sweep_removes_expired_entries(tmp_path, monkeypatch):
+    backend = FileBackend(str(tmp_path))
+    backend.set("ps:viejo", 1, ttl=10)
+    backend.set("ps:vigente", 2, ttl=1000)
+    now = time.time()
+    monkeypatch.setattr(time, "time", lambda: now + 60)
+    assert backend.sweep() == 1
+    assert backend.get("ps:vigente") == 2
+    assert len(os.listdir(tmp_path)) == 1
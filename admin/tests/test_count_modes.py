@@ -0,0 +1,46 @@
+from sqlalchemy import event
+
+from src.web import create_app
+from core.database import db
+from core.models.Site import Site
+from core.utils.pagination import paginate_query
+
+app = create_app()
+app.testing = True
+
+
+def _count_statements(fn):
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if "count(" in statement.lower():
+            statements.append(statement)
+
+    event.listen(db.engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        fn()
+    finally:
+        event.remove(db.engine, "before_cursor_execute", before_cursor_execute)
+    return len(statements)
+
+
+def test_cached_count_is_reused_across_pages():
+    with app.app_context():
+        query = Site.query.filter(Site.deleted == False).order_by(Site.id)
+        exact = paginate_query(query, 1, per_page=2)["total"]
+
+        first = _count_statements(lambda: paginate_query(query, 1, per_page=2, count_mode="cached"))
+        second = _count_statements(lambda: paginate_query(query, 2, per_page=2, count_mode="cached"))
+
+        assert first == 1
+        assert second == 0
+        assert paginate_query(query, 2, per_page=2, count_mode="cached")["total"] == exact
+
+
+def test_estimated_count_falls_back_to_exact_for_small_tables():
+    with app.app_context():
+        query = Site.query.filter(Site.deleted == False).order_by(Site.id)
+        exact = paginate_query(query, 1, per_page=2)
+        estimated = paginate_query(query, 1, per_page=2, count_mode="estimated")
+        assert estimated["total"] == exact["total"]
+        assert estimated["total_is_estimate"] is False
@@ -0,0 +1,57 @@
+import pytest
+
+from src.web import create_app
+from core.utils.pagination import InvalidCursorError, decode_cursor, encode_cursor
+
+app = create_app()
+app.testing = True
+client = app.test_client()
+
+
+def test_cursor_round_trip_and_sort_check():
+    cursor = encode_cursor("rating", "desc", [4.5, 12])
+    assert decode_cursor(cursor, "rating", "desc") == [4.5, 12]
+    with pytest.raises(InvalidCursorError):
+        decode_cursor(cursor, "site_name", "desc")
+    with pytest.raises(InvalidCursorError):
+        decode_cursor("no-es-un-cursor", "rating", "desc")
+
+
+@pytest.mark.parametrize("sort", ["site_name", "registration", "rating", "views"])
+def test_cursor_pages_match_offset_listing(sort):
+    expected = client.get(f"/api/sites/?sort={sort}&order=desc&per_page=1000").get_json()
+    expected_ids = [site["id"] for site in expected["data"]]
+
+    seen, cursor = [], ""
+    while True:
+        response = client.get(f"/api/sites/?sort={sort}&order=desc&per_page=2&cursor={cursor}")
+        assert response.status_code == 200
+        body = response.get_json()
+        seen.extend(site["id"] for site in body["data"])
+        cursor = body["pagination"]["next_cursor"]
+        if not cursor:
+            break
+
+    assert len(seen) == len(set(seen))
+    assert sorted(seen) == sorted(expected_ids)
+
+
+@pytest.mark.parametrize("order", ["desc", "asc"])
+def test_relevance_cursor_pages_do_not_repeat_or_skip(order):
+    query = "q=Buenos%20Aires&sort=relevance"
+    expected = client.get(f"/api/sites/?{query}&order={order}&per_page=1000").get_json()
+    expected_ids = [site["id"] for site in expected["data"]]
+    assert expected_ids
+
+    seen, cursor = [], ""
+    while True:
+        response = client.get(f"/api/sites/?{query}&order={order}&per_page=2&cursor={cursor}")
+        assert response.status_code == 200
+        body = response.get_json()
+        seen.extend(site["id"] for site in body["data"])
+        cursor = body["pagination"]["next_cursor"]
+        if not cursor:
+            break
+
+    assert len(seen) == len(set(seen))
+    assert sorted(seen) == sorted(expected_ids)
@@ -0,0 +1,35 @@
+from datetime import datetime, timedelta, timezone
+
+from src.web import create_app
+from core.database import db
+from core.models.ExportJob import ExportJob
+from core.services.export_service import ExportService
+
+app = create_app()
+app.testing = True
+
+
+def _job(status, started_at):
+    job = ExportService.create_job(None, "csv", {}, "site_name", "asc")
+    ExportService.update_job(job.id, status=status, started_at=started_at)
+    return job.id
+
+
+def test_stale_jobs_are_marked_failed():
+    with app.app_context():
+        now = datetime.now(timezone.utc)
+        stale = _job(ExportJob.STATUS_RUNNING, now - timedelta(hours=3))
+        fresh = _job(ExportJob.STATUS_RUNNING, now - timedelta(minutes=5))
+        done = _job(ExportJob.STATUS_DONE, now - timedelta(hours=3))
+        try:
+            assert ExportService.fail_stale_jobs(timedelta(hours=2)) >= 1
+            db.session.expire_all()
+
+            job = ExportService.get_job(stale)
+            assert job.status == ExportJob.STATUS_FAILED
+            assert job.error and job.finished_at
+            assert ExportService.get_job(fresh).status == ExportJob.STATUS_RUNNING
+            assert ExportService.get_job(done).status == ExportJob.STATUS_DONE
+        finally:
+            ExportJob.query.filter(ExportJob.id.in_([stale, fresh, done])).delete()
+            db.session.commit()
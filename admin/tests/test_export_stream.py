@@ -0,0 +1,57 @@
+import csv
+import gzip
+import io
+import json
+from collections import namedtuple
+from datetime import datetime
+from io import StringIO
+
+from src.web.utils.export import FIELDNAMES, export_sites_to_csv, iter_sites_csv, write_sites_export
+
+Row = namedtuple(
+    "Row",
+    "id site_name short_desc city province state_name registration latitude longitude tags",
+)
+
+
+def _rows(amount):
+    for i in range(amount):
+        yield Row(i, f"Sitio {i}", "Desc", "La Plata", "Buenos Aires", "Bueno",
+                  datetime(2024, 1, 2, 3, 4, 5), -34.9, -57.9, "Colonial, Museo" if i % 2 else None)
+
+
+def test_header_is_sent_before_reading_rows():
+    def never_ready():
+        raise AssertionError("no debería leerse ninguna fila para el primer fragmento")
+        yield
+
+    first = next(iter_sites_csv(never_ready()))
+    assert first.startswith("\ufeff")
+    assert first.strip("\ufeff\r\n").split(",") == FIELDNAMES
+
+
+def test_rows_are_chunked_and_formatted():
+    chunks = list(iter_sites_csv(_rows(5), rows_per_chunk=2))
+    # encabezado + 2 + 2 + 1
+    assert len(chunks) == 4
+
+    records = list(csv.reader(StringIO("".join(chunks).lstrip("\ufeff"))))
+    assert len(records) == 6
+    assert records[1][6] == "2024-01-02 03:04:05"
+    assert records[1][9] == ""
+    assert records[2][9] == "[Colonial, Museo]"
+    assert export_sites_to_csv(_rows(5)) == "".join(chunks)
+
+
+def test_background_formats_report_progress():
+    progress = []
+    gz = io.BytesIO()
+    write_sites_export(_rows(5), gz, "csv.gz", on_progress=progress.append, progress_every=2)
+    assert progress == [2, 4, 5]
+    assert gzip.decompress(gz.getvalue()).decode("utf-8") == export_sites_to_csv(_rows(5))
+
+    ndjson = io.BytesIO()
+    write_sites_export(_rows(2), ndjson, "ndjson")
+    records = [json.loads(line) for line in ndjson.getvalue().decode("utf-8").splitlines()]
+    assert [record["id"] for record in records] == [0, 1]
+    assert records[1]["tags"] == ["Colonial", "Museo"]
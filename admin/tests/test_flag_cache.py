@@ -0,0 +1,29 @@
+from src.web import create_app
+from core.services.flag_service import FlagService
+
+app = create_app()
+app.testing = True
+
+
+def test_steady_state_requests_do_not_query_flags(query_budget):
+    with app.app_context():
+        FlagService.invalidate_cache()
+        # Primera lectura: carga el snapshot
+        FlagService.get_cached_flag("admin_maintenance_mode")
+        with query_budget(app, 0):
+            FlagService.get_cached_flag("admin_maintenance_mode")
+            FlagService.get_cached_flag("portal_maintenance_mode")
+            FlagService.get_cached_flag("reviews_enabled")
+        assert FlagService.cache_stats()["hits"] >= 3
+
+
+def test_toggle_invalidates_cache():
+    with app.app_context():
+        flag = FlagService.get_flag_by_name("reviews_enabled")
+        original = flag.is_enabled
+        assert FlagService.get_cached_flag("reviews_enabled").is_enabled == original
+        try:
+            FlagService.toggle_feature_flag(flag.id, not original, None)
+            assert FlagService.get_cached_flag("reviews_enabled").is_enabled == (not original)
+        finally:
+            FlagService.toggle_feature_flag(flag.id, original, None)
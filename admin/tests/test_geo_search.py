@@ -0,0 +1,38 @@
+from src.web import create_app
+
+app = create_app()
+app.testing = True
+client = app.test_client()
+
+# Plaza Moreno, La Plata
+LAT, LNG = -34.9214, -57.9545
+
+
+def test_sort_by_distance_is_nearest_first():
+    response = client.get(f"/api/sites/?lat={LAT}&lng={LNG}&sort=distance&per_page=50")
+    assert response.status_code == 200
+    distances = [site["distance_m"] for site in response.get_json()["data"]]
+    assert distances
+    assert distances == sorted(distances)
+
+
+def test_radius_is_in_kilometres():
+    response = client.get(f"/api/sites/?lat={LAT}&lng={LNG}&radius=50&sort=distance&per_page=1000")
+    assert response.status_code == 200
+    assert all(site["distance_m"] <= 50_000 for site in response.get_json()["data"])
+
+
+def test_distance_cursor_pages_do_not_repeat():
+    seen, cursor = [], ""
+    while True:
+        body = client.get(f"/api/sites/?lat={LAT}&lng={LNG}&sort=distance&per_page=3&cursor={cursor}").get_json()
+        seen.extend((site["distance_m"], site["id"]) for site in body["data"])
+        cursor = body["pagination"]["next_cursor"]
+        if not cursor:
+            break
+    assert len({site_id for _, site_id in seen}) == len(seen)
+    assert [distance for distance, _ in seen] == sorted(distance for distance, _ in seen)
+
+
+def test_sort_by_distance_requires_a_point():
+    assert client.get("/api/sites/?sort=distance").status_code == 400
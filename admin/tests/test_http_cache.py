@@ -0,0 +1,40 @@
+from src.web import create_app
+from core.database import db
+from core.models.Tag import Tag
+
+app = create_app()
+app.testing = True
+client = app.test_client()
+
+
+def test_etag_revalidation_and_invalidation():
+    first = client.get("/api/sites/tags")
+    assert first.status_code == 200
+    etag = first.headers["ETag"]
+    assert "max-age" in first.headers["Cache-Control"]
+    assert "stale-while-revalidate" in first.headers["Cache-Control"]
+
+    not_modified = client.get("/api/sites/tags", headers={"If-None-Match": etag})
+    assert not_modified.status_code == 304
+    assert not_modified.headers["ETag"] == etag
+
+    with app.app_context():
+        tag = Tag(name="Etiqueta ETag", slug="etiqueta-etag")
+        db.session.add(tag)
+        db.session.commit()
+        try:
+            changed = client.get("/api/sites/tags", headers={"If-None-Match": etag})
+            assert changed.status_code == 200
+            assert changed.headers["ETag"] != etag
+            assert "Etiqueta ETag" in [item["name"] for item in changed.get_json()["data"]]
+        finally:
+            db.session.delete(tag)
+            db.session.commit()
+
+
+def test_etag_changes_with_presigned_url_rotation(monkeypatch):
+    etag = client.get("/api/sites/tags").headers["ETag"]
+    monkeypatch.setattr("web.utils.http_cache.rotation_epoch", lambda: -1)
+    rotated = client.get("/api/sites/tags", headers={"If-None-Match": etag})
+    assert rotated.status_code == 200
+    assert rotated.headers["ETag"] != etag
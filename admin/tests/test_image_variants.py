@@ -0,0 +1,36 @@
+import io
+
+from PIL import Image
+
+from core.utils import image_variants
+
+
+def _jpeg(width, height):
+    buffer = io.BytesIO()
+    Image.new("RGB", (width, height), (120, 80, 40)).save(buffer, "JPEG")
+    buffer.seek(0)
+    return buffer
+
+
+def test_variants_keep_aspect_ratio_and_never_upscale():
+    variants = image_variants.generate_variants(_jpeg(2400, 1200))
+    assert set(variants) == {"thumb", "card", "full"}
+
+    sizes = {
+        name: Image.open(io.BytesIO(data)).size
+        for name, (data, _, _) in variants.items()
+    }
+    assert sizes["thumb"] == (320, 160)
+    assert sizes["card"] == (800, 400)
+    assert sizes["full"] == (1600, 800)
+
+    small = image_variants.generate_variants(_jpeg(200, 100))
+    assert Image.open(io.BytesIO(small["full"][0])).size == (200, 100)
+
+
+def test_invalid_image_produces_no_variants():
+    assert image_variants.generate_variants(io.BytesIO(b"no es una imagen")) == {}
+
+
+def test_variant_path():
+    assert image_variants.variant_path("3/abc.png", "thumb", "webp") == "3/abc_thumb.webp"
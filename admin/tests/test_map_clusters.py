@@ -0,0 +1,57 @@
+from sqlalchemy import func
+
+from src.web import create_app
+from core.database import db
+from core.models.Site import Site
+from core.services.map_service import MapService
+
+app = create_app()
+app.testing = True
+client = app.test_client()
+
+WORLD = "-180,-90,180,90"
+
+
+def _sites_with_location():
+    with app.app_context():
+        return db.session.query(Site).filter(
+            Site.active.is_(True), Site.deleted.is_(False), Site.location.isnot(None)
+        ).count()
+
+
+def test_clusters_cover_every_site():
+    expected = _sites_with_location()
+    low = client.get(f"/api/sites/map?bbox={WORLD}&zoom=2").get_json()
+    high = client.get(f"/api/sites/map?bbox={WORLD}&zoom=20").get_json()
+
+    assert low["total"] == high["total"] == expected
+    assert len(low["data"]) <= len(high["data"])
+    # Sin agrupar cada punto trae su sitio
+    assert all(point["count"] == 1 and point["id"] for point in high["data"])
+
+
+def test_invalid_bbox_and_tile():
+    assert client.get("/api/sites/map?bbox=1,2,3").status_code == 400
+    assert client.get("/api/sites/map?bbox=nan,-60,-50,-20").status_code == 400
+    assert client.get("/api/sites/map?bbox=-80,-60,inf,-20").status_code == 400
+    assert client.get("/api/sites/map?bbox=190,-60,200,-20").status_code == 400
+    assert client.get("/api/sites/tiles/2/9/0.mvt").status_code == 400
+
+
+def test_bbox_is_clamped_to_the_world():
+    clamped = client.get("/api/sites/map?bbox=-500,-100,500,100&zoom=2")
+    assert clamped.status_code == 200
+    assert clamped.get_json()["total"] == client.get(f"/api/sites/map?bbox={WORLD}&zoom=2").get_json()["total"]
+
+
+def test_clusters_use_the_tile_grid():
+    """Los clusters de /map son las celdas de la grilla en EPSG:3857 de las vector tiles."""
+    zoom = 6
+    with app.app_context():
+        cells = db.session.query(func.count(func.distinct(func.ST_SnapToGrid(
+            func.ST_Transform(Site.location, 3857), MapService.cell_size_meters(zoom)
+        )))).filter(
+            Site.active.is_(True), Site.deleted.is_(False), Site.location.isnot(None)
+        ).scalar()
+    clusters = client.get(f"/api/sites/map?bbox={WORLD}&zoom={zoom}").get_json()["data"]
+    assert len(clusters) == cells
@@ -0,0 +1,24 @@
+from alembic.autogenerate import compare_metadata
+from alembic.migration import MigrationContext
+
+from src.web import create_app
+from core.database import check_schema, db
+
+app = create_app()
+app.testing = True
+
+
+def test_database_is_at_head():
+    assert check_schema(app)
+
+
+def test_models_match_migrations():
+    """Cada cambio en los modelos tiene que venir con su migración (`flask db migrate`)."""
+    with app.app_context():
+        with db.engine.connect() as conn:
+            context = MigrationContext.configure(conn, opts={
+                "include_object": lambda obj, name, obj_type, reflected, compare_to: not (
+                    obj_type == "table" and reflected and compare_to is None
+                ),
+            })
+            assert compare_metadata(context, db.metadata) == []
@@ -0,0 +1,58 @@
+from flask import render_template_string, session
+
+from src.web import create_app
+from core.database import db
+from core.models.Permission import Permission
+from core.models.Role import Role
+from core.models.Role_permission import Role_permission
+from core.services.role_service import RoleService
+
+app = create_app()
+app.testing = True
+
+# Un menú típico que consulta una docena de permisos
+MENU_TEMPLATE = "".join(
+    "{% if is_granted(session, '" + name + "') %}x{% endif %}"
+    for name in [
+        "user_index", "user_new", "user_update", "user_destroy", "user_show", "site_index",
+        "site_new", "site_update", "site_destroy", "site_history", "tag_index", "review_index",
+    ]
+)
+
+
+def test_menu_render_does_not_query_permissions(query_budget):
+    with app.test_request_context("/"):
+        role = Role.query.filter(Role.name != None).first()
+        session["role_name"] = role.name
+        session["is_admin"] = False
+
+        RoleService.invalidatePermissionsCache()
+        with query_budget(app, 1):
+            render_template_string(MENU_TEMPLATE)
+        with query_budget(app, 0):
+            render_template_string(MENU_TEMPLATE)
+
+
+def test_role_permission_commit_invalidates_cache():
+    with app.app_context():
+        role = Role(name="Rol cache permisos")
+        permission = Permission(name="permiso_cache_prueba")
+        db.session.add_all([role, permission])
+        db.session.commit()
+        try:
+            assert permission.name not in RoleService.getPermissionNames(role.name)
+
+            link = Role_permission(role_id=role.id, permission_id=permission.id)
+            db.session.add(link)
+            db.session.commit()
+            assert permission.name in RoleService.getPermissionNames(role.name)
+
+            db.session.delete(link)
+            db.session.commit()
+            assert permission.name not in RoleService.getPermissionNames(role.name)
+        finally:
+            db.session.rollback()
+            Role_permission.query.filter_by(role_id=role.id).delete()
+            db.session.delete(permission)
+            db.session.delete(role)
+            db.session.commit()
@@ -0,0 +1,51 @@
+from datetime import timedelta
+
+from core.utils.presigned_urls import PresignedUrlCache
+
+
+class FakeMinio:
+    def __init__(self):
+        self.signatures = 0
+
+    def presigned_get_object(self, bucket_name, object_name, expires):
+        self.signatures += 1
+        return f"http://minio/{bucket_name}/{object_name}?sig={self.signatures}"
+
+
+def test_same_object_is_signed_once():
+    client, cache = FakeMinio(), PresignedUrlCache()
+    urls = {cache.get_url(client, "grupo21", "/public/default_image.png") for _ in range(50)}
+    assert len(urls) == 1
+    assert client.signatures == 1
+
+
+def test_url_is_resigned_close_to_expiry():
+    client, cache = FakeMinio(), PresignedUrlCache(refresh_margin=timedelta(hours=1))
+    # Vigencia menor al margen: nunca se reutiliza
+    cache.get_url(client, "grupo21", "a.png", expires=timedelta(minutes=30))
+    cache.get_url(client, "grupo21", "a.png", expires=timedelta(minutes=30))
+    assert client.signatures == 2
+
+
+def test_lru_eviction_is_bounded():
+    client, cache = FakeMinio(), PresignedUrlCache(max_entries=2)
+    cache.get_url(client, "b", "1.png")
+    cache.get_url(client, "b", "2.png")
+    cache.get_url(client, "b", "1.png")  # 1.png pasa a ser el más reciente
+    cache.get_url(client, "b", "3.png")  # se descarta 2.png
+    assert cache.stats()["entries"] == 2
+    cache.get_url(client, "b", "1.png")
+    assert client.signatures == 3
+    cache.get_url(client, "b", "2.png")
+    assert client.signatures == 4
+
+
+def test_url_is_resigned_after_rotation(monkeypatch):
+    client, cache = FakeMinio(), PresignedUrlCache(rotation=timedelta(days=1))
+    monkeypatch.setattr("core.utils.presigned_urls.rotation_epoch", lambda rotation: 10)
+    first = cache.get_url(client, "grupo21", "a.png")
+    assert cache.get_url(client, "grupo21", "a.png") == first
+
+    monkeypatch.setattr("core.utils.presigned_urls.rotation_epoch", lambda rotation: 11)
+    assert cache.get_url(client, "grupo21", "a.png") != first
+    assert client.signatures == 2
@@ -0,0 +1,54 @@
+"""
+Presupuesto de sentencias SQL por endpoint de la API pública (con el cache vacío).
+Un endpoint que pase a consultar por cada fila (N+1) falla por cantidad o por repetición.
+"""
+import pytest
+
+from src.web import create_app
+from core.database import db
+from core.models.Site import Site
+
+app = create_app()
+app.testing = True
+client = app.test_client()
+
+# Los listados serializan con una consulta por relación (SiteService.sites_to_dict)
+BUDGETS = [
+    ("/api/sites/", 10),
+    ("/api/sites/?q=cabildo", 10),
+    ("/api/sites/?province=Buenos&sort=rating&order=desc", 10),
+    ("/api/sites/?cursor=&sort=registration", 10),
+    ("/api/sites/?lat=-34.6&lng=-58.4&radius=100&sort=distance", 11),
+    ("/api/sites/favorites?user_id=1", 10),
+    ("/api/sites/top-ranked", 10),
+    ("/api/sites/most-visited", 10),
+    ("/api/sites/recently-added", 10),
+    ("/api/sites/tags", 4),
+    ("/api/reviews", 10),
+    ("/api/reviews?cursor=&sort=rating", 10),
+]
+
+
+@pytest.fixture
+def site_id():
+    with app.app_context():
+        return db.session.query(Site.id).filter(Site.active == True, Site.deleted == False).limit(1).scalar()
+
+
+@pytest.mark.parametrize("url, max_queries", BUDGETS)
+def test_endpoint_query_budget(url, max_queries, query_budget):
+    app.cache.clear()
+    with query_budget(app, max_queries, max_repeated=3):
+        response = client.get(url)
+    assert response.status_code == 200
+
+
+def test_site_detail_query_budget(site_id, query_budget):
+    with query_budget(app, 8, max_repeated=3):
+        response = client.get(f"/api/sites/{site_id}")
+    assert response.status_code == 200
+
+
+def test_server_timing_header():
+    response = client.get("/api/sites/")
+    assert response.headers["Server-Timing"].startswith("db;dur=")
@@ -0,0 +1,156 @@
+"""
+Planes de ejecución de las consultas de los servicios sobre un dataset grande.
+
+Se cargan SEED_SITES sitios (con reseñas, imágenes, etiquetas y favoritos) dentro
+de una transacción que se descarta al final, se ejecutan las consultas de los
+servicios capturando el SQL emitido y se corre EXPLAIN sobre cada una: ninguna
+debe recorrer secuencialmente una de las tablas grandes.
+"""
+import json
+from contextlib import contextmanager
+
+import pytest
+from sqlalchemy import event, text
+
+from src.web import create_app
+from core.database import db
+from core.models.Site import Site
+from core.models.UserFavorite import UserFavorite
+from core.services.review_service import ReviewService
+from core.services.sites_service import SiteService
+
+app = create_app()
+app.testing = True
+
+SEED_SITES = 20000
+LARGE_TABLES = {"sites", "reviews", "site_images", "historic_site_tag", "user_favorites"}
+LIVE = {"active": True, "deleted": False}
+
+SEED_SQL = [
+    """
+    INSERT INTO sites (site_name, short_desc, full_desc, city, province, operning_year,
+                       registration, active, deleted, views, location, category_id, state_id)
+    SELECT 'plan-' || g, 'Descripción breve', 'Descripción completa', 'Ciudad ' || (g % 200),
+           'Provincia ' || (g % 24), 1800 + g % 200, now() - g * interval '1 minute',
+           g % 10 <> 0, g % 50 = 0, g % 997,
+           ST_SetSRID(ST_MakePoint(-73 + random() * 20, -55 + random() * 33), 4326),
+           (SELECT min(id) FROM categories), (SELECT min(id) FROM states)
+    FROM generate_series(1, :n) AS g
+    """,
+    """
+    INSERT INTO reviews (site_id, user_email, rating, content, status, created_at)
+    SELECT s.id, 'usuario' || r || '@example.com', 1 + (s.id + r) % 5, 'Reseña de prueba',
+           CASE WHEN (s.id + r) % 20 = 0 THEN 'Pendiente'
+                WHEN (s.id + r) % 20 = 1 THEN 'Rechazada'
+                ELSE 'Aprobada' END,
+           now() - (s.id + r) * interval '1 minute'
+    FROM sites s, generate_series(1, 3) AS r
+    WHERE s.site_name LIKE 'plan-%'
+    """,
+    """
+    INSERT INTO site_images (site_id, public_url, file_path, title_alt, order_index, is_cover)
+    SELECT id, 'plan/' || id || '.jpg', 'plan/' || id || '.jpg', 'Imagen', 1, true
+    FROM sites WHERE site_name LIKE 'plan-%'
+    """,
+    """
+    INSERT INTO historic_site_tag (site_id, tag_id)
+    SELECT s.id, t.id
+    FROM sites s
+    JOIN (SELECT id, row_number() OVER (ORDER BY id) - 1 AS position, count(*) OVER () AS total FROM tags) t
+      ON s.id % t.total = t.position
+    WHERE s.site_name LIKE 'plan-%'
+    """,
+    """
+    INSERT INTO user_favorites (user_id, site_id)
+    SELECT (SELECT min(id) FROM users), id
+    FROM sites WHERE site_name LIKE 'plan-%' AND id % 5 = 0
+    """,
+    "ANALYZE sites, reviews, site_images, historic_site_tag, user_favorites",
+]
+
+
+@pytest.fixture(scope="module", autouse=True)
+def seeded():
+    with app.app_context():
+        for statement in SEED_SQL:
+            db.session.execute(text(statement), {"n": SEED_SITES})
+        try:
+            yield
+        finally:
+            db.session.rollback()
+
+
+@contextmanager
+def captured_statements():
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            statements.append((statement, parameters))
+
+    engine = db.session.get_bind()
+    event.listen(engine, "before_cursor_execute", capture)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", capture)
+
+
+def _sequential_scans(plan):
+    """Tablas grandes recorridas con Seq Scan en el plan (recursivo)."""
+    found = []
+    if plan.get("Node Type") == "Seq Scan" and plan.get("Relation Name") in LARGE_TABLES:
+        found.append(plan["Relation Name"])
+    for child in plan.get("Plans", []):
+        found.extend(_sequential_scans(child))
+    return found
+
+
+def assert_uses_indexes(call):
+    with captured_statements() as statements:
+        call()
+    assert statements
+    connection = db.session.connection()
+    for statement, parameters in statements:
+        plan = connection.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {statement}", parameters).scalar()
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        scans = _sequential_scans(plan[0]["Plan"])
+        assert not scans, f"Seq Scan sobre {scans}:\n{statement}"
+
+
+@pytest.mark.parametrize("order_by, sorted_by", [
+    ("site_name", "asc"),
+    ("registration", "desc"),
+    ("views", "desc"),
+])
+def test_public_site_listing(order_by, sorted_by):
+    def call():
+        page = SiteService.get_sites_filtered(dict(LIVE), order_by=order_by, sorted_by=sorted_by, cursor="", per_page=12)
+        SiteService.sites_to_dict(page["items"])
+
+    assert_uses_indexes(call)
+
+
+def test_sites_by_tag():
+    tag_id = db.session.execute(text("SELECT min(tag_id) FROM historic_site_tag")).scalar()
+    assert_uses_indexes(lambda: SiteService.get_sites_filtered(
+        dict(LIVE, tags=[tag_id]), order_by="site_name", cursor="", per_page=12
+    ))
+
+
+def test_pending_reviews_moderation():
+    assert_uses_indexes(lambda: ReviewService.get_reviews_paginated(
+        filters={"status": "Pendiente"}, order_by="created_at", sorted_by="desc"
+    ))
+
+
+def test_approved_reviews_of_site():
+    site_id = db.session.query(Site.id).filter(Site.site_name == "plan-1234").scalar()
+    assert_uses_indexes(lambda: ReviewService.get_approved_reviews_by_site_paginated(site_id))
+
+
+def test_favorite_lookup():
+    favorite = db.session.query(UserFavorite).first()
+    assert_uses_indexes(lambda: db.session.query(UserFavorite)
+                        .filter_by(user_id=favorite.user_id, site_id=favorite.site_id).first())
@@ -0,0 +1,67 @@
+import json
+import logging
+
+import pytest
+from flask import Flask, render_template_string
+from sqlalchemy import text
+
+from src.web.query_stats import QueryStats, repeated_shapes, statement_shape
+from core.database import db
+
+
+@pytest.fixture
+def app():
+    app = Flask(__name__)
+    app.config.update(SQLALCHEMY_DATABASE_URI="sqlite://", QUERY_STATS_ENABLED=True, QUERY_STATS_PANEL=True,
+                      QUERY_STATS_N_PLUS_ONE=3)
+    db.init_app(app)
+    QueryStats(app)
+
+    @app.route("/sites/<int:amount>")
+    def sites(amount):
+        # Una consulta por "sitio", como un serializador con N+1
+        for site_id in range(amount):
+            db.session.execute(text("SELECT :id"), {"id": site_id})
+        return render_template_string(
+            "{% set stats = query_stats_panel() %}{{ stats.count }}|{{ stats.repeated|length }}"
+        )
+
+    return app
+
+
+def test_statement_shape_ignores_parameters():
+    assert statement_shape("SELECT * FROM sites WHERE id IN (%(id_1)s, %(id_2)s)") == \
+        statement_shape("SELECT *\n  FROM sites WHERE id IN (%(id_1)s)")
+    assert statement_shape("SELECT 1 LIMIT 12") == statement_shape("SELECT 1 LIMIT 24")
+    assert repeated_shapes([("SELECT 1", 1.0)] * 3 + [("SELECT 2", 1.0), ("SELECT 2 FROM x", 1.0)], 3) == [
+        {"shape": "SELECT ?", "count": 4, "total_ms": 4.0}
+    ]
+
+
+def test_server_timing_and_panel(app):
+    response = app.test_client().get("/sites/2")
+    assert response.headers["Server-Timing"].startswith("db;dur=")
+    assert '2 queries' in response.headers["Server-Timing"]
+    assert response.get_data(as_text=True) == "2|0"
+
+
+def test_n_plus_one_is_logged(app, caplog):
+    with caplog.at_level(logging.WARNING, logger="src.web.query_stats"):
+        response = app.test_client().get("/sites/4")
+    assert response.get_data(as_text=True) == "4|1"
+    record = json.loads(caplog.records[-1].getMessage())
+    assert record["event"] == "request_queries"
+    assert record["endpoint"] == "sites"
+    assert record["repeated"][0]["count"] == 4
+
+
+def test_query_budget_fixture(app, query_budget):
+    client = app.test_client()
+    with query_budget(app, 2):
+        client.get("/sites/2")
+    with pytest.raises(AssertionError, match="presupuesto: 2"):
+        with query_budget(app, 2):
+            client.get("/sites/3")
+    with pytest.raises(AssertionError, match="N\\+1"):
+        with query_budget(app, 10, max_repeated=3):
+            client.get("/sites/3")
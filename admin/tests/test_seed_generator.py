@@ -0,0 +1,31 @@
+from core import seed_generator
+from core.models.Site import Site
+
+CATEGORIES = [1, 2, 3]
+STATES = [1, 2, 3]
+TAGS = list(range(1, 33))
+
+
+def test_site_rows_are_deterministic_per_batch():
+    first = seed_generator.site_rows(0, 500, 7, CATEGORIES, STATES, TAGS)
+    assert first == seed_generator.site_rows(0, 500, 7, CATEGORIES, STATES, TAGS)
+    assert first != seed_generator.site_rows(0, 500, 8, CATEGORIES, STATES, TAGS)
+
+
+def test_site_rows_fit_the_columns():
+    rows = seed_generator.site_rows(9_999_000, 10_000_000, 7, CATEGORIES, STATES, TAGS)
+    names = [row[0] for row in rows]
+    assert len(set(names)) == len(names)
+    for row in rows:
+        values = dict(zip(seed_generator.SITE_STAGE_COLUMNS, row))
+        for column in ('site_name', 'short_desc', 'full_desc', 'city', 'province'):
+            assert len(values[column]) <= Site.__table__.c[column].type.length
+
+
+def test_review_rows_resume_with_the_same_data():
+    site_ids = list(range(1, 1001))
+    rows = seed_generator.review_rows(0, 1000, 7, site_ids)
+    assert rows == seed_generator.review_rows(0, 1000, 7, site_ids)
+    assert all(row[1].endswith(f"@{seed_generator.REVIEW_EMAIL_DOMAIN}") for row in rows)
+    assert {row[0] for row in rows} <= set(site_ids)
+    assert all(1 <= row[2] <= 5 for row in rows)
@@ -0,0 +1,43 @@
+import pytest
+from flask import Flask, session
+
+from src.web.session_store import DEFAULT_SECRET_KEY, init_session
+
+
+def _app(**config):
+    app = Flask(__name__)
+    app.config.update(config)
+    init_session(app)
+
+    @app.route("/login")
+    def login():
+        session.update(user_id=7, is_admin=False, role_name="Editor")
+        return ""
+
+    @app.route("/me")
+    def me():
+        return {"user_id": session.get("user_id"), "role_name": session.get("role_name")}
+
+    return app
+
+
+def test_cookie_session_round_trip():
+    client = _app(SESSION_BACKEND="cookie", SECRET_KEY="clave-de-prueba").test_client()
+    client.get("/login")
+    assert client.get("/me").get_json() == {"user_id": 7, "role_name": "Editor"}
+
+
+def test_cookie_session_requires_secret_in_production():
+    with pytest.raises(RuntimeError):
+        _app(SESSION_BACKEND="cookie", SECRET_KEY=DEFAULT_SECRET_KEY)
+
+
+def test_filesystem_backend_still_available(tmp_path):
+    client = _app(SESSION_BACKEND="filesystem", SESSION_FILE_DIR=str(tmp_path)).test_client()
+    client.get("/login")
+    assert client.get("/me").get_json()["user_id"] == 7
+
+
+def test_unknown_backend():
+    with pytest.raises(ValueError):
+        _app(SESSION_BACKEND="memcache")
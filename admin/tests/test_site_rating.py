@@ -0,0 +1,53 @@
+from src.web import create_app
+from core.database import db
+from core.models.Review import Review
+from core.models.Site import Site
+from core.models.User import User
+from core.services.rating_service import RatingService
+from core.services.review_service import ReviewService
+
+app = create_app()
+app.testing = True
+
+
+def _add_review(site_id, rating, status):
+    review = Review(
+        site_id=site_id,
+        user_email=f"rating{rating}{status}@example.com",
+        rating=rating,
+        content="Reseña creada para probar el agregado de calificaciones.",
+        status=status,
+    )
+    db.session.add(review)
+    db.session.flush()
+    return review
+
+
+def test_site_rating_follows_moderation():
+    with app.app_context():
+        site = Site.query.filter_by(deleted=False).first()
+        moderator = User.query.first()
+        RatingService.rebuild_all()
+        before = RatingService.get_rating(site.id)
+        count_before = before.reviews_count if before else 0
+        sum_before = before.rating_sum if before else 0
+        five_before = before.stars_5 if before else 0
+
+        review = _add_review(site.id, 5, 'Pendiente')
+        db.session.commit()
+        try:
+            assert ReviewService.approve_review(review.id, moderator_id=moderator.id)
+            rating = RatingService.get_rating(site.id)
+            db.session.refresh(rating)
+            assert rating.reviews_count == count_before + 1
+            assert rating.rating_sum == sum_before + 5
+            assert rating.stars_5 == five_before + 1
+            assert rating.rating_average == rating.rating_sum / rating.reviews_count
+
+            assert ReviewService.reject_review(review.id, moderator_id=moderator.id, rejection_reason="Prueba")
+            db.session.refresh(rating)
+            assert rating.reviews_count == count_before
+            assert rating.stars_5 == five_before
+        finally:
+            ReviewService.delete_review(review.id)
+            RatingService.rebuild_all()
@@ -0,0 +1,96 @@
+from geoalchemy2.elements import WKTElement
+
+from src.web import create_app
+from core.database import db
+from core.models.Category import Category
+from core.models.Review import Review
+from core.models.Site import Site
+from core.models.SiteImage import SiteImage
+from core.models.Site_Tag import HistoricSiteTag
+from core.models.State import State
+from core.models.Tag import Tag
+from core.services.rating_service import RatingService
+from core.services.sites_service import SiteService
+
+app = create_app()
+app.testing = True
+
+# Cantidad máxima de consultas que puede hacer el serializador por página
+MAX_QUERIES_PER_PAGE = 6
+
+
+def _create_sites(amount):
+    """Crea sitios con portada, tags y reseñas aprobadas (dentro de la transacción del test)."""
+    category = Category.query.first()
+    state = State.query.first()
+    tags = Tag.query.limit(6).all()
+
+    sites = [
+        Site(
+            site_name=f"Benchmark {i}",
+            short_desc="Sitio de prueba",
+            full_desc="Sitio creado para medir la serialización",
+            city="La Plata",
+            province="Buenos Aires",
+            operning_year=1900,
+            category_id=category.id,
+            state_id=state.id,
+            location=WKTElement("POINT(-57.954 -34.921)", srid=4326),
+        )
+        for i in range(amount)
+    ]
+    db.session.add_all(sites)
+    db.session.flush()
+
+    for i, site in enumerate(sites):
+        db.session.add(SiteImage(
+            site_id=site.id,
+            public_url=f"http://localhost/bench/{site.id}.png",
+            file_path=f"bench/{site.id}.png",
+            title_alt="Portada",
+            order_index=1,
+            is_cover=True,
+        ))
+        db.session.add_all([HistoricSiteTag(site_id=site.id, tag_id=tag.id) for tag in tags])
+        db.session.add(Review(
+            site_id=site.id,
+            user_email=f"bench{i}@example.com",
+            rating=(i % 5) + 1,
+            content="Reseña creada para el benchmark de serialización.",
+            status="Aprobada",
+        ))
+        # El serializador lee el agregado (SiteRating), que mantiene RatingService
+        RatingService.apply_delta(site.id, (i % 5) + 1, 1)
+    db.session.flush()
+    return [site.id for site in sites]
+
+
+def _load_page(site_ids):
+    db.session.expunge_all()
+    return Site.query.filter(Site.id.in_(site_ids)).order_by(Site.id).all()
+
+
+def test_sites_to_dict_query_count_is_constant(query_budget):
+    with app.app_context():
+        try:
+            site_ids = _create_sites(100)
+
+            small_page = _load_page(site_ids[:10])
+            with query_budget(app, MAX_QUERIES_PER_PAGE) as small_statements:
+                SiteService.sites_to_dict(small_page)
+
+            page = _load_page(site_ids)
+            with query_budget(app, MAX_QUERIES_PER_PAGE) as statements:
+                data = SiteService.sites_to_dict(page)
+
+            assert len(data) == 100
+            assert len(statements) == len(small_statements)
+            assert all(len(site["tags"]) == 5 for site in data)
+            assert all(site["reviews_count"] == 1 for site in data)
+            assert [site["reviews_histogram"] for site in data] == [
+                {star: int(star == (i % 5) + 1) for star in range(1, 6)} for i in range(100)
+            ]
+            assert [site["reviews_average"] for site in data] == [float((i % 5) + 1) for i in range(100)]
+            assert data[0]["cover_image_url"] == f"http://localhost/bench/{site_ids[0]}.png"
+        finally:
+            db.session.rollback()
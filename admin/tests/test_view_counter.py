@@ -0,0 +1,114 @@
+import atexit
+import sys
+from contextlib import contextmanager
+
+import pytest
+from flask import Flask
+from sqlalchemy.dialects import postgresql
+
+from src.web.view_counter import ViewCounter
+
+# src.web exporta la instancia `view_counter`, que tapa al módulo del mismo nombre
+view_counter_module = sys.modules[ViewCounter.__module__]
+
+
+class FakeEngine:
+    """Registra las sentencias de cada transacción (o falla al ejecutarlas)."""
+
+    def __init__(self, fail=False):
+        self.fail = fail
+        self.executed = []
+
+    @contextmanager
+    def begin(self):
+        yield self
+
+    def execute(self, statement, parameters=None):
+        if self.fail:
+            raise RuntimeError("base caída")
+        self.executed.append((statement, parameters))
+
+
+class FakeDb:
+    def __init__(self, engine):
+        self.engine = engine
+
+
+@pytest.fixture
+def counter(monkeypatch):
+    # Las visitas que queden pendientes no se vuelcan al salir del proceso de tests
+    monkeypatch.setattr(atexit, "register", lambda function: None)
+    counter = ViewCounter()
+    counter.init_app(Flask(__name__))
+    counter.flush_threshold = 5
+    # Sin hilo en segundo plano: los tests vuelcan a mano
+    monkeypatch.setattr(counter, "_ensure_worker", lambda: None)
+    return counter
+
+
+def _use_engine(monkeypatch, engine):
+    monkeypatch.setattr(view_counter_module, "db", FakeDb(engine))
+    return engine
+
+
+def test_flush_is_registered_at_exit_once(monkeypatch):
+    registered = []
+    monkeypatch.setattr(atexit, "register", registered.append)
+
+    counter = ViewCounter()
+    for _ in range(3):
+        counter.init_app(Flask(__name__))
+
+    assert registered == [counter.flush]
+
+
+def test_increments_are_aggregated_per_site(counter):
+    counter.increment(2)
+    counter.increment(1)
+    counter.increment(2, amount=2)
+    assert counter.pending(1) == 1
+    assert counter.pending(2) == 3
+    assert counter.pending(3) == 0
+
+
+def test_threshold_wakes_up_the_flush_thread(counter):
+    for _ in range(4):
+        counter.increment(1)
+    assert not counter._wakeup.is_set()
+    counter.increment(2)
+    assert counter._wakeup.is_set()
+
+
+def test_flush_updates_in_one_batch_and_bumps_views(counter, monkeypatch):
+    engine = _use_engine(monkeypatch, FakeEngine())
+    counter.increment(2)
+    counter.increment(1, amount=3)
+    counter.increment(2)
+
+    assert counter.flush() == 2
+    assert counter.pending(1) == counter.pending(2) == 0
+    assert counter.flush() == 0
+
+    (update, rows), (bump, _) = engine.executed
+    assert "UPDATE sites SET views" in str(update)
+    # Un único executemany, ordenado por id
+    assert rows == [{"b_id": 1, "b_views": 3}, {"b_id": 2, "b_views": 2}]
+    compiled = bump.compile(dialect=postgresql.dialect())
+    assert "data_versions" in str(compiled)
+    assert "views" in compiled.params.values()
+
+
+def test_failed_flush_restores_pending_views(counter, monkeypatch):
+    _use_engine(monkeypatch, FakeEngine(fail=True))
+    counter.increment(1, amount=3)
+    counter.increment(2)
+
+    assert counter.flush() == 0
+    assert counter.pending(1) == 3
+    assert counter.pending(2) == 1
+
+    # Las visitas que llegan después se suman a las devueltas
+    counter.increment(1)
+    engine = _use_engine(monkeypatch, FakeEngine())
+    assert counter.flush() == 2
+    assert engine.executed[0][1] == [{"b_id": 1, "b_views": 4}, {"b_id": 2, "b_views": 1}]